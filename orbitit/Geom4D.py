@@ -504,7 +504,7 @@ class SimpleShape:
             except AttributeError:
                 pass
             if self.rot4 is not None:
-                vs_4d = [self.rot4 * v for v in self.vs]
+                vs_4d = self.rot4.apply_many(self.vs)
             # TODO fix ns.. if needed..
             #    if self.ns != []:cleanUp
             #        Ns4D = [self.rot4*n for n in self.ns]
@@ -548,7 +548,7 @@ class SimpleShape:
                 # Then shape_vs = vs_3d already, and the code below is all
                 # unecessary.
                 cell_vs = vs_3d[:]
-                number_used = glue.clean_up_vs_fs(cell_vs, cell_fs)
+                number_used, _ = glue.clean_up_vs_fs(cell_vs, cell_fs)
                 # Now attaching to current vs, will change index:
                 offset = len(shape_vs)
                 cell_fs = [[v_idx + offset for v_idx in f] for f in cell_fs]
@@ -621,7 +621,7 @@ class SimpleShape:
         """
         if not self.projectedTo3D:
             if self.rot4 is not None:
-                vs_4d = [self.rot4 * v for v in self.vs]
+                vs_4d = self.rot4.apply_many(self.vs)
             # TODO fix ns.. if needed..
             #    if self.ns != []:
             #        Ns4D = [self.rot4*n for n in self.ns]
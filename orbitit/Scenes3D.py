@@ -22,6 +22,7 @@
 
 import logging
 import math
+import numpy as np
 import wx
 from wx import glcanvas
 
@@ -108,6 +109,51 @@ class P2PCylinder:
         GLU.gluCylinder(this.quad, this.radius, this.radius, eLen, this.slices, this.stacks)
         GL.glPopMatrix();
 
+    def mesh(this):
+        """Return the vertices and triangles of a cylinder with radius 1 from z = 0 to z = 1.
+
+        The vertices form (stacks + 1) circles of (slices + 1) vertices, since the first and last
+        vertex of a circle are the same. Also they are the normals for the x- and y-coordinates.
+        return: a tuple with a numpy array of vertices and a numpy array of vertex index triplets.
+        """
+        angles = np.linspace(0, 2 * math.pi, this.slices + 1)
+        zs = np.linspace(0, 1, this.stacks + 1)
+        vs = np.empty((this.stacks + 1, this.slices + 1, 3))
+        vs[:, :, 0] = np.cos(angles)
+        vs[:, :, 1] = np.sin(angles)
+        vs[:, :, 2] = zs[:, np.newaxis]
+        return vs.reshape(-1, 3), _grid_triangles(this.stacks, this.slices)
+
+    def get_batch(this, v0s, v1s):
+        """Return one mesh with a cylinder for each pair of vertices v0s[i], v1s[i].
+
+        v0s, v1s: numpy arrays with one vertex per row. Cylinders without length are skipped.
+        return: a tuple with numpy arrays of vertices, normals and a flat array of vertex indices
+            forming the triangles.
+        """
+        axes = v1s - v0s
+        lengths = np.sqrt((axes * axes).sum(axis=1))
+        v0s, axes, lengths = v0s[lengths > 0], axes[lengths > 0], lengths[lengths > 0]
+        axes = axes / lengths[:, np.newaxis]
+        # Create two unit vectors perpendicular to the axis and to each other
+        helper = np.zeros_like(axes)
+        helper[np.abs(axes[:, 0]) < 0.9, 0] = 1
+        helper[np.abs(axes[:, 0]) >= 0.9, 1] = 1
+        us = np.cross(axes, helper)
+        us = us / np.sqrt((us * us).sum(axis=1))[:, np.newaxis]
+        ws = np.cross(axes, us)
+        mesh_vs, triangles = this.mesh()
+        ns = (
+            mesh_vs[np.newaxis, :, 0:1] * us[:, np.newaxis]
+            + mesh_vs[np.newaxis, :, 1:2] * ws[:, np.newaxis]
+        )
+        vs = (
+            v0s[:, np.newaxis]
+            + this.radius * ns
+            + mesh_vs[np.newaxis, :, 2:3] * (lengths[:, np.newaxis] * axes)[:, np.newaxis]
+        )
+        return _batch(vs, ns, triangles)
+
 class VSphere:
     def __init__(this, radius = 0.2, slices = 12, stacks = 12):
         this.quad = GLU.gluNewQuadric()
@@ -123,6 +169,54 @@ class VSphere:
         GLU.gluSphere(this.quad, this.radius, this.slices, this.stacks)
         GL.glPopMatrix();
 
+    def mesh(this):
+        """Return the vertices and triangles of a sphere with radius 1 around the origin.
+
+        The vertices form (stacks + 1) circles of latitude of (slices + 1) vertices. Since the
+        radius is 1 they are the normals as well.
+        return: a tuple with a numpy array of vertices and a numpy array of vertex index triplets.
+        """
+        longitudes = np.linspace(0, 2 * math.pi, this.slices + 1)
+        latitudes = np.linspace(-math.pi / 2, math.pi / 2, this.stacks + 1)[:, np.newaxis]
+        vs = np.empty((this.stacks + 1, this.slices + 1, 3))
+        vs[:, :, 0] = np.cos(latitudes) * np.cos(longitudes)
+        vs[:, :, 1] = np.cos(latitudes) * np.sin(longitudes)
+        vs[:, :, 2] = np.sin(latitudes)
+        return vs.reshape(-1, 3), _grid_triangles(this.stacks, this.slices)
+
+    def get_batch(this, centres):
+        """Return one mesh with a sphere around each of the centres.
+
+        centres: numpy array with one vertex per row.
+        return: a tuple with numpy arrays of vertices, normals and a flat array of vertex indices
+            forming the triangles.
+        """
+        mesh_vs, triangles = this.mesh()
+        ns = np.broadcast_to(mesh_vs, (len(centres),) + mesh_vs.shape)
+        vs = centres[:, np.newaxis] + this.radius * ns
+        return _batch(vs, ns, triangles)
+
+def _grid_triangles(rows, columns):
+    """Return the triangles covering a grid of (rows + 1) x (columns + 1) vertices.
+
+    The vertices are numbered row by row. Two triangles are returned per grid cell.
+    """
+    corners = (np.arange(rows)[:, np.newaxis] * (columns + 1) + np.arange(columns)).reshape(-1)
+    above = corners + columns + 1
+    return np.stack(
+        [corners, corners + 1, above + 1, corners, above + 1, above], axis=1
+    ).reshape(-1, 3)
+
+def _batch(vs, ns, triangles):
+    """Merge the instances of one mesh, with shape (instances, vertices, 3), into one mesh."""
+    no_of_instances, no_of_vs, _ = vs.shape
+    offsets = np.arange(no_of_instances)[:, np.newaxis, np.newaxis] * no_of_vs
+    return (
+        vs.reshape(-1, 3).astype(np.float32),
+        np.ascontiguousarray(ns, dtype=np.float32).reshape(-1, 3),
+        (triangles[np.newaxis] + offsets).reshape(-1).astype(np.uint32),
+    )
+
 class Interactive3DCanvas(glcanvas.GLCanvas):
     def __init__(this, parent, size = None):
         # Ensure double buffered to prevent flashing on systems where double buffering is not default.
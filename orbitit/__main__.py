@@ -23,6 +23,7 @@
 # -----------------------------------------------------------------
 # pylint: disable=too-many-lines
 
+import json
 import logging
 import os
 from pathlib import Path
@@ -57,6 +58,7 @@ from orbitit import (  # pylint: disable=ungrouped-imports
     Scenes3D,
     main_dlg,
     main_win,
+    orbit,
 )
 
 SCENES = {
@@ -103,8 +105,24 @@ def is_json_model(filename):
     return filename.suffix == ".json"
 
 
+def is_binary_model(filename):
+    """Return True if the filename indicates this is a binary shape file.
+
+    filename: a pathlib.Path object pointing to the file to read
+    """
+    return filename.suffix == ".orbitit"
+
+
+def is_data_model(filename):
+    """Return True if the filename indicates this is the data only variant of a Python file.
+
+    filename: a pathlib.Path object pointing to the file to read
+    """
+    return filename.suffix == ".pyjson"
+
+
 def read_shape_file(filename):
-    """Load off-file or JSON file and return shape
+    """Load off-file, JSON file, binary shape file or Python data file and return shape
 
     filename: a pathlib.Path object pointing to the file to read (or None)
 
@@ -117,6 +135,12 @@ def read_shape_file(filename):
                 shape = geom_3d.read_off_file(fd, name=filename.stem)
         elif is_json_model(filename):
             shape = base.Orbitit.from_json_file(filename)
+        elif is_binary_model(filename):
+            with open(filename, "rb") as fd:
+                shape = geom_3d.read_binary_file(fd, name=filename.stem)
+        elif is_data_model(filename):
+            with open(filename, "r") as fd:
+                shape = geom_3d.read_data_file(fd)
         else:
             logging.warning("unrecognised file extension, file not opened")
     return shape
@@ -200,7 +224,10 @@ class MainWindow(
 ):  # pylint: disable=too-many-instance-attributes,too-many-public-methods
     """Main window holding the shape for the orbitit program"""
 
-    wildcard = "OFF shape (*.off)|*.off| JSON shape (*.json)|*.json"
+    wildcard = (
+        "OFF shape (*.off)|*.off| JSON shape (*.json)|*.json| Binary shape (*.orbitit)|*.orbitit|"
+        " Python data shape (*.pyjson)|*.pyjson"
+    )
 
     def __init__(self, scene, shape, filename, export_dir, *args, **kwargs):
         """Initialise main window
@@ -231,7 +258,12 @@ class MainWindow(
         ]
         self.scene = None
         self.panel = MainPanel(self, scene, shape, wx.ID_ANY)
-        if filename and (is_off_model(filename) or is_json_model(filename)):
+        if filename and (
+            is_off_model(filename)
+            or is_json_model(filename)
+            or is_binary_model(filename)
+            or is_data_model(filename)
+        ):
             self.open_file(filename)
         self.Show(True)
         self.Bind(wx.EVT_CLOSE, self.on_close)
@@ -376,6 +408,10 @@ class MainWindow(
         menu.Append(menu_item)
         self.dome2 = menu_item
 
+        menu_item = wx.MenuItem(menu, wx.ID_ANY, text="Shape &Info")
+        self.Bind(wx.EVT_MENU, self.on_info, id=menu_item.GetId())
+        menu.Append(menu_item)
+
         return menu
 
     def create_view_menu(self):
@@ -551,6 +587,12 @@ class MainWindow(
             if is_off_model(filename):
                 with open(path, "r") as fd:
                     shape = geom_3d.read_off_file(fd, name=filename.stem)
+            elif is_binary_model(filename):
+                with open(path, "rb") as fd:
+                    shape = geom_3d.read_binary_file(fd, name=filename.stem)
+            elif is_data_model(filename):
+                with open(path, "r") as fd:
+                    shape = geom_3d.read_data_file(fd)
             else:
                 shape = base.Orbitit.from_json_file(path)
             if isinstance(shape, geom_3d.CompoundShape):
@@ -643,7 +685,7 @@ class MainWindow(
                     if clean_up:
                         shape = shape.clean_shape(margin)
                     with open(filepath, "w") as fd:
-                        fd.write(shape.to_off(precision, extra_data))
+                        shape.write_off(fd, precision, extra_data)
                     self.set_status_text("OFF file written")
                 else:
                     dlg.Show()
@@ -769,6 +811,15 @@ class MainWindow(
             self.panel.shape = shape
             self.SetTitle(f"Dome({self.GetTitle()})")
 
+    def on_info(self, _):
+        """Handle event '_' to show the metrics of the current shape"""
+        # The metrics take a while for big shapes, so they are only calculated on request
+        summary = geom_3d.metrics_summary(self.panel.shape.simple_shape.metrics())
+        self.set_status_text(summary)
+        dlg = wx.MessageDialog(self, summary, "Shape Info", wx.OK | wx.ICON_INFORMATION)
+        dlg.ShowModal()
+        dlg.Destroy()
+
     def on_select_scene(self, evt):
         """Handle event '_' change to scene connected to some menu ID"""
         self.load_scene(self.id_to_scene[evt.GetId()])
@@ -915,6 +966,15 @@ class MainPanel(wx.Panel):
             shape, geom_3d.CompoundShape
         ), f"expected a CompoundShape, got {type(shape)}"
         self.canvas.shape = shape
+        if old_shape is not shape:
+            # Free the OpenGL buffers of the old shape, which needs the context of the canvas
+            try:
+                self.canvas.SetCurrent(self.canvas.context)
+            except wx.PyAssertionError:
+                # The canvas isn't shown yet, so nothing was drawn
+                pass
+            else:
+                old_shape.gl_delete()
         # TODO: clean up vertices in case a vertex isn't used
         max_norm = 0
         for sub_shape in shape:
@@ -991,7 +1051,21 @@ def convert_to_off(shape, fd, precision, margin=0):
     if margin != 0:
         shape = shape.clean_shape(margin)
     # TODO: support for saving extra_data?
-    fd.write(shape.to_off(precision))
+    shape.write_off(fd, precision)
+
+
+def print_metrics(shape, margin):
+    """
+    Print the metrics of the shape in JSON format
+
+    margin: what margin to use to require that 2 floating numbers are equal. It is specified in the
+        number of decimals.
+    """
+    try:
+        shape = shape.simple_shape
+    except AttributeError:
+        pass
+    print(json.dumps(shape.metrics(margin), indent=2))
 
 
 if __name__ == "__main__":
@@ -1013,6 +1087,26 @@ if __name__ == "__main__":
         "If this is specified then the setting for ORBITIT_LIB is overwritten to the path "
         "of this files.",
     )
+    PARSER.add_argument(
+        "--clear-orbit-cache",
+        action="store_true",
+        help="Remove the cache with higher order stabilisers that is used for colouring orbits. "
+        f"The cache is saved in {orbit.hosp_cache.path}",
+    )
+    PARSER.add_argument(
+        "--warm-orbit-cache",
+        action="store_true",
+        help="Calculate the higher order stabilisers for all stabilisers of the standard "
+        "symmetry groups and save them in the cache that is used for colouring orbits.",
+    )
+    PARSER.add_argument(
+        "-b",
+        "--binary",
+        metavar="filename",
+        help="Export an input file to the binary shape format, which is read much faster than OFF "
+        "or JSON. Use the extension .orbitit to be able to open it. Specify full path. Any "
+        "--export-dir is ignored.",
+    )
     PARSER.add_argument(
         "-d",
         "--debug",
@@ -1026,6 +1120,14 @@ if __name__ == "__main__":
         help="Export to this directory when exporting files. If nothing is specified, then "
         "the current working dir is used.",
     )
+    PARSER.add_argument(
+        "-I",
+        "--info",
+        action="store_true",
+        help="Print the number of vertices, edges and faces, the different edge lengths, dihedral "
+        "angles and sphere radii of the input file in JSON format. The --margin is used to decide "
+        "which values are equal.",
+    )
     PARSER.add_argument(
         "-m",
         "--margin",
@@ -1059,7 +1161,9 @@ if __name__ == "__main__":
         "-y",
         "--py",
         metavar="filename",
-        help="Export an input file to python. Specify full path. Any --export-dir is ignored.",
+        help="Export an input file to python. If the extension .pyjson is used, then only the data "
+        "is saved, which is read much faster, since nothing needs to be executed. Specify full "
+        "path. Any --export-dir is ignored.",
     )
     PARSER.add_argument(
         "-s",
@@ -1086,20 +1190,37 @@ if __name__ == "__main__":
     )
     start_gui = True
     inputfile = None
+    orbit.hosp_cache.enabled = True
+    if PROG_ARGS.clear_orbit_cache:
+        start_gui = False
+        orbit.hosp_cache.invalidate()
+    if PROG_ARGS.warm_orbit_cache:
+        start_gui = False
+        orbit.warm_hosp_cache()
     if PROG_ARGS.inputfile:
         inputfile = Path(PROG_ARGS.inputfile)
         IN_SHAPE = read_shape_file(inputfile)
         if not IN_SHAPE:
             logging.error("Couldn't read shape file %s", inputfile)
             sys.exit(-1)
+        if PROG_ARGS.info:
+            start_gui = False
+            print_metrics(IN_SHAPE, PROG_ARGS.margin)
         if PROG_ARGS.off:
             start_gui = False
             with open(PROG_ARGS.off, "w") as o_fd:
                 convert_to_off(IN_SHAPE, o_fd, PROG_ARGS.precision, PROG_ARGS.margin)
+        elif PROG_ARGS.binary:
+            start_gui = False
+            with open(PROG_ARGS.binary, "wb") as o_fd:
+                geom_3d.write_binary_file(o_fd, IN_SHAPE)
         elif PROG_ARGS.py:
             start_gui = False
             with open(PROG_ARGS.py, "w") as o_fd:
-                IN_SHAPE.save_file(o_fd)
+                if is_data_model(Path(PROG_ARGS.py)):
+                    geom_3d.save_data_file(o_fd, IN_SHAPE)
+                else:
+                    IN_SHAPE.save_file(o_fd)
         elif PROG_ARGS.ps:
             start_gui = False
             with open(PROG_ARGS.ps, "w") as o_fd:
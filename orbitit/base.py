@@ -29,8 +29,11 @@
 # Ignore duplicate code with platonic_solids
 # pylint: disable=duplicate-code
 from abc import ABC, abstractclassmethod, abstractproperty
+import io
 import json
 
+import numpy as np
+
 # Any class support from_json should update this: mapping a string to a class
 json_to_class = {  # pylint: disable=C0103
 }
@@ -39,36 +42,71 @@ json_to_class = {  # pylint: disable=C0103
 class_to_json = {  # pylint: disable=C0103
 }
 
+# The number of list items that are encoded at once by JsonWriter
+_JSON_CHUNK_SIZE = 10000
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
 
 class Orbitit(ABC):
     """Shared base class for orbitit library."""
+    # Leave it to the subclasses whether they have an attribute dict
+    __slots__ = ()
     json_indent = None
 
+    # Set to True if an object of this class should be created as soon as its JSON object is
+    # decoded, e.g. for the parts of a compound shape, see _json_object_hook
+    json_decode_early = False
+
     @property
     def json_str(self):
         """Return a JSON representation of the object."""
-        return json.dumps(self.repr_dict, sort_keys=True, indent=self.json_indent)
+        fd = io.StringIO()
+        self.write_json(fd)
+        return fd.getvalue()
+
+    def write_json(self, fd):
+        """Write the JSON representation of the object to the file object fd.
+
+        The representation is written while it is created, see JsonWriter.
+        """
+        JsonWriter(fd, self.json_indent).write(self.json_parts)
 
     def write_json_file(self, filename):
         """Write a JSON string representation to the specified path."""
         with open(filename, "w") as fd:
-            fd.write(self.json_str)
+            self.write_json(fd)
 
     @abstractproperty  # pylint: disable=deprecated-decorator
     def repr_dict(self):
         """Return a short representation of the object."""
 
+    @property
+    def json_parts(self):
+        """Return the representation that is used for writing JSON.
+
+        This is the same as repr_dict, except that it may contain Orbitit objects and numpy arrays.
+        These are encoded when they are written, so the representation of all parts doesn't need
+        to exist at the same time.
+        """
+        return self.repr_dict
+
     @classmethod
     def from_json_file(cls, filename):
         """Recreate object from JSON file."""
         with open(filename) as fd:
-            s = fd.read()
-        return cls.from_json_str(s)
+            return cls._from_json_tree(json.load(fd, object_hook=_json_object_hook))
 
     @classmethod
     def from_json_str(cls, json_str):
         """Recreate object from JSON string representation."""
-        return cls.from_json_dict(json.loads(json_str))
+        return cls._from_json_tree(json.loads(json_str, object_hook=_json_object_hook))
+
+    @classmethod
+    def _from_json_tree(cls, tree):
+        """Recreate object from the decoded JSON, which might already be the object itself."""
+        if isinstance(tree, Orbitit):
+            return tree
+        return cls.from_json_dict(tree)
 
     @classmethod
     def from_json_dict(cls, repr_dict):
@@ -82,6 +120,163 @@ class Orbitit(ABC):
         raise NotImplementedError
 
 
+def _json_object_hook(obj):
+    """Create an Orbitit object from a decoded JSON object if it should be decoded early.
+
+    This way the JSON representation of the parts of e.g. a compound shape don't need to exist at
+    the same time.
+    """
+    if len(obj) == 2 and "data" in obj:
+        cls = json_to_class.get(obj.get("class"))
+        if cls is not None and cls.json_decode_early:
+            return cls.from_dict_data(obj["data"])
+    return obj
+
+
+class ExactNumbers:
+    """A list of numbers that JsonWriter writes without rounding the floats.
+
+    Normally the floats are rounded, see geomtypes, and e.g. 0.0 is written as 0, which is read back
+    as an int. This is meant for short lists, like colours, for which that matters.
+    """
+
+    def __init__(self, numbers):
+        self.numbers = numbers
+
+    @property
+    def json_str(self):
+        """Return the JSON representation of the numbers."""
+        return (
+            "["
+            + ", ".join(
+                float.__repr__(n) if isinstance(n, float) else json.dumps(n) for n in self.numbers
+            )
+            + "]"
+        )
+
+
+class JsonWriter:
+    """Write JSON to a file object while creating it.
+
+    The result is the same as json.dumps with sorted keys, except that lists of numbers (or other
+    scalars) are written on one line if an indent is used. Any Orbitit object that isn't a tuple
+    (like geomtypes.Vec) is replaced by its json_parts and a numpy array by a list. ExactNumbers are
+    written with all the digits of their floats.
+    """
+
+    # Function that returns the rows of a 2 dimensional numpy array with floats as lines with the
+    # numbers separated by spaces, formatted as the json module does. Set by geomtypes.
+    format_float_rows = None
+
+    def __init__(self, fd, indent=None):
+        """
+        fd: the file object to write to.
+        indent: the number of spaces to indent with. If None everything is written on one line.
+        """
+        self.fd = fd
+        self.indent = indent
+        self.item_separator = ", " if indent is None else ","
+
+    def _newline(self, level):
+        """Return what starts a new line at the specified nesting level."""
+        if self.indent is None:
+            return ""
+        return "\n" + " " * (self.indent * level)
+
+    @staticmethod
+    def _is_flat(obj):
+        """Return whether obj is a list of numbers (or other scalars)."""
+        if isinstance(obj, np.ndarray):
+            return obj.ndim == 1
+        return all(isinstance(item, _JSON_SCALARS) for item in obj)
+
+    def _format_floats(self, array):
+        """Return the rows of a numpy array with floats as JSON lists without the brackets.
+
+        If the array can't be formatted this way None is returned.
+        """
+        if (
+            self.format_float_rows is None
+            or array.dtype.kind != "f"
+            or array.ndim > 2
+            or array.size == 0
+            or not np.isfinite(array).all()
+        ):
+            return None
+        rows = self.format_float_rows(array.reshape(-1, array.shape[-1]))
+        return rows.replace(" ", ", ").splitlines()
+
+    def write(self, obj, level=0):
+        """Write obj, which is nested level deep."""
+        if isinstance(obj, dict):
+            self._write_dict(obj, level)
+        elif isinstance(obj, (list, tuple, np.ndarray)):
+            self._write_list(obj, level)
+        elif isinstance(obj, Orbitit):
+            self.write(obj.json_parts, level)
+        elif isinstance(obj, ExactNumbers):
+            self.fd.write(obj.json_str)
+        else:
+            self.fd.write(json.dumps(obj))
+
+    def _write_dict(self, obj, level):
+        """Write a dictionary, which is nested level deep, with sorted keys."""
+        if not obj:
+            self.fd.write("{}")
+            return
+        separator = "{"
+        for key in sorted(obj):
+            # like json.dumps, write other keys (e.g. numbers) as strings
+            key_str = key if isinstance(key, str) else json.dumps(key)
+            self.fd.write(f"{separator}{self._newline(level + 1)}{json.dumps(key_str)}: ")
+            self.write(obj[key], level + 1)
+            separator = self.item_separator
+        self.fd.write(f"{self._newline(level)}}}")
+
+    def _write_list(self, obj, level):
+        """Write a list, tuple or numpy array, which is nested level deep."""
+        if len(obj) == 0:
+            self.fd.write("[]")
+            return
+        # A flat list is written on one line
+        flat = self._is_flat(obj)
+        item_separator = ", " if flat else self.item_separator
+        separator = "["
+        for i in range(0, len(obj), _JSON_CHUNK_SIZE):
+            chunk = obj[i : i + _JSON_CHUNK_SIZE]
+            if isinstance(chunk, np.ndarray):
+                rows = self._format_floats(chunk)
+                if rows is not None:
+                    if flat:
+                        self.fd.write(f"{separator}{rows[0]}")
+                    else:
+                        newline = self._newline(level + 1)
+                        self.fd.write(
+                            separator
+                            + newline
+                            + f"{item_separator}{newline}".join(f"[{row}]" for row in rows)
+                        )
+                    separator = item_separator
+                    continue
+                chunk = chunk.tolist()
+            if flat or self.indent is None:
+                try:
+                    self.fd.write(f"{separator}{json.dumps(chunk, sort_keys=True)[1:-1]}")
+                    separator = item_separator
+                    continue
+                except TypeError:
+                    # The chunk contains Orbitit objects or numpy arrays
+                    pass
+            for item in chunk:
+                self.fd.write(f"{separator}{self._newline(level + 1)}")
+                if isinstance(item, (list, tuple)) and self._is_flat(item):
+                    self.fd.write(json.dumps(item))
+                else:
+                    self.write(item, level + 1)
+                separator = item_separator
+        self.fd.write("]" if flat else f"{self._newline(level)}]")
+
+
 class Singleton(type):
     """Way of defining singleton classes."""
     _instances = {}
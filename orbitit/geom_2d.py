@@ -360,3 +360,84 @@ class Polygon:
                 )
             return [self.coords[i] for i in idx]
         return self.coords[self._vs[key % n]]
+
+    def _x_sorted_edges(self):
+        """Return the non-vertical edges as coordinate pairs, each ordered from left to right."""
+        margin = geomtypes.FloatHandler.margin
+        edges = []
+        for i in range(len(self)):
+            p, q = self[i], self[i + 1]
+            if abs(p[0] - q[0]) > margin:
+                edges.append((p, q) if p[0] < q[0] else (q, p))
+        return edges
+
+    @staticmethod
+    def _get_slab_borders(edges):
+        """Return the sorted x-coordinates of the edge end points and the edge intersections."""
+        xs = [p[0] for edge in edges for p in edge]
+        for i, (p0, p1) in enumerate(edges):
+            v = (p1[0] - p0[0], p1[1] - p0[1])
+            for q0, q1 in edges[i + 1:]:
+                # Solve p0 + t.v = q0 + u.w
+                w = (q1[0] - q0[0], q1[1] - q0[1])
+                det = w[0] * v[1] - v[0] * w[1]
+                if det != 0:
+                    d = (q0[0] - p0[0], q0[1] - p0[1])
+                    t = (w[0] * d[1] - d[0] * w[1]) / det
+                    u = (v[0] * d[1] - d[0] * v[1]) / det
+                    if 0 < t < 1 and 0 < u < 1:
+                        xs.append(p0[0] + t * v[0])
+        xs.sort()
+        return xs
+
+    def even_odd_triangles(self):
+        """Divide the polygon into triangles covering the area according to the even-odd rule.
+
+        I.e. a point is part of the polygon if a ray from that point crosses the edges an odd number
+        of times. This is the area that is drawn when using the stencil buffer with a triangle fan.
+        For this the polygon is divided into vertical slabs, separated by the vertices and the edge
+        intersections. Within a slab the edges don't cross, so each pair of edges, counted from
+        below, bounds a trapezoid of the polygon.
+
+        return: a tuple with a list of 2D coordinates and a flat list of indices referring to these
+            coordinates. Each three indices form one triangle. The triangles have the opposite
+            orientation of the polygon, like the ones from geom_3d.SimpleShape.triangulate.
+        """
+        margin = geomtypes.FloatHandler.margin
+        # twice the signed area
+        area = sum(
+            self[i][0] * self[i + 1][1] - self[i + 1][0] * self[i][1] for i in range(len(self))
+        )
+        # the trapezoids are added counter-clockwise
+        corners = ((0, 1, 2), (0, 2, 3)) if area < 0 else ((0, 2, 1), (0, 3, 2))
+        edges = self._x_sorted_edges()
+        xs = self._get_slab_borders(edges)
+        coords = []
+        triangles = []
+        for x0, x1 in zip(xs[:-1], xs[1:]):
+            if x1 - x0 <= margin:
+                continue
+            x_mid = (x0 + x1) / 2
+            ys = []
+            for p, q in edges:
+                if p[0] < x_mid < q[0]:
+                    slope = (q[1] - p[1]) / (q[0] - p[0])
+                    ys.append(
+                        (
+                            p[1] + slope * (x_mid - p[0]),
+                            p[1] + slope * (x0 - p[0]),
+                            p[1] + slope * (x1 - p[0]),
+                        )
+                    )
+            ys.sort()
+            for (_, bottom_0, bottom_1), (_, top_0, top_1) in zip(ys[0::2], ys[1::2]):
+                trapezoid = ((x0, bottom_0), (x1, bottom_1), (x1, top_1), (x0, top_0))
+                for triangle in corners:
+                    # skip the triangle if the edges meet in its only vertical side
+                    if 3 in triangle and abs(top_0 - bottom_0) <= margin:
+                        continue
+                    if 3 not in triangle and abs(top_1 - bottom_1) <= margin:
+                        continue
+                    triangles.extend(range(len(coords), len(coords) + 3))
+                    coords.extend(trapezoid[i] for i in triangle)
+        return coords, triangles
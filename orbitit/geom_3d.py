@@ -33,12 +33,19 @@ Geometry types specifically related to 3D
 
 
 from abc import ABC
+import ctypes
 import copy
+import io
+import json
 import logging
 import math
+import mmap
+import re
 from functools import reduce
+from itertools import chain
 import wx
 
+import numpy as np
 from OpenGL import GL
 
 from orbitit import base, geom_2d, geomtypes, glue, indent, isometry, PS, rgb, Scenes3D
@@ -49,13 +56,113 @@ def vec(x, y, z):
     return geomtypes.Vec3([x, y, z])
 
 
+def _norms(vs):
+    """Return the norms of the vertices in the numpy array vs, one vertex per row.
+
+    The calculation is done in the same way as geomtypes.Vec.norm.
+    """
+    return np.sqrt(vs[:, 0] * vs[:, 0] + vs[:, 1] * vs[:, 1] + vs[:, 2] * vs[:, 2])
+
+
+def _normalise(vs):
+    """Return the normalised vertices of the numpy array vs, one vertex per row.
+
+    The calculation is done in the same way as geomtypes.Vec.normalise.
+    """
+    norms = _norms(vs)
+    norms[norms == 0] = 1
+    return vs / norms[:, np.newaxis]
+
+
+def _cross(v, w):
+    """Return the cross products of the rows in the numpy arrays v and w.
+
+    The calculation is done in the same way as geomtypes.Vec3.cross.
+    """
+    return np.stack(
+        [
+            v[:, 1] * w[:, 2] - v[:, 2] * w[:, 1],
+            v[:, 2] * w[:, 0] - v[:, 0] * w[:, 2],
+            v[:, 0] * w[:, 1] - v[:, 1] * w[:, 0],
+        ],
+        axis=1,
+    )
+
+
+def _vs_to_array(vs):
+    """Return a list of vertices or a geomtypes.VertexArray as numpy array, one vertex per row."""
+    if isinstance(vs, geomtypes.VertexArray):
+        return vs.array
+    if isinstance(vs, np.ndarray):
+        return vs
+    if len(vs) == 0:
+        return np.empty((0, 3))
+    return np.array([v[:3] for v in vs], dtype=float)
+
+
+def _even_odd_triangles(vs, normal):
+    """Divide a face into triangles that cover it according to the even-odd rule.
+
+    vs: numpy array with the vertices of the face, one per row.
+    normal: the face normal.
+
+    return: a tuple with a numpy array of vertices and a flat list of indices referring to these,
+        where each three indices form a triangle. See geom_2d.Polygon.even_odd_triangles.
+    """
+    # Project the face on the coordinate plane that is the most parallel to the face.
+    axis = int(np.argmax(np.abs(normal)))
+    if abs(normal[axis]) <= geomtypes.FloatHandler.margin:
+        return np.empty((0, 3)), []
+    others = [i for i in range(3) if i != axis]
+    coords, triangles = geom_2d.Polygon(vs[:, others].tolist(), range(len(vs))).even_odd_triangles()
+    result = np.empty((len(coords), 3))
+    result[:, others] = np.array(coords).reshape(-1, 2)
+    # Lift the coordinates back on the face plane
+    result[:, axis] = (normal @ vs.mean(axis=0) - result[:, others] @ normal[others]) / normal[axis]
+    return result, triangles
+
+
+def _count_rounded(values, precision):
+    """Return a dictionary that maps the rounded values on how often they appear."""
+    result = {}
+    for value in values:
+        r = round(value, precision)
+        result[r] = result.get(r, 0) + 1
+    return result
+
+
+def _group_rounded(values, items, precision):
+    """Return a dictionary that maps the rounded values on a list of the items with that value."""
+    result = {}
+    for value, item in zip(values, items):
+        r = round(value, precision)
+        try:
+            result[r].append(item)
+        except KeyError:
+            result[r] = [item]
+    return result
+
+
+def metrics_summary(metrics):
+    """Return a one line summary of the metrics returned by SimpleShape.metrics."""
+    return (
+        f"{metrics['vertices']} vertices, {metrics['edges']} edges, {metrics['faces']} faces; "
+        f"{len(metrics['edge_lengths'])} edge length(s), "
+        f"{len(metrics['dihedral_angles'])} dihedral angle(s)"
+    )
+
+
 def gl_vertex_pointer(v):
     """Wrapper of GL.glVertexPointerf to disable pylint no-member issue."""
+    if isinstance(v, geomtypes.VertexArray):
+        v = v.array
     return GL.glVertexPointerf(v)  # pylint: disable=no-member
 
 
 def gl_normal_pointer(v):
     """Wrapper of GL.glNormalPointerf to disable pylint no-member issue."""
+    if isinstance(v, geomtypes.VertexArray):
+        v = v.array
     return GL.glNormalPointerf(v)  # pylint: disable=no-member
 
 
@@ -64,9 +171,155 @@ def gl_draw_elements(s, e):
     return GL.glDrawElementsui(s, e)  # pylint: disable=no-member
 
 
+class GlBuffers:
+    """OpenGL buffer objects holding the vertices, normals and indices of a shape.
+
+    The vertices and normals are uploaded once and overwritten in place as long as their amount
+    doesn't change. Index buffers are saved by key, so that e.g. all faces of one colour can be
+    drawn with one call.
+    """
+
+    def __init__(self):
+        self.vertex_buffer = None
+        self.normal_buffer = None
+        # The type of the coordinates in the vertex and normal buffer
+        self.coord_type = GL.GL_DOUBLE
+        # key -> (buffer id, number of indices)
+        self.index_buffers = {}
+        # name -> the object the indices were created from and its version. The objects are kept so
+        # they cannot be freed, which would make it possible that their id is reused.
+        self.sources = {}
+
+    @staticmethod
+    def available():
+        """Return whether the OpenGL implementation supports buffer objects."""
+        return bool(GL.glGenBuffers) and bool(GL.glBufferSubData)
+
+    @staticmethod
+    def _upload(target, buf, data, usage):
+        """Write the numpy array data to the buffer buf and return the buffer
+
+        buf: a tuple (buffer id, size in bytes) or None if the buffer doesn't exist yet.
+        """
+        if buf is not None and buf[1] == data.nbytes:
+            GL.glBindBuffer(target, buf[0])
+            GL.glBufferSubData(target, 0, data.nbytes, data)
+        else:
+            buf_id = GL.glGenBuffers(1) if buf is None else buf[0]
+            GL.glBindBuffer(target, buf_id)
+            GL.glBufferData(target, data.nbytes, data, usage)
+            buf = (buf_id, data.nbytes)
+        GL.glBindBuffer(target, 0)
+        return buf
+
+    def set_arrays(self, vs, ns):
+        """Upload the vertices and normals.
+
+        vs, ns: lists of vertices, VertexArrays or numpy arrays. Numpy arrays of float32 are kept as
+            is, everything else is uploaded as float64. Both should have the same type.
+        """
+        vs = _vs_to_array(vs)
+        dtype = np.float32 if vs.dtype == np.float32 else np.float64
+        self.coord_type = GL.GL_FLOAT if dtype == np.float32 else GL.GL_DOUBLE
+        self.vertex_buffer = self._upload(
+            GL.GL_ARRAY_BUFFER,
+            self.vertex_buffer,
+            np.ascontiguousarray(vs, dtype=dtype),
+            GL.GL_DYNAMIC_DRAW,
+        )
+        self.normal_buffer = self._upload(
+            GL.GL_ARRAY_BUFFER,
+            self.normal_buffer,
+            np.ascontiguousarray(_vs_to_array(ns), dtype=dtype),
+            GL.GL_DYNAMIC_DRAW,
+        )
+
+    def bind_arrays(self):
+        """Let the vertex and normal pointers refer to the buffers."""
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.vertex_buffer[0])
+        GL.glVertexPointer(3, self.coord_type, 0, None)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, self.normal_buffer[0])
+        GL.glNormalPointer(self.coord_type, 0, None)
+        GL.glBindBuffer(GL.GL_ARRAY_BUFFER, 0)
+
+    def changed(self, name, source, version):
+        """Return whether the source differs from the one registered for name and register it.
+
+        source: the object the data for name is created from, e.g. a list of edges or a
+            Scenes3D.VSphere. It is compared by identity.
+        version: a number that is increased each time the source might have been changed in
+            place, e.g. the data version of a SimpleShape.
+        """
+        registered = self.sources.get(name)
+        if registered is not None and registered[0] is source and registered[1] == version:
+            return False
+        self.sources[name] = (source, version)
+        return True
+
+    def set_indices(self, key, indices):
+        """Upload the flat list of vertex indices for the specified key."""
+        buf = self.index_buffers.get(key)
+        data = np.array(indices, dtype=np.uint32)
+        buf = self._upload(
+            GL.GL_ELEMENT_ARRAY_BUFFER,
+            None if buf is None else (buf[0], buf[1] * data.itemsize),
+            data,
+            GL.GL_STATIC_DRAW,
+        )
+        self.index_buffers[key] = (buf[0], len(data))
+
+    def draw_elements(self, mode, key, offset=0, count=None):
+        """Draw count indices, by default all, from the index buffer key starting at offset."""
+        buf_id, no_of_indices = self.index_buffers[key]
+        if count is None:
+            count = no_of_indices - offset
+        if count <= 0:
+            return
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, buf_id)
+        GL.glDrawElements(
+            mode, count, GL.GL_UNSIGNED_INT, ctypes.c_void_p(offset * np.uint32().itemsize)
+        )
+        GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def delete(self):
+        """Free all buffers on the graphics card.
+
+        The OpenGL context the buffers were created in must be current.
+        """
+        ids = [buf[0] for buf in self.index_buffers.values()]
+        ids.extend(buf[0] for buf in (self.vertex_buffer, self.normal_buffer) if buf is not None)
+        if ids:
+            GL.glDeleteBuffers(len(ids), ids)
+        self.__init__()
+
+
 E = geomtypes.E  # Identity
 I = geomtypes.I  # Central inversion
 
+# Empty lines and comment lines in an OFF file
+_OFF_SKIPPED_LINES = re.compile(r"^\s*(?:#.*)?$\n?", re.MULTILINE)
+# The number of vertices or faces that are written at once to an OFF file
+_OFF_CHUNK_SIZE = 10000
+# Header of the binary shape format, see write_binary_file. It is followed by the blocks with the
+# vertices, face offsets, face vertex indices, edges, colours, face colour indices and the JSON meta
+# data. The counts specify the number of rows in each block.
+BINARY_MAGIC = b"ORBITBIN"
+BINARY_VERSION = 1
+_BINARY_HEADER = np.dtype(
+    [
+        ("magic", "S8"),
+        ("version", "<u4"),
+        ("no_of_chns", "<u4"),
+        ("no_of_vs", "<u8"),
+        ("no_of_fs", "<u8"),
+        ("no_of_face_vs", "<u8"),
+        ("no_of_es", "<u8"),
+        ("no_of_cols", "<u8"),
+        ("no_of_face_cols", "<u8"),
+        ("meta_size", "<u8"),
+    ]
+)
+
 # constant that have deal with angles
 TWO_PI = math.pi * 2
 RAD2DEG = 180.0 / math.pi
@@ -118,16 +371,11 @@ def is_int(int_str):
         return False
 
 
-def read_off_file(fd, regen_edges=True, name=""):
-    """Reads an the std 'off' format of a 3D object and returns an object of the
-    SimpleShape class.
+def _read_off_lines(lines):
+    """Read the vertices, faces, edges and colours from the lines of an OFF file, line by line.
 
-    fd: the file descriptor of a file that is opened with read permissions.
-    regen_edges: if set to True then the shape will recreate the edges for all faces, i.e. all faces
-        will be surrounded by edges. Edges will be filtered so that shared edges between faces, i.e.
-        edges that have the same vertex index, only appear once. The creation of edges is not
-        optimised and can take a long time.
-    return: an object of the SimpleShape class.
+    return: a tuple with the vertices, faces, edges, face colours, face colour indices, vertex
+        radius and edge radius. The radii are 0 unless the vertices and edges should be shown.
     """
     states = {"checkOff": 0, "readSizes": 1, "readVs": 2, "readFs": 3, "readOk": 4}
     no_of_vs = 0
@@ -146,7 +394,7 @@ def read_off_file(fd, regen_edges=True, name=""):
     state = states["checkOff"]
     vertex_radius = 0
     edge_radius = 0
-    for line in fd:
+    for line in lines:
         words = line.split()
         if len(words) > 0 and words[0][0] != "#":
             if state == states["checkOff"]:
@@ -201,7 +449,7 @@ def read_off_file(fd, regen_edges=True, name=""):
                         if len(words) == len_f + 1:
                             cols.append([0.8, 0.8, 0.8])
                         else:
-                            if is_int(words[len_f + 1]):
+                            if all(is_int(word) for word in words[len_f + 1 : len_f + 4]):
                                 cols.append(
                                     [int(words[j]) for j in range(len_f + 1, len_f + 4)]
                                 )
@@ -238,6 +486,107 @@ def read_off_file(fd, regen_edges=True, name=""):
         f"\tWould read {no_of_vs} vertices and {no_of_fs} faces;\n"
         f"\tcurrent state {states_to_name[state]} with {i} items read"
     )
+    return vs, fs, es, cols, face_cols, vertex_radius, edge_radius
+
+
+def _words_per_line(text):
+    """Return a numpy array with the number of words on each line of the text."""
+    chars = np.frombuffer(text.encode(), dtype=np.uint8)
+    is_space = np.isin(chars, np.frombuffer(b" \t\r\n\v\f", dtype=np.uint8))
+    # A word starts with a non-space character following a space
+    is_start = ~is_space
+    is_start[1:] &= is_space[:-1]
+    line_nrs = np.cumsum(chars == ord("\n"))
+    return np.bincount(line_nrs[is_start], minlength=line_nrs[-1] + 1 if len(chars) else 0)
+
+
+def _read_off_block(lines):
+    """Return the words of the lines as a list together with the number of words per line.
+
+    If the lines don't have the same number of words, then None is returned.
+    """
+    text = "\n".join(lines)
+    words_per_line = _words_per_line(text)
+    if len(words_per_line) == 0 or (words_per_line != words_per_line[0]).any():
+        return None
+    return text.split(), int(words_per_line[0])
+
+
+def _read_off_bulk(text):
+    """Read an OFF file that consist of a vertex block and a face block with lines of equal length.
+
+    All vertex lines should have the same amount of words and all faces should have the same amount
+    of vertices (at least 3) and the same colour format. Then the blocks are converted by numpy at
+    once. Comments are only supported on separate lines.
+
+    return: the same as _read_off_lines or None if the file doesn't have the expected format.
+    """
+    lines = _OFF_SKIPPED_LINES.sub("", text).split("\n")
+    if len(lines) < 2 or lines[0].split()[0] != "OFF":
+        return None
+    sizes = lines[1].split()
+    if len(sizes) < 3 or not all(size.isdigit() for size in sizes[:3]):
+        return None
+    no_of_vs, no_of_fs = int(sizes[0]), int(sizes[1])
+    if no_of_vs == 0 or no_of_fs == 0 or len(lines) < 2 + no_of_vs + no_of_fs:
+        return None
+    vertex_block = _read_off_block(lines[2 : 2 + no_of_vs])
+    face_block = _read_off_block(lines[2 + no_of_vs : 2 + no_of_vs + no_of_fs])
+    del lines
+    if vertex_block is None or face_block is None:
+        return None
+    (vertex_words, vertex_len), (face_words, face_len) = vertex_block, face_block
+    len_f = int(face_words[0]) if face_words[0].isdigit() else 0
+    if vertex_len < 3 or len_f < 3 or not (face_len == len_f + 1 or face_len >= len_f + 4):
+        return None
+    try:
+        vs = np.array(vertex_words, dtype=float).reshape(no_of_vs, vertex_len)[:, :3]
+        face_block = np.array(face_words, dtype=float).reshape(no_of_fs, face_len)
+    except ValueError:
+        return None
+    if (face_block[:, 0] != len_f).any():
+        return None
+    fs = face_block[:, 1 : len_f + 1]
+    if (fs != np.floor(fs)).any():
+        # Let the line by line reader report the invalid index
+        return None
+    col_words = [face_words[i::face_len] for i in range(len_f + 1, min(face_len, len_f + 4))]
+    # Free the words before creating the lists below: the garbage collector would visit all of
+    # them over and over again.
+    del vertex_words, face_words
+    if face_len == len_f + 1:
+        cols = [[0.8, 0.8, 0.8] for _ in range(no_of_fs)]
+    else:
+        cols = face_block[:, len_f + 1 : len_f + 4]
+        if any(c in " ".join(chain.from_iterable(col_words)) for c in ".eEiInN"):
+            # Some, or all, colours are expressed as floats. A colour is a float colour as soon as
+            # one of its channels is, e.g. 0 0.5 0.
+            is_float = np.array(
+                [not all(is_int(chn) for chn in col) for col in zip(*col_words)], dtype=bool
+            )
+            cols[is_float] = 255 * cols[is_float]
+        cols = cols.astype(int).tolist()
+    fs = fs.astype(int).tolist()
+    logging.debug("read %d vertices and %d faces", no_of_vs, no_of_fs)
+    return vs, fs, [], cols, list(range(no_of_fs)), 0, 0
+
+
+def read_off_file(fd, regen_edges=True, name=""):
+    """Reads an the std 'off' format of a 3D object and returns an object of the
+    SimpleShape class.
+
+    fd: the file descriptor of a file that is opened with read permissions.
+    regen_edges: if set to True then the shape will recreate the edges for all faces, i.e. all faces
+        will be surrounded by edges. Edges will be filtered so that shared edges between faces, i.e.
+        edges that have the same vertex index, only appear once. The creation of edges is not
+        optimised and can take a long time.
+    return: an object of the SimpleShape class.
+    """
+    text = fd.read()
+    result = _read_off_bulk(text)
+    if result is None:
+        result = _read_off_lines(text.splitlines())
+    vs, fs, es, cols, face_cols, vertex_radius, edge_radius = result
     shape = SimpleShape(vs, fs, es, colors=(cols, face_cols))
     # Note that Orbitit's panel.setShape will ignore these anyway...
     if vertex_radius != 0:
@@ -260,7 +609,169 @@ def save_file(fd, shape):
     The caller still need to close the filde descriptor afterwards
     """
     fd.write("import orbitit\n")
-    fd.write(f"shape = {repr(shape)}")
+    fd.write("shape = ")
+    shape.write_repr(indent.Writer(fd))
+
+
+def save_data_file(fd, shape):
+    """Save a shape in the data only variant of the Python file, see save_file.
+
+    This is a JSON file with the classes and the keyword arguments that the Python file uses to
+    create the shape. With read_data_file the same shape is created without executing Python.
+
+    The caller still need to close the file descriptor afterwards
+    """
+    base.JsonWriter(fd).write(shape.repr_data)
+
+
+def _cols_to_json(colors):
+    """Return the colours of a shape like they are saved by save_data_file.
+
+    The floats in JSON files are rounded, e.g. 0.0 is written as 0, and read back as an int. Each
+    list of numbers with a float, like a colour with floats, is written as base.ExactNumbers so it
+    is read back as it was. JSON has no tuples, so the colours are read as lists, like the ones in
+    rgb.
+    """
+    if any(isinstance(item, float) for item in colors):
+        return base.ExactNumbers(colors)
+    if all(isinstance(item, int) for item in colors):
+        return colors
+    return [_cols_to_json(item) for item in colors]
+
+
+def _repr_data_object_hook(obj):
+    """Create a shape as soon as its repr_data is read, see read_data_file."""
+    if "kwargs" in obj:
+        cls = base.json_to_class.get(obj.get("class"))
+        if cls is not None:
+            return cls.from_repr_data(obj["kwargs"])
+    return obj
+
+
+def read_data_file(fd):
+    """Read a shape from a file object that was written by save_data_file and return it."""
+    return json.load(fd, object_hook=_repr_data_object_hook)
+
+
+def _binary_blocks(header):
+    """Return the dtype and the shape of the blocks of a binary shape file in the saved order.
+
+    header: the header of the file, see _BINARY_HEADER.
+    """
+    return [
+        ("<f8", (int(header["no_of_vs"]), 3)),
+        ("<i8", (int(header["no_of_fs"]) + 1,)),
+        ("<i8", (int(header["no_of_face_vs"]),)),
+        ("<i8", (int(header["no_of_es"]),)),
+        ("<i8", (int(header["no_of_cols"]), int(header["no_of_chns"]))),
+        ("<i8", (int(header["no_of_face_cols"]),)),
+    ]
+
+
+def write_binary_file(fd, shape):
+    """Save a shape in the binary shape format, which can be read without parsing.
+
+    The faces are saved as one array with the vertex indices of all faces and an array with the
+    offset of each face in the former. A compound shape is saved as its merged shape. For a
+    symmetric shape the JSON representation is saved as well as orbit meta data.
+
+    fd: the file descriptor of a file that is opened in binary mode with write permissions.
+    shape: the shape to save.
+    """
+    simple_shape = shape.simple_shape
+    meta = {"name": shape.name}
+    if isinstance(shape, SymmetricShape):
+        meta["orbit"] = shape.repr_dict
+    meta = json.dumps(meta).encode()
+    shape = simple_shape
+    offsets = np.zeros(len(shape.fs) + 1, dtype="<i8")
+    np.cumsum([len(f) for f in shape.fs], out=offsets[1:])
+    cols, face_cols = shape.shape_colors
+    # older version used a float between 0 and 1
+    if isinstance(cols[0][0], float):
+        cols = [[int(chn * 255) for chn in col] for col in cols]
+    # Colours without alpha channel are padded with -1 if other colours have one.
+    no_of_chns = max(len(col) for col in cols)
+    cols = [list(col) + [-1] * (no_of_chns - len(col)) for col in cols]
+    header = np.array(
+        [
+            (
+                BINARY_MAGIC,
+                BINARY_VERSION,
+                no_of_chns,
+                len(shape.vs),
+                len(shape.fs),
+                offsets[-1],
+                len(shape.es),
+                len(cols),
+                len(face_cols),
+                len(meta),
+            )
+        ],
+        dtype=_BINARY_HEADER,
+    )
+    fd.write(header.tobytes())
+    blocks = [
+        _vs_to_array(shape.vs),
+        offsets,
+        np.fromiter(chain.from_iterable(shape.fs), dtype="<i8", count=offsets[-1]),
+        shape.es,
+        cols,
+        face_cols,
+    ]
+    for block, (dtype, block_shape) in zip(blocks, _binary_blocks(header[0])):
+        fd.write(np.asarray(block, dtype=dtype).reshape(block_shape).tobytes())
+    fd.write(meta)
+
+
+def read_binary_file(fd, name="", orbit=False):
+    """Read a shape that was saved by write_binary_file.
+
+    If possible the file is memory mapped and the vertices are used without copying them.
+
+    fd: the file descriptor of a file that is opened in binary mode with read permissions.
+    name: the name of the shape. If not specified the saved name is used.
+    orbit: if True and the file contains orbit meta data, then return the saved symmetric shape
+        instead of the merged shape.
+    return: an object of the SimpleShape class (or a symmetric shape, see orbit).
+    """
+    try:
+        buf = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, io.UnsupportedOperation, ValueError):
+        # Not a regular file (or an empty one)
+        buf = fd.read()
+    if len(buf) < _BINARY_HEADER.itemsize:
+        raise ValueError("Not a binary shape file: file too short")
+    header = np.frombuffer(buf, dtype=_BINARY_HEADER, count=1)[0]
+    if header["magic"] != BINARY_MAGIC:
+        raise ValueError("Not a binary shape file: unexpected file header")
+    if header["version"] != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary shape file version {header['version']}")
+    offset = _BINARY_HEADER.itemsize
+    blocks = []
+    for dtype, block_shape in _binary_blocks(header):
+        count = math.prod(block_shape)
+        blocks.append(
+            np.frombuffer(buf, dtype=dtype, count=count, offset=offset).reshape(block_shape)
+        )
+        offset += blocks[-1].nbytes
+    meta = json.loads(buf[offset : offset + int(header["meta_size"])])
+    if orbit and "orbit" in meta:
+        return base.Orbitit.from_json_dict(meta["orbit"])
+    vs, offsets, face_vs, es, cols, face_cols = blocks
+    face_vs = face_vs.tolist()
+    offsets = offsets.tolist()
+    fs = [face_vs[i:j] for i, j in zip(offsets[:-1], offsets[1:])]
+    cols = [[chn for chn in col if chn >= 0] for col in cols.tolist()]
+    shape = SimpleShape(
+        geomtypes.VertexArray.from_array(vs),
+        fs,
+        es.tolist(),
+        colors=(cols, face_cols.tolist()),
+        name=name if name != "" else meta["name"],
+    )
+    logging.debug("read %d vertices and %d faces", len(vs), len(fs))
+    return shape
 
 
 class Fields:
@@ -866,6 +1377,81 @@ class Plane(PlaneFromNormal):
         return result
 
 
+class Topology:
+    """Describe which faces share edges and vertices.
+
+    Only vertex indices are used, the coordinates of the vertices aren't needed. Each attribute is
+    created the first time it is used. Create a new object when the faces change.
+    """
+
+    def __init__(self, fs):
+        """
+        fs: a list of faces, where each face is a list of vertex indices.
+        """
+        self.fs = fs
+        self._edges = None
+        self._vertex_faces = None
+        self._face_neighbours = None
+
+    @property
+    def edges(self):
+        """Get a dictionary that maps each edge on the faces that share it.
+
+        key: the edge, an ordered tuple of vertex indices. Edges that connect a vertex with itself
+            are skipped.
+        value: a list with a tuple (face index, index of the edge inside the face, orientation) for
+            each face that has this edge, sorted by face index. The orientation is 1 if the face
+            goes from the first to the second vertex of the edge and -1 otherwise.
+        The edges are ordered in the way they appear in the faces.
+        """
+        if self._edges is None:
+            edges = {}
+            for face_i, face in enumerate(self.fs):
+                no_of_vs = len(face)
+                for e_i, v_i in enumerate(face):
+                    v_j = face[(e_i + 1) % no_of_vs]
+                    if v_i < v_j:
+                        edge, orientation = (v_i, v_j), 1
+                    elif v_i > v_j:
+                        edge, orientation = (v_j, v_i), -1
+                    else:
+                        continue
+                    try:
+                        edges[edge].append((face_i, e_i, orientation))
+                    except KeyError:
+                        edges[edge] = [(face_i, e_i, orientation)]
+            self._edges = edges
+        return self._edges
+
+    @property
+    def vertex_faces(self):
+        """Get a dictionary that maps a vertex index on a sorted list of faces that use it."""
+        if self._vertex_faces is None:
+            vertex_faces = {}
+            for face_i, face in enumerate(self.fs):
+                for v_i in face:
+                    try:
+                        faces = vertex_faces[v_i]
+                    except KeyError:
+                        vertex_faces[v_i] = [face_i]
+                        continue
+                    if faces[-1] != face_i:
+                        faces.append(face_i)
+            self._vertex_faces = vertex_faces
+        return self._vertex_faces
+
+    @property
+    def face_neighbours(self):
+        """Get a list with for each face a sorted list of the other faces that share an edge."""
+        if self._face_neighbours is None:
+            neighbours = [set() for _ in self.fs]
+            for shared_with in self.edges.values():
+                for face_i, _, _ in shared_with:
+                    neighbours[face_i].update(f_i for f_i, _, _ in shared_with if f_i != face_i)
+            self._face_neighbours = [sorted(n) for n in neighbours]
+        return self._face_neighbours
+
+
 TRI_CW = 1  # clockwise triangle vertices to get outer normal
 TRI_CCW = 2  # counter-clockwise triangle vertices to get outer normal
 TRI_OUT = 3  # the normal pointing away from the origin is the normal
@@ -881,6 +1467,19 @@ class SimpleShape(base.Orbitit):
     """
 
     normal_direction = TRI_OUT
+    # Save the vertices in a geomtypes.VertexArray. If False a list of geomtypes.Vec3 is used.
+    use_vertex_array = True
+    # Draw with OpenGL buffer objects if supported. If False (or not supported) client side arrays
+    # are used.
+    use_gl_buffers = True
+    # Increased each time the vertices, edges, faces or face colours change, so that the OpenGL
+    # buffers are updated for lists that are changed in place as well, see GlBuffers.changed.
+    _data_version = 0
+    # Triangulate faces that aren't triangles on the CPU when generating the normals, so that they
+    # don't need to be drawn using the stencil buffer, see create_vertex_normals.
+    use_cpu_triangulation = True
+    # Create the shape as soon as it is decoded when reading JSON, see base.Orbitit.
+    json_decode_early = True
 
     def __init__(
         self,
@@ -919,6 +1518,7 @@ class SimpleShape(base.Orbitit):
         orientation: orientation of the base shape. This is an isometry operation.
         """
         self._edges = {}
+        self._topology = None
         if not es:
             es = []
         if not ns:
@@ -932,11 +1532,17 @@ class SimpleShape(base.Orbitit):
         self._shape_colors = [[], []]
         self.no_of_colors = 0
         self.name = name
-        # For four below, see create_vertex_normals
+        # For five below, see create_vertex_normals
         self.normal_per_vertex = []
         self.vertex_per_normal = []
         self.triangulated_faces_n_index = []
+        self.face_needs_stencil = []
         self.edges_n_index = []
+        # Caches for create_vertex_normals that only depend on the faces and the edges
+        self._face_slots = None
+        self._edges_n_index = None
+        # face index -> (vertices of the face, even-odd triangulation), see _add_even_odd_triangles
+        self._even_odd_cache = {}
         self.face_normals_up_to_date = False
         self.face_normals_normalised = None
         self.gl_initialised = False
@@ -952,6 +1558,10 @@ class SimpleShape(base.Orbitit):
         self.gl.cyl = None
         self.gl.draw_faces = True
         self.gl.force_set_vs = False
+        self.gl.buffers = None
+        self.gl.face_batches = []
+        # name -> GlBuffers with one mesh for all vertex spheres or edge cylinders
+        self.gl.batch_buffers = {}
         self.saved_ns = None
         self.saved_vs = None
         self.spheres_radii = Fields()
@@ -982,31 +1592,58 @@ class SimpleShape(base.Orbitit):
             self.orientation = geomtypes.E
 
     def __repr__(self):
-        # s = indent.Str('%s(\n' % base.find_module_class_name(self.__class__, __name__))
-        s = indent.Str("SimpleShape(\n")
-        s = s.add_incr_line("vs=[")
-        s.incr()
+        fd = io.StringIO()
+        self.write_repr(indent.Writer(fd))
+        return fd.getvalue()
+
+    def write_repr(self, writer, suffix=""):
+        """Write the Python representation, as returned by __repr__, with an indent.Writer.
+
+        suffix: text to add after the closing bracket, e.g. a separator.
+        """
+        prefix = f"{__name__}." if __name__ != "__main__" else ""
+        # writer.add_line(f"{prefix}{base.find_module_class_name(self.__class__, __name__)}(")
+        writer.add_line(f"{prefix}SimpleShape(")
+        writer.add_incr_line("vs=[")
+        writer.incr()
         try:
-            s = s.glue_line(
-                ",\n".join(indent.Str(repr(v)).reindent(s.indent) for v in self.vs)
-            )
+            writer.add_blocks(repr(v) for v in self.vs)
         except AttributeError:
             logging.error("Are you sure the vertices are all of type geomtypes.Vec3?")
             raise
-        s = s.add_decr_line("],")
-        s = s.add_line("fs=[")
-        s.incr()
-        s = s.glue_line(
-            ",\n".join(indent.Str(repr(f)).reindent(s.indent) for f in self.fs)
-        )
-        s = s.add_decr_line("],")
-        s = s.add_line(f"es={self.es},")
-        s = s.add_line(f"colors={self._shape_colors},")
-        s = s.add_line(f'name="{self.name}"')
-        s = s.add_decr_line(")")
-        if __name__ != "__main__":
-            s = s.insert(f"{__name__}.")
-        return s
+        writer.add_decr_line("],")
+        writer.add_line("fs=[")
+        writer.incr()
+        writer.add_blocks(repr(f) for f in self.fs)
+        writer.add_decr_line("],")
+        writer.add_line(f"es={self.es},")
+        writer.add_line(f"colors={self._shape_colors},")
+        writer.add_line(f'name="{self.name}"')
+        writer.add_decr_line(f"){suffix}")
+
+    @property
+    def repr_data(self):
+        """Return the class and the keyword arguments that are used by __repr__.
+
+        This is what is saved by save_data_file.
+        """
+        return {
+            "class": base.class_to_json[SimpleShape],
+            "kwargs": {
+                "vs": _vs_to_array(self.vs),
+                "fs": self.fs,
+                "es": self.es,
+                "colors": _cols_to_json(self._shape_colors),
+                "name": self.name,
+            },
+        }
+
+    @classmethod
+    def from_repr_data(cls, kwargs):
+        """Create object from the keyword arguments created by repr_data."""
+        col_defs, face_cols = kwargs["colors"]
+        kwargs["colors"] = (tuple(col_defs), tuple(face_cols))
+        return cls(**kwargs)
 
     @property
     def repr_dict(self):
@@ -1014,11 +1651,20 @@ class SimpleShape(base.Orbitit):
 
         Only essential parts are saved. E.g. orientation isn't essential here.
         """
+        return self._get_repr_dict(list(self.vs))
+
+    @property
+    def json_parts(self):
+        """Return repr_dict with the vertices in one numpy array, see base.Orbitit.json_parts."""
+        return self._get_repr_dict(_vs_to_array(self.vs))
+
+    def _get_repr_dict(self, vs):
+        """Return repr_dict using the specified representation of the vertices."""
         return {
             "class": base.class_to_json[self.json_class],
             "data": {
                 "name": self.name,
-                "vs": self.vs,
+                "vs": vs,
                 "fs": self.fs,
                 "cols": self._shape_colors[0],
                 "face_cols": self._shape_colors[1],
@@ -1032,7 +1678,7 @@ class SimpleShape(base.Orbitit):
         if isinstance(data["cols"][0][0], float):
             data["cols"] = [[int(chn * 255) for chn in d] for d in data["cols"]]
         return cls(
-            [geomtypes.Vec3(v) for v in data["vs"]],
+            data["vs"],
             data["fs"],
             colors=(data["cols"], data["face_cols"]),
             name=data["name"],
@@ -1102,16 +1748,18 @@ class SimpleShape(base.Orbitit):
         """
         v_props = self.vertex_props
         f_props = self.face_props
-        vs_copied = copy.deepcopy(v_props["vs"])
+        # The vertices are immutable, only the list needs to be copied
+        vs_copied = list(v_props["vs"])
         fs_copied = copy.deepcopy(f_props["fs"])
         with geomtypes.FloatHandler(precision):
             glue.mergeVs(vs_copied, fs_copied, precision)
-        # this may result on less faces, which breaks the colours!
-        # TODO either update the colors immediately or return an array with
-        # deleted face indices.
-        glue.clean_up_vs_fs(vs_copied, fs_copied)
+        _, face_map = glue.clean_up_vs_fs(vs_copied, fs_copied, min_face_len=3)
         v_props["vs"] = vs_copied
         f_props["fs"] = fs_copied
+        cols, face_cols = f_props["colors"]
+        if face_cols:
+            face_cols = [col for col, i in zip(face_cols, face_map) if i >= 0]
+        f_props["colors"] = (cols, face_cols)
         shape = SimpleShape([], [], [])
         shape.vertex_props = v_props
         shape.face_props = f_props
@@ -1152,9 +1800,13 @@ class SimpleShape(base.Orbitit):
         """
         if props:
             if "vs" in props and props["vs"] is not None:
-                self.vs = [geomtypes.Vec3(v) for v in props["vs"]]
+                if self.use_vertex_array:
+                    self.vs = geomtypes.VertexArray(props["vs"])
+                else:
+                    self.vs = [geomtypes.Vec3(v) for v in props["vs"]]
                 self.vertex_range = range(len(self.vs))
                 self.gl.update_vertices = True
+                self._data_version += 1
                 self.face_normals_up_to_date = False
             if "ns" in props and props["ns"] is not None:
                 self.ns = props["ns"]
@@ -1273,36 +1925,12 @@ class SimpleShape(base.Orbitit):
 
         Edges will be filtered so that shared edges between faces,
         i.e. edges that have the same vertex index, only appear once.
-        The creation of edges is not optimised and can take a long time.
-        """
-        # edge dictionary:
-        # key: the edge, an ordered tuple of indices in self.vs
-        # value: tuple of face index, and index inside the face
-        edge_dict = {}
-
-        self.es = []
-        for face_i, face in enumerate(self.fs):
-            no_of_vs = len(face)
-            for e_i, v_i in enumerate(face):
-                v_j = face[(e_i + 1) % no_of_vs]
-                if v_i < v_j:
-                    edge = (v_i, v_j)
-                elif v_i > v_j:
-                    # note: including edges of length 0
-                    edge = (v_j, v_i)
-                else:
-                    # remove edges that connect the exact same vertex. If you want to use a vertex
-                    # connecting the same point in space, use different vertices with the same
-                    # coordinate and don't simplify the shape
-                    continue
-                try:
-                    edge_dict[edge].append((face_i, e_i))
-                except KeyError:
-                    # New edge
-                    edge_dict[edge] = [(face_i, e_i)]
-                    self.es.extend(edge)
-
-        self._edges = edge_dict
+        """
+        # Note: edges that connect the exact same vertex are removed. If you want to use a vertex
+        # connecting the same point in space, use different vertices with the same coordinate and
+        # don't simplify the shape
+        self._edges = self.topology.edges
+        self.es = [v_i for edge in self._edges for v_i in edge]
 
     @property
     def face_props(self):
@@ -1380,12 +2008,38 @@ class SimpleShape(base.Orbitit):
         E.g. when reverse_face is used or any other time the faces array is updated.
         """
         self.triangulated_faces_n_index = self.triangulate(self.fs)
+        self.face_needs_stencil = [len(face) > 3 for face in self.fs]
         self.no_of_fs = len(self.fs)
+        self._topology = None
+        self._face_slots = None
+        # The edge indices are placed after the vertices of the faces
+        self._edges_n_index = None
+        self._even_odd_cache = {}
         self.face_normals_up_to_date = False
+        self._data_version += 1
         # if you autogenerate the vertex normal, using the faces, you need to
         # regenerate by setting self.gl.update_vertices
         self.gl.update_vertices = self.generate_normals
 
+    @property
+    def es(self):
+        """Get the edges: a flat list of vertex indices, where each two indices form one edge."""
+        return self._es
+
+    @es.setter
+    def es(self, es):
+        """Set the edges: a flat list of vertex indices, where each two indices form one edge."""
+        self._es = es
+        self._edges_n_index = None
+        self._data_version += 1
+
+    @property
+    def topology(self):
+        """Get the Topology object that describes which faces share edges and vertices."""
+        if self._topology is None:
+            self._topology = Topology(self.fs)
+        return self._topology
+
     def _set_faces(self, fs):
         """
         Define the shape faces
@@ -1457,6 +2111,7 @@ class SimpleShape(base.Orbitit):
             new_face_cols.append(new_col_i)
 
         self._shape_colors = (tuple(new_col_defs), tuple(new_face_cols))
+        self._data_version += 1
         self.no_of_cols = len(new_col_defs)
         self.col_range = range(self.no_of_cols)
 
@@ -1534,6 +2189,65 @@ class SimpleShape(base.Orbitit):
             return normal.normalise()
         return normal
 
+    def _get_face_slots(self):
+        """Return the indices that only depend on the faces.
+
+        These are only created again after the faces are updated. Returned is a tuple with
+        - a numpy array with the vertex indices of all faces after each other. Each of these is a
+          slot in vertex_per_normal, see create_vertex_normals.
+        - a numpy array with the face index for each slot.
+        - the triangulated faces, where the indices refer to the slots.
+        - a numpy array with the first three vertex indices of each face.
+        """
+        if self._face_slots is None:
+            face_lengths = [len(face) for face in self.fs]
+            face_vs = np.fromiter(
+                (v_idx for face in self.fs for v_idx in face), dtype=int, count=sum(face_lengths)
+            )
+            face_per_slot = np.repeat(np.arange(len(self.fs)), face_lengths)
+            slots = iter(range(len(face_vs)))
+            face_per_normal_idx = [[next(slots) for _ in face] for face in self.fs]
+            triangles = np.array([face[:3] for face in self.fs], dtype=int).reshape(-1, 3)
+            self._face_slots = (
+                face_vs, face_per_slot, self.triangulate(face_per_normal_idx), triangles
+            )
+        return self._face_slots
+
+    def _face_normals_array(self, normalise):
+        """Return the face normals as a numpy array, one face per row.
+
+        The normals are calculated for all faces at once, but in the same way as
+        generate_face_normal.
+        """
+        if not self.fs:
+            return np.empty((0, 3))
+        assert min(len(f) for f in self.fs) > 2, "An face should at least have 2 vertices"
+        vs = _vs_to_array(self.vs)
+        triangles = self._get_face_slots()[3]
+        v0 = vs[triangles[:, 0]]
+        v1 = vs[triangles[:, 1]]
+        v2 = vs[triangles[:, 2]]
+        # See Face.gravity, Face.first_vec and Face.normal
+        gravity = ((0.0 + v0) + v1 + v2) / 3
+        first_vec = _normalise(v0 - gravity)
+        normals = _cross(first_vec, _normalise(v1 - gravity))
+        is_zero = (np.abs(normals) < geomtypes.FloatHandler.margin).all(axis=1)
+        if is_zero.any():
+            normals[is_zero] = _cross(
+                first_vec[is_zero], _normalise(v2[is_zero] - gravity[is_zero])
+            )
+        normals = _normalise(normals)
+        if self.normal_direction in (TRI_OUT, TRI_IN):
+            outwards = _norms(v0) < _norms(v0 + normals)
+            if self.normal_direction == TRI_OUT:
+                flip = ~outwards
+            else:
+                flip = outwards
+            normals[flip] = -normals[flip]
+        if normalise:
+            return _normalise(normals)
+        return normals
+
     def create_face_normals(self, normalise):
         """Create face normals and save in self.
 
@@ -1545,9 +2259,7 @@ class SimpleShape(base.Orbitit):
             not self.face_normals_up_to_date
             or self.face_normals_normalised != normalise
         ):
-            self.face_normals = [
-                self.generate_face_normal(f, normalise) for f in self.fs
-            ]
+            self.face_normals = geomtypes.VertexArray(self._face_normals_array(normalise))
             self.face_normals_up_to_date = True
             self.face_normals_normalised = normalise
 
@@ -1564,9 +2276,12 @@ class SimpleShape(base.Orbitit):
         vertex_per_normal: contains the vertices per face and edge. It relates to normal_per_vertex
             by using the same index
         triangulated_faces_n_index: The faces triangulated. Each face is a list of triplets, one for
-            each triangle. These triangles are supposed to be used with the stencil buffer. The
-            indices of these faces refer to vertex_per_normal / normal_per_vertex and not to vs. The
-            former contains one vertex for each face and one for the edges.
+            each triangle. If use_cpu_triangulation is set, then these triangles cover the faces
+            according to the even-odd rule. Otherwise they are supposed to be used with the stencil
+            buffer. The indices of these faces refer to vertex_per_normal / normal_per_vertex and
+            not to vs. The former contains one vertex for each face and one for the edges, followed
+            by the vertices of the even-odd triangles.
+        face_needs_stencil: for each face whether it needs to be drawn with the stencil buffer.
         edges_n_index: contains the edge indices where the indices aren't referring to self.es, but
             to vertex_per_normal / normal_per_vertex
 
@@ -1575,32 +2290,64 @@ class SimpleShape(base.Orbitit):
         if vs is None:
             vs = self.vs
         self.create_face_normals(normalise)
-        # only use a vertex once, since the normal can be different
-        self.vertex_per_normal = []
-        self.normal_per_vertex = []
-        for face, normal in zip(self.fs, self.face_normals):
-            self.normal_per_vertex.extend([normal for vi in face])
-            self.vertex_per_normal.extend([geomtypes.Vec3(vs[vi][0:3]) for vi in face])
-        counter = -1
-
-        def inc():
-            nonlocal counter
-            counter += 1
-            return counter
-
-        face_per_normal_idx = [[inc() for i in face] for face in self.fs]
-        self.triangulated_faces_n_index = self.triangulate(face_per_normal_idx)
-        # Now for the edge vertices. Note that edge vertices aren't necessarily
-        # part of the face vertices.
-        edge_idx_offset = len(self.vertex_per_normal)
-        self.vertex_per_normal.extend(vs)
-        if normalise:
-            for v in vs:
-                self.normal_per_vertex.append(v.normalize())
-        else:
-            for v in vs:
-                self.normal_per_vertex.append(v)
-        self.edges_n_index = [old_v_idx + edge_idx_offset for old_v_idx in self.es]
+        face_vs, face_per_slot, self.triangulated_faces_n_index, _ = self._get_face_slots()
+        if self._edges_n_index is None:
+            # Note that edge vertices aren't necessarily part of the face vertices.
+            edge_idx_offset = len(face_vs)
+            self._edges_n_index = [old_v_idx + edge_idx_offset for old_v_idx in self.es]
+        self.edges_n_index = self._edges_n_index
+        # only use a vertex once, since the normal can be different. After the vertices of the
+        # faces all vertices are added for the edges.
+        vs = _vs_to_array(vs)
+        self.vertex_per_normal = geomtypes.VertexArray(np.concatenate([vs[face_vs], vs]))
+        self.normal_per_vertex = geomtypes.VertexArray(
+            np.concatenate(
+                [
+                    self.face_normals.array[face_per_slot],
+                    _normalise(vs) if normalise else vs,
+                ]
+            )
+        )
+        self.face_needs_stencil = [len(face) > 3 for face in self.fs]
+        if self.use_cpu_triangulation:
+            self._add_even_odd_triangles(vs)
+
+    def _add_even_odd_triangles(self, vs):
+        """Replace the triangles of the faces that need the stencil buffer by even-odd triangles.
+
+        The new vertices and normals are appended to vertex_per_normal and normal_per_vertex. The
+        triangulation is saved per face and only calculated again when a vertex of the face moves.
+
+        vs: a numpy array with the vertices, one per row.
+        """
+        if not any(self.face_needs_stencil):
+            return
+        offset = len(self.vertex_per_normal)
+        triangulated = list(self.triangulated_faces_n_index)
+        normals = self.face_normals.array
+        extra_vs = [self.vertex_per_normal.array]
+        extra_ns = [self.normal_per_vertex.array]
+        for face_idx, face in enumerate(self.fs):
+            if not self.face_needs_stencil[face_idx]:
+                continue
+            face_vs = vs[face]
+            cached = self._even_odd_cache.get(face_idx)
+            if cached is None or not np.array_equal(cached[0], face_vs):
+                cached = (face_vs, _even_odd_triangles(face_vs, normals[face_idx]))
+                self._even_odd_cache[face_idx] = cached
+            triangle_vs, triangles = cached[1]
+            triangulated[face_idx] = [offset + i for i in triangles]
+            offset += len(triangle_vs)
+            extra_vs.append(triangle_vs)
+            extra_ns.append(np.repeat(normals[face_idx : face_idx + 1], len(triangle_vs), axis=0))
+        self.vertex_per_normal = geomtypes.VertexArray(np.concatenate(extra_vs))
+        self.normal_per_vertex = geomtypes.VertexArray(np.concatenate(extra_ns))
+        self.triangulated_faces_n_index = triangulated
+        self.face_needs_stencil = [False] * len(self.fs)
+
+    def _es_array(self):
+        """Return the edges as a numpy array with shape (N, 2) of vertex indices."""
+        return np.array(self.es, dtype=int).reshape(-1, 2)
 
     def create_edge_lengths(self, precision=12):
         """For each edge calculate the edge length.
@@ -1609,24 +2356,12 @@ class SimpleShape(base.Orbitit):
         self.len_to_edge. The dictionary maps different lengths (keys) onto edges; two-tuples
         consisting of two ordered vertex indices (values). returned.
         """
-        len_to_edge = {}
-        for ei in len(self.es):
-            vi0 = self.es[ei]
-            vi1 = self.es[ei + 1]
-            if vi0 < vi1:
-                t = (vi0, vi1)
-            else:
-                t = (vi1, vi0)
-            length = (
-                geomtypes.Vec3(self.vs[vi1]) - geomtypes.Vec3(self.vs[vi0])
-            ).norm()
-            length = round(length, precision)
-            try:
-                len_to_edge[length].append(t)
-            except KeyError:
-                len_to_edge[length] = [t]
-        self.len_to_edge = len_to_edge
-        return len_to_edge
+        vs = _vs_to_array(self.vs)
+        es = self._es_array()
+        lengths = _norms(vs[es[:, 1]] - vs[es[:, 0]])
+        edges = [(vi0, vi1) if vi0 < vi1 else (vi1, vi0) for vi0, vi1 in es.tolist()]
+        self.len_to_edge = _group_rounded(lengths.tolist(), edges, precision)
+        return self.len_to_edge
 
     def _get_dihedral_angles(self, precision=12):
         """Get all different dihedral angles.
@@ -1634,61 +2369,32 @@ class SimpleShape(base.Orbitit):
         precision: number of decimals to take into account to interpret as unique angle
 
         return: a dictionary where the keys are the unique dihedral angles and the values are a list
-        of edges, where each edge is a tuple with a pair of vertex indices.
+        of edges, where each edge is a tuple with a pair vertex indices. An edge appears once for
+        each pair of faces that share it.
         """
         self.create_face_normals(normalise=False)
-        dihedral_to_edge = {}  # the result
-        no_of_faces = len(self.fs)
-
-        def add_dihedral_angle(face_idx, chk_face, cfi, edge, v0_chk_face_idx):
-            """Add one dihedral angle to the global dihedral_to_edge
-
-            face_idx: the index of the face under investigation
-            chk_face: the face we are checking against holding a list of vertex indices
-            cfi: the index of chk_face in the list of faces
-            edge: an edge consisting of a pair vertex indices (in a tuple). The dihedral angle for
-                this face will be added.
-            v0_chk_face_idx: index of edge[0] in chk_face.
-
-            return: None.
-            """
-            v0_idx, v1_idx = edge
-            i_prev = v0_chk_face_idx - 1
-            if i_prev < 0:
-                i_prev = len(chk_face) - 1
-            i_next = v0_chk_face_idx + 1
-            if i_next >= len(chk_face):
-                i_next = 0
-            # if the vertex v0_idx - v1_idx is part of chk_face
-            if v1_idx in (chk_face[i_prev], chk_face[i_next]):
-                # found: add the angle and edge to dihedral_to_edge
-                if v0_idx < v1_idx:
-                    t = (v0_idx, v1_idx)
-                else:
-                    t = (v1_idx, v0_idx)
-                angle = math.pi - self.face_normals[face_idx].angle(
-                    self.face_normals[cfi]
-                )
-                angle = round(angle, precision)
-                try:
-                    dihedral_to_edge[angle].append(t)
-                except KeyError:
-                    dihedral_to_edge[angle] = [t]
-
-        for face_idx, face in enumerate(self.fs):
-            no_of_indices = len(face)
-            for edge in [
-                (v_idx, face[(i + 1) % no_of_indices]) for i, v_idx in enumerate(face)
-            ]:
-                for next_face_idx in range(face_idx + 1, no_of_faces):
-                    chk_face = self.fs[next_face_idx]
-                    try:
-                        i = chk_face.index(edge[0])
-                    except ValueError:
-                        i = -1
-                    if i >= 0:
-                        add_dihedral_angle(face_idx, chk_face, next_face_idx, edge, i)
-        return dihedral_to_edge
+        face_pairs = []
+        edges = []
+        for edge, shared_with in self.topology.edges.items():
+            faces = [face_i for face_i, _, _ in shared_with]
+            for i, face_i in enumerate(faces):
+                for face_j in faces[i + 1:]:
+                    if face_i != face_j:
+                        face_pairs.append((face_i, face_j))
+                        edges.append(edge)
+        if not face_pairs:
+            return {}
+        normals = self.face_normals.array
+        norms = _norms(normals)
+        face_pairs = np.array(face_pairs)
+        # faces without a normal, e.g. because all vertices are on one line, are skipped
+        valid = (norms[face_pairs[:, 0]] > 0) & (norms[face_pairs[:, 1]] > 0)
+        face_pairs = face_pairs[valid]
+        edges = [edge for edge, ok in zip(edges, valid.tolist()) if ok]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            normals = normals / norms[:, np.newaxis]
+        cos = np.clip((normals[face_pairs[:, 0]] * normals[face_pairs[:, 1]]).sum(axis=1), -1, 1)
+        return _group_rounded((math.pi - np.arccos(cos)).tolist(), edges, precision)
 
     def _divide_col(self):
         """
@@ -1739,16 +2445,19 @@ class SimpleShape(base.Orbitit):
         """Translate the model using the specified 3D vector."""
         self.vs = [geomtypes.Vec3(trans) + v for v in self.vs]
         self.gl.update_vertices = True
+        self._data_version += 1
 
     def transform(self, trans):
         """Transform the model using the specified instance of a geomtypes.Trans3 object."""
-        self.vs = [trans * v for v in self.vs]
+        self.vs = trans.apply_many(self.vs)
         self.gl.update_vertices = True
+        self._data_version += 1
 
     def scale(self, factor):
         """Scale the vertices of the object."""
         self.vs = [factor * v for v in self.vs]
         self.gl.update_vertices = True
+        self._data_version += 1
 
     def zoom(self, factor):
         """Use the specified factor to zoom in when drawing the 3D object.
@@ -1769,41 +2478,58 @@ class SimpleShape(base.Orbitit):
         ]
 
     def calc_sphere_radii(self, precision=12):
-        """Calculate the radii for the circumscribed, inscribed and mid sphere(s)"""
-        # calculate the circumscribed spheres:
+        """Calculate the radii for the circumscribed, inscribed and mid sphere(s)
+
+        Each is saved in self.spheres_radii as a dictionary that maps the rounded radius on the
+        number of vertices, edges and faces, respectively. For the inscribed sphere(s) the centre of
+        gravity of each face is used.
+        """
         self.spheres_radii.precision = precision
-        s = {}
-        for v in self.vs:
-            r = round(v.norm(), precision)
-            try:
-                cnt = s[r]
-            except KeyError:
-                cnt = 0
-            s[r] = cnt + 1
-        self.spheres_radii.circumscribed = s
-        s = {}
-        for i in range(0, len(self.es), 2):
-            v = (self.vs[self.es[i]] + self.vs[self.es[i + 1]]) / 2
-            r = round(v.norm(), precision)
-            try:
-                cnt = s[r]
-            except KeyError:
-                cnt = 0
-            s[r] = cnt + 1
-        self.spheres_radii.mid = s
-        s = {}
-        try:
-            self.fs_gravity
-        except AttributeError:
-            self.calc_fs_gravity()
-        for g in self.fs_gravity:
-            r = round(g.norm(), precision)
-            try:
-                cnt = s[r]
-            except KeyError:
-                cnt = 0
-            s[r] = cnt + 1
-        self.spheres_radii.inscribed = s
+        vs = _vs_to_array(self.vs)
+        es = self._es_array()
+        self.spheres_radii.circumscribed = _count_rounded(_norms(vs).tolist(), precision)
+        self.spheres_radii.mid = _count_rounded(
+            _norms((vs[es[:, 0]] + vs[es[:, 1]]) / 2).tolist(), precision
+        )
+        fs_gravity = np.empty((0, 3))
+        if self.fs:
+            face_lengths = np.array([len(f) for f in self.fs])
+            face_starts = np.cumsum(face_lengths) - face_lengths
+            v_indices = np.fromiter(
+                (v_i for f in self.fs for v_i in f), dtype=int, count=int(face_lengths.sum())
+            )
+            fs_gravity = np.add.reduceat(vs[v_indices], face_starts) / face_lengths[:, np.newaxis]
+        self.spheres_radii.inscribed = _count_rounded(_norms(fs_gravity).tolist(), precision)
+
+    def metrics(self, precision=12):
+        """Calculate metrics of the shape
+
+        precision: the number of decimals to use when deciding which lengths and angles are equal.
+
+        Return a dictionary with:
+            vertices: the number of vertices
+            edges: the number of edges
+            faces: the number of faces
+            circumscribed: a dictionary that maps the radius of the circumscribed sphere(s) on the
+                number of vertices on it.
+            mid: the same for the mid sphere(s) and the centres of the edges
+            inscribed: the same for the inscribed sphere(s) and the centres of gravity of the faces
+            edge_lengths: a dictionary that maps each edge length on the list of edges with that
+                length. Each edge is an ordered tuple of vertex indices.
+            dihedral_angles: a dictionary that maps each dihedral angle on the list of edges with
+                that angle.
+        """
+        self.calc_sphere_radii(precision)
+        return {
+            "vertices": len(self.vs),
+            "edges": len(self.es) // 2,
+            "faces": len(self.fs),
+            "circumscribed": self.spheres_radii.circumscribed,
+            "mid": self.spheres_radii.mid,
+            "inscribed": self.spheres_radii.inscribed,
+            "edge_lengths": self.create_edge_lengths(precision),
+            "dihedral_angles": self._get_dihedral_angles(precision),
+        }
 
     def gl_init(self):
         """
@@ -1825,6 +2551,20 @@ class SimpleShape(base.Orbitit):
 
         self.gl_initialised = True
 
+    def gl_delete(self):
+        """Free the OpenGL buffer objects of the shape.
+
+        Call this when the shape isn't drawn anymore. The OpenGL context the shape was drawn in must
+        be current. The buffers are created again if the shape is drawn later.
+        """
+        if self.gl.buffers:
+            self.gl.buffers.delete()
+            self.gl.buffers = None
+            self.gl.update_vertices = True
+        for buffers in self.gl.batch_buffers.values():
+            buffers.delete()
+        self.gl.batch_buffers = {}
+
     def gl_draw(self):
         """wrap _gl_draw to be able to catch OpenGL errors"""
         if self.vs == []:
@@ -1869,58 +2609,43 @@ class SimpleShape(base.Orbitit):
                     total += v_usage[v_idx]
                 if total != 0:
                     g = g / total
-                vs = [self.zoom_factor * (geomtypes.Vec3(v) - g) + g for v in self.vs]
+                if isinstance(self.vs, geomtypes.VertexArray):
+                    vs = geomtypes.VertexArray(self.zoom_factor * (self.vs.array - g) + g)
+                else:
+                    vs = [self.zoom_factor * (geomtypes.Vec3(v) - g) + g for v in self.vs]
 
-            # At least on Ubuntu 8.04 conversion is not needed
-            # On windows and Ubuntu 9.10 the vs cannot be an array of vec3...
             if not self.generate_normals:
-                try:
-                    if not gl_vertex_pointer(vs):
-                        return
-                    normals = self.ns
-                except TypeError:
-                    vs = [[v[0], v[1], v[2]] for v in vs]
-                    logging.info("gl_draw: converting vs(ns); vec3 type not accepted")
-                    if not gl_vertex_pointer(vs):
-                        return
-                    normals = [[v[0], v[1], v[2]] for v in self.ns]
-                if normals != []:
-                    assert len(normals) == len(
+                if self.ns != []:
+                    assert len(self.ns) == len(
                         vs
                     ), "the normal vector array 'normals' should have as many normals as vertices."
-                    gl_normal_pointer(normals)
-                    self.saved_ns = normals
+                    normals = self.ns
                 else:
-                    gl_normal_pointer(vs)
-                    self.saved_ns = vs
+                    normals = vs
             elif self.ns != [] and len(self.ns) == len(vs):
-                try:
-                    if not gl_vertex_pointer(vs):
-                        return
-                    normals = self.ns
-                except TypeError:
-                    vs = [[v[0], v[1], v[2]] for v in vs]
-                    logging.info("gl_draw: converting vs(ns); vec3 type not accepted")
-                    if not gl_vertex_pointer(vs):
-                        return
-                    normals = [[n[0], n[1], n[2]] for n in self.ns]
-                gl_normal_pointer(normals)
-                self.saved_ns = normals
+                normals = self.ns
             else:
                 self.create_vertex_normals(True, vs)
-                if self.vertex_per_normal:
-                    if not gl_vertex_pointer(self.vertex_per_normal):
-                        return
-                gl_normal_pointer(self.normal_per_vertex)
-                self.saved_ns = self.normal_per_vertex
                 vs = self.vertex_per_normal
+                normals = self.normal_per_vertex
+            if self.gl.buffers is None and self.use_gl_buffers and GlBuffers.available():
+                self.gl.buffers = GlBuffers()
+            if self.gl.buffers:
+                self.gl.buffers.set_arrays(vs, normals)
+            else:
+                vs, normals = self._gl_set_pointers(vs, normals)
+                if vs is None:
+                    return
             self.gl.update_vertices = False
             self.saved_vs = vs
-        else:
-            if self.gl.force_set_vs:
-                if not gl_vertex_pointer(self.saved_vs):
-                    return
-                gl_normal_pointer(self.saved_ns)
+            self.saved_ns = normals
+        elif self.gl.force_set_vs and not self.gl.buffers:
+            if not gl_vertex_pointer(self.saved_vs):
+                return
+            gl_normal_pointer(self.saved_ns)
+        if self.gl.buffers:
+            # Always needed, since other shapes might use other buffers or client side arrays
+            self.gl.buffers.bind_arrays()
         # VERTICES
         if self.gl.sphere_vertices:
             GL.glColor(
@@ -1928,8 +2653,15 @@ class SimpleShape(base.Orbitit):
                 self.gl.vertex_col[1] / 255,
                 self.gl.vertex_col[2] / 255,
             )
-            for i in self.vertex_range:
-                self.gl.sphere.draw(self.vs[i])
+            if self.gl.buffers:
+                self._gl_draw_batch(
+                    "spheres",
+                    [self.vs, self.gl.sphere],
+                    lambda: self.gl.sphere.get_batch(_vs_to_array(self.vs)),
+                )
+            else:
+                for i in self.vertex_range:
+                    self.gl.sphere.draw(self.vs[i])
         # EDGES
         if self.gl.draw_edges:
             if self.generate_normals and (
@@ -1947,67 +2679,194 @@ class SimpleShape(base.Orbitit):
             )
             if self.gl.cylindrical_edges:
                 # draw edges as cylinders
-                for i in range(0, len(self.es), 2):
-                    self.gl.cyl.draw(v0=vs[es[i]], v1=vs[es[i + 1]])
+                if self.gl.buffers:
+                    self._gl_draw_batch(
+                        "cylinders",
+                        [vs, es, self.gl.cyl],
+                        lambda: self.gl.cyl.get_batch(
+                            _vs_to_array(vs)[es[0::2]], _vs_to_array(vs)[es[1::2]]
+                        ),
+                    )
+                else:
+                    for i in range(0, len(self.es), 2):
+                        self.gl.cyl.draw(v0=vs[es[i]], v1=vs[es[i + 1]])
             else:
                 # draw edges as lines
                 GL.glPolygonOffset(1.0, 3.0)
                 GL.glDisable(GL.GL_POLYGON_OFFSET_FILL)
-                gl_draw_elements(GL.GL_LINES, es)
+                if self.gl.buffers:
+                    if self.gl.buffers.changed("edges", es, self._data_version):
+                        self.gl.buffers.set_indices("edges", es)
+                    self.gl.buffers.draw_elements(GL.GL_LINES, "edges")
+                else:
+                    gl_draw_elements(GL.GL_LINES, es)
                 GL.glEnable(GL.GL_POLYGON_OFFSET_FILL)
 
         # FACES
         if self.gl.draw_faces:
-            for col_idx in self.col_range:
-                c = [chn / 255 for chn in self._shape_colors[0][col_idx]]
-                if len(c) == 3:
-                    GL.glColor(c[0], c[1], c[2])
+            if self.gl.buffers:
+                self._gl_draw_face_buffers()
+            else:
+                self._gl_draw_face_arrays()
+
+    def _gl_draw_face_arrays(self):
+        """Draw the faces face by face using client side arrays."""
+        for col_idx in self.col_range:
+            self._gl_set_face_col(col_idx)
+            for face_idx in self.equal_colored_fs[col_idx]:
+                triangles = self.triangulated_faces_n_index[face_idx]
+                # Note triangles is a flat (ie 1D) array
+                if not self.face_needs_stencil[face_idx]:
+                    gl_draw_elements(GL.GL_TRIANGLES, triangles)
                 else:
-                    a = max(c[3], 0)
-                    a = min(a, 255)
-                    GL.glColor(c[0], c[1], c[2], a)
-                for face_idx in self.equal_colored_fs[col_idx]:
+                    self._gl_draw_stencil_face(
+                        # pylint: disable=cell-var-from-loop
+                        lambda: gl_draw_elements(GL.GL_TRIANGLES, triangles)
+                    )
+
+    def _gl_draw_batch(self, name, sources, get_batch):
+        """Draw a mesh from self.gl.batch_buffers, e.g. all vertex spheres at once.
+
+        name: the key in self.gl.batch_buffers.
+        sources: list of objects the mesh is created from. The mesh is only created again when one
+            of these is replaced or when the data version of the shape changes.
+        get_batch: function without parameters returning the vertices, normals and the flat list of
+            triangle vertex indices of the mesh.
+        """
+        if name not in self.gl.batch_buffers:
+            self.gl.batch_buffers[name] = GlBuffers()
+        buffers = self.gl.batch_buffers[name]
+        if any(
+            [buffers.changed(i, source, self._data_version) for i, source in enumerate(sources)]
+        ):
+            vs, ns, triangles = get_batch()
+            buffers.set_arrays(vs, ns)
+            buffers.set_indices("triangles", triangles)
+        buffers.bind_arrays()
+        buffers.draw_elements(GL.GL_TRIANGLES, "triangles")
+        self.gl.buffers.bind_arrays()
+
+    @staticmethod
+    def _gl_set_pointers(vs, ns):
+        """Set the vertex and normal pointers to client side arrays.
+
+        Return the vertices and normals that were used, which are converted to lists if the vertex
+        type isn't accepted. If the vertex pointer cannot be set, None, None is returned.
+        """
+        # At least on Ubuntu 8.04 conversion is not needed
+        # On windows and Ubuntu 9.10 the vs cannot be an array of vec3...
+        try:
+            if vs and not gl_vertex_pointer(vs):
+                return None, None
+        except TypeError:
+            vs = [[v[0], v[1], v[2]] for v in vs]
+            ns = [[n[0], n[1], n[2]] for n in ns]
+            logging.info("gl_draw: converting vs(ns); vec3 type not accepted")
+            if not gl_vertex_pointer(vs):
+                return None, None
+        gl_normal_pointer(ns)
+        return vs, ns
+
+    def _gl_set_face_col(self, col_idx):
+        """Set the OpenGL colour to the face colour with the specified index."""
+        c = [chn / 255 for chn in self._shape_colors[0][col_idx]]
+        if len(c) == 3:
+            GL.glColor(c[0], c[1], c[2])
+        else:
+            a = max(c[3], 0)
+            a = min(a, 255)
+            GL.glColor(c[0], c[1], c[2], a)
+
+    @staticmethod
+    def _gl_draw_stencil_face(draw_triangles):
+        """Draw a face that isn't a triangle by using the stencil buffer.
+
+        draw_triangles: function without parameters that draws the triangulated face. Parts that
+            are covered an even number of times are not drawn.
+        """
+        # TODO: This part belongs to a GLinit:
+        GL.glClearStencil(0)
+        stencil_bits = GL.glGetIntegerv(GL.GL_STENCIL_BITS)
+        assert stencil_bits > 0, "Only triangle faces are supported, since there is no stencil bit"
+        # << TODO: end part that belongs to a GLinit
+        GL.glClear(GL.GL_STENCIL_BUFFER_BIT)
+        # use stecil buffer to triangulate.
+        GL.glColorMask(GL.GL_FALSE, GL.GL_FALSE, GL.GL_FALSE, GL.GL_FALSE)
+        GL.glDepthMask(GL.GL_FALSE)
+        # Enable Stencil, always pass test
+        GL.glEnable(GL.GL_STENCIL_TEST)
+        # always pass stencil test
+        GL.glStencilFunc(GL.GL_ALWAYS, 1, 1)
+        # stencil fail: don't care, never fails
+        # z-fail: zero
+        # both pass: invert stencil values
+        GL.glStencilOp(GL.GL_KEEP, GL.GL_ZERO, GL.GL_INVERT)
+        # Create triangulated stencil:
+        draw_triangles()
+        # Reset colour mask and depth settings.
+        GL.glDepthMask(GL.GL_TRUE)
+        GL.glColorMask(GL.GL_TRUE, GL.GL_TRUE, GL.GL_TRUE, GL.GL_TRUE)
+        # Draw only where stencil equals 1 (masked to 1)
+        # GL_INVERT was used, i.e. in case of e.g. 8 bits the value is
+        # either 0 or 0xff, but only the last bit is checked.
+        GL.glStencilFunc(GL.GL_EQUAL, 1, 1)
+        # make stencil read only:
+        GL.glStencilOp(GL.GL_KEEP, GL.GL_KEEP, GL.GL_KEEP)
+        # Now, write according to stencil
+        draw_triangles()
+        # ready, disable stencil
+        GL.glDisable(GL.GL_STENCIL_TEST)
+
+    def _get_face_batches(self):
+        """Group the triangulated faces per colour to be able to draw each colour at once.
+
+        Return a list with an item for each face colour. Each item is a tuple consisting of
+            - a flat list of vertex indices: first the triangles of all the faces that can be drawn
+              directly, then the triangles of the faces that need the stencil buffer,
+            - the number of indices of the faces that can be drawn directly, and
+            - a list of tuples (offset, length), one for each face that needs the stencil buffer.
+              These faces need to be drawn separately.
+        """
+        batches = []
+        for face_indices in self.equal_colored_fs:
+            indices = [
+                i
+                for face_idx in face_indices
+                if not self.face_needs_stencil[face_idx]
+                for i in self.triangulated_faces_n_index[face_idx]
+            ]
+            no_of_triangle_indices = len(indices)
+            stencil_faces = []
+            for face_idx in face_indices:
+                if self.face_needs_stencil[face_idx]:
                     triangles = self.triangulated_faces_n_index[face_idx]
-                    # Note triangles is a flat (ie 1D) array
-                    if len(triangles) == 3:
-                        gl_draw_elements(GL.GL_TRIANGLES, triangles)
-                    else:
-                        # TODO: This part belongs to a GLinit:
-                        GL.glClearStencil(0)
-                        stencil_bits = GL.glGetIntegerv(GL.GL_STENCIL_BITS)
-                        assert (
-                            stencil_bits > 0
-                        ), "Only triangle faces are supported, since there is no stencil bit"
-                        # << TODO: end part that belongs to a GLinit
-                        GL.glClear(GL.GL_STENCIL_BUFFER_BIT)
-                        # use stecil buffer to triangulate.
-                        GL.glColorMask(
-                            GL.GL_FALSE, GL.GL_FALSE, GL.GL_FALSE, GL.GL_FALSE
-                        )
-                        GL.glDepthMask(GL.GL_FALSE)
-                        # Enable Stencil, always pass test
-                        GL.glEnable(GL.GL_STENCIL_TEST)
-                        # always pass stencil test
-                        GL.glStencilFunc(GL.GL_ALWAYS, 1, 1)
-                        # stencil fail: don't care, never fails
-                        # z-fail: zero
-                        # both pass: invert stencil values
-                        GL.glStencilOp(GL.GL_KEEP, GL.GL_ZERO, GL.GL_INVERT)
-                        # Create triangulated stencil:
-                        gl_draw_elements(GL.GL_TRIANGLES, triangles)
-                        # Reset colour mask and depth settings.
-                        GL.glDepthMask(GL.GL_TRUE)
-                        GL.glColorMask(GL.GL_TRUE, GL.GL_TRUE, GL.GL_TRUE, GL.GL_TRUE)
-                        # Draw only where stencil equals 1 (masked to 1)
-                        # GL_INVERT was used, i.e. in case of e.g. 8 bits the value is
-                        # either 0 or 0xff, but only the last bit is checked.
-                        GL.glStencilFunc(GL.GL_EQUAL, 1, 1)
-                        # make stencil read only:
-                        GL.glStencilOp(GL.GL_KEEP, GL.GL_KEEP, GL.GL_KEEP)
-                        # Now, write according to stencil
-                        gl_draw_elements(GL.GL_TRIANGLES, triangles)
-                        # ready, disable stencil
-                        GL.glDisable(GL.GL_STENCIL_TEST)
+                    stencil_faces.append((len(indices), len(triangles)))
+                    indices.extend(triangles)
+            batches.append((indices, no_of_triangle_indices, stencil_faces))
+        return batches
+
+    def _gl_draw_face_buffers(self):
+        """Draw the faces using one index buffer per colour."""
+        buffers = self.gl.buffers
+        # Note: evaluate both, so that both sources are registered
+        version = self._data_version
+        if buffers.changed("faces", self.triangulated_faces_n_index, version) | buffers.changed(
+            "face_cols", self.equal_colored_fs, version
+        ):
+            self.gl.face_batches = self._get_face_batches()
+            for col_idx, (indices, _, _) in enumerate(self.gl.face_batches):
+                buffers.set_indices(("faces", col_idx), indices)
+        for col_idx in self.col_range:
+            _, no_of_triangle_indices, stencil_faces = self.gl.face_batches[col_idx]
+            self._gl_set_face_col(col_idx)
+            buffers.draw_elements(GL.GL_TRIANGLES, ("faces", col_idx), 0, no_of_triangle_indices)
+            for offset, length in stencil_faces:
+                self._gl_draw_stencil_face(
+                    # pylint: disable=cell-var-from-loop
+                    lambda: buffers.draw_elements(
+                        GL.GL_TRIANGLES, ("faces", col_idx), offset, length
+                    )
+                )
 
     def to_off(
         self, precision=geomtypes.FLOAT_OUT_PRECISION, info=False, color_floats=False
@@ -2020,89 +2879,89 @@ class SimpleShape(base.Orbitit):
         color_floats: whether to export the colours as floating point numbers between 0 and 1. If
             False an integer 0 to 255 is used.
         """
+        fd = io.StringIO()
+        self.write_off(fd, precision, info, color_floats)
+        return fd.getvalue()
+
+    def write_off(
+        self, fd, precision=geomtypes.FLOAT_OUT_PRECISION, info=False, color_floats=False
+    ):
+        """Write the object in the 3D 'OFF' file format to the file object fd.
+
+        The vertices and faces are written in chunks, so the shape isn't converted to one string
+        first. See to_off for the other parameters.
+        """
 
         def w(s1):
-            nonlocal s
-            return f"{s}{s1}\n"
-
-        s = ""
-        s = w("OFF")
-        s = w("#")
-        s = w(f"# {self.name}")
-        s = w("#")
-        s = w("# file generated with python script by Marcel Tunnissen")
+            fd.write(f"{s1}\n")
+
+        w("OFF")
+        w("#")
+        w(f"# {self.name}")
+        w("#")
+        w("# file generated with python script by Marcel Tunnissen")
         if info:
-            self.calc_sphere_radii()
-            s = w(f"# inscribed sphere(s)    : {self.spheres_radii.inscribed}")
-            s = w(f"# mid sphere(s)          : {self.spheres_radii.mid}")
-            s = w(f"# circumscribed sphere(s): {self.spheres_radii.circumscribed}")
-            dihedral_to_angle = self._get_dihedral_angles()
-            for a, es in dihedral_to_angle.items():
-                s = w(
+            metrics = self.metrics()
+            w(f"# inscribed sphere(s)    : {metrics['inscribed']}")
+            w(f"# mid sphere(s)          : {metrics['mid']}")
+            w(f"# circumscribed sphere(s): {metrics['circumscribed']}")
+            for a, es in metrics["dihedral_angles"].items():
+                w(
                     f"# Dihedral angle: {geomtypes.f2s(a, precision)} rad "
                     f"({geomtypes.f2s(a * RAD2DEG, precision)} degrees) for {len(es)} edges"
                 )
                 if len(es) > 2:
-                    s = w(f"#                 E.g. {es[0]}, {es[1]}, {es[2]} etc")
-            len_to_edge = self.create_edge_lengths()
-            for norm, es in len_to_edge.items():
-                s = w(f"# Length: {geomtypes.f2s(norm, precision)} for {len(es)} edges")
+                    w(f"#                 E.g. {es[0]}, {es[1]}, {es[2]} etc")
+            for norm, es in metrics["edge_lengths"].items():
+                w(f"# Length: {geomtypes.f2s(norm, precision)} for {len(es)} edges")
                 if len(es) > 2:
-                    s = w(f"#         E.g. {es[0]}, {es[1]}, {es[2]}, etc")
-        s = w("# Vertices Faces Edges")
+                    w(f"#         E.g. {es[0]}, {es[1]}, {es[2]}, etc")
+        w("# Vertices Faces Edges")
         no_of_faces = len(self.fs)
         no_of_edges = len(self.es) // 2
-        s = w(f"{len(self.vs)} {no_of_faces} {no_of_edges}")
-        s = w("# Vertices")
-        for v in self.vs:
-            with geomtypes.FloatHandler(precision):
-                s = w(
-                    f"{geomtypes.RoundedFloat(v[0])} "
-                    f"{geomtypes.RoundedFloat(v[1])} "
-                    f"{geomtypes.RoundedFloat(v[2])}"
-                )
-        s = w("# Sides and colours")
+        w(f"{len(self.vs)} {no_of_faces} {no_of_edges}")
+        w("# Vertices")
+        vs = _vs_to_array(self.vs)
+        for i in range(0, len(vs), _OFF_CHUNK_SIZE):
+            fd.write(geomtypes.f2s_rows(vs[i : i + _OFF_CHUNK_SIZE], precision))
+        w("# Sides and colours")
         # self._shape_colors[1] = [] : use self._shape_colors[0][0]
         # self._shape_colors[1] = [c0, c1, .. cn] where ci is an index i
         #                     self._shape_colors[0]
         #                     There should be as many colours as faces.
+        if color_floats:
+            col_strs = [
+                f"  {c[0] / 255:g} {c[1] / 255:g} {c[2] / 255:g}" for c in self._shape_colors[0]
+            ]
+        else:
+            col_strs = [f"  {c[0]} {c[1]} {c[2]}" for c in self._shape_colors[0]]
         if len(self._shape_colors[0]) == 1:
-            one_col = True
-            color = self._shape_colors[0][0]
+            face_cols = [0] * no_of_faces
         else:
-            one_col = False
             assert len(self._shape_colors[1]) == len(self.fs)
+            face_cols = self._shape_colors[1]
+            if info:
+                self.create_face_normals(normalise=True)
 
-        def face_str(face):
-            """convert face to string in off-format."""
-            s = f"{len(face)} "
-            for fi in face:
-                s += f" {fi}"
-            if color_floats:
-                s += f"  {color[0] / 255:g} {color[1] / 255:g} {color[2] / 255:g}"
-            else:
-                s += f"  {color[0]} {color[1]} {color[2]}"
+        def face_str(i):
+            """convert face with index i to a line in off-format."""
+            face = self.fs[i]
+            s = " ".join(map(str, [len(face), ""] + face)) + col_strs[face_cols[i]]
+            if info and len(self._shape_colors[0]) != 1:
+                face_normal = self.face_normals[i]
+                s = f"{s}\n# face normal: {face_normal[0]} {face_normal[1]} {face_normal[2]}"
             return s
 
-        if one_col:
-            for face in self.fs:
-                # the lambda w didn't work: (Ubuntu 9.10, python 2.5.2)
-                s += f"{face_str(face)}\n"
-        else:
-            self.create_face_normals(normalise=True)
-            for i in range(no_of_faces):
-                face = self.fs[i]
-                color = self._shape_colors[0][self._shape_colors[1][i]]
-                s = f"{s}{face_str(face)}\n"
-                face_normal = self.face_normals[i]
-                face_idx_str = f"{face_normal[0]} {face_normal[1]} {face_normal[2]}"
-                if info:
-                    s = w(f"# face normal: {face_idx_str}")
+        for i in range(0, no_of_faces, _OFF_CHUNK_SIZE):
+            fd.write(
+                "".join(
+                    f"{face_str(j)}\n" for j in range(i, min(i + _OFF_CHUNK_SIZE, no_of_faces))
+                )
+            )
         if info:
             for i in range(no_of_edges):
-                s = w(f"# edge: {self.es[2 * i]} {self.es[2 * i + 1]}")
-        s = w("# END")
-        return s
+                w(f"# edge: {self.es[2 * i]} {self.es[2 * i + 1]}")
+        w("# END")
 
     @staticmethod
     def _get_face_plane(vs, face):
@@ -2194,7 +3053,7 @@ class SimpleShape(base.Orbitit):
             to_2d_axis = face_plane.normal.cross(z_axis)
             logging.debug("to_2d_axis: %s", to_2d_axis)
             rot_mat = geomtypes.Rot3(angle=to_2d_angle, axis=to_2d_axis)
-            vs = [rot_mat * v for v in self.vs]
+            vs = rot_mat.apply_many(self.vs)
         else:
             vs = self.vs[:]
 
@@ -2695,6 +3554,9 @@ class CompoundShape(base.Orbitit):
         self.merge_needed = False
         # This is save so heirs can still use repr_dict from this class
         self.json_class = CompoundShape
+        # Shapes that were replaced, but still need to free their OpenGL buffers
+        self._dropped_shapes = []
+        self._shapes = []
         self.set_shapes(shapes)
         self.merged_shape = None
         if regen_edges:
@@ -2704,21 +3566,49 @@ class CompoundShape(base.Orbitit):
         """
         Returns a python string that can be interpreted by Python for the shape
         """
+        fd = io.StringIO()
+        self.write_repr(indent.Writer(fd))
+        return fd.getvalue()
+
+    def write_repr(self, writer, suffix=""):
+        """Write the Python representation, as returned by __repr__, with an indent.Writer.
+
+        suffix: text to add after the closing bracket, e.g. a separator.
+        """
         if len(self._shapes) == 1:
-            return repr(self._shapes[0])
+            self._shapes[0].write_repr(writer, suffix)
+            return
+        prefix = f"{__name__}." if __name__ != "__main__" else ""
         class_name = base.find_module_class_name(self.__class__, __name__)
-        s = indent.Str(f"{class_name}(\n")
-        s = s.add_incr_line("shapes=[")
-        s.incr()
-        s = s.glue_line(
-            ",\n".join(repr(shape).reindent(s.indent) for shape in self._shapes)
-        )
-        s = s.add_decr_line("],")
-        s = s.add_line(f'name="{self.name}"')
-        s = s.add_decr_line(")")
-        if __name__ != "__main__":
-            s = s.insert(f"{__name__}.")
-        return s
+        writer.add_line(f"{prefix}{class_name}(")
+        writer.add_incr_line("shapes=[")
+        writer.incr()
+        for i, shape in enumerate(self._shapes):
+            shape.write_repr(writer, "," if i < len(self._shapes) - 1 else "")
+        writer.add_decr_line("],")
+        writer.add_line(f'name="{self.name}"')
+        writer.add_decr_line(f"){suffix}")
+
+    @property
+    def repr_data(self):
+        """Return the class and the keyword arguments that are used by __repr__.
+
+        This is what is saved by save_data_file.
+        """
+        if len(self._shapes) == 1:
+            return self._shapes[0].repr_data
+        return {
+            "class": base.class_to_json[self.json_class],
+            "kwargs": {
+                "shapes": [shape.repr_data for shape in self._shapes],
+                "name": self.name,
+            },
+        }
+
+    @classmethod
+    def from_repr_data(cls, kwargs):
+        """Create object from the keyword arguments created by repr_data."""
+        return cls(**kwargs)
 
     def __iter__(self):
         """Iterate through all shapes."""
@@ -2741,20 +3631,32 @@ class CompoundShape(base.Orbitit):
     @property
     def repr_dict(self):
         """Return a short representation of the object."""
+        return self._get_repr_dict([s.repr_dict for s in self.shapes])
+
+    @property
+    def json_parts(self):
+        """Return repr_dict with the shapes themselves, see base.Orbitit.json_parts."""
+        return self._get_repr_dict(self.shapes)
+
+    def _get_repr_dict(self, shapes):
+        """Return repr_dict using the specified representation of the shapes."""
         return {
             "class": base.class_to_json[self.json_class],
             "data": {
                 "name": self.name,
-                "shapes": [s.repr_dict for s in self.shapes],
+                "shapes": shapes,
             },
         }
 
     @classmethod
     def from_dict_data(cls, data):
         """Create object from a dictionary created by repr_dict."""
+        # When reading JSON the shapes are already created, see base.Orbitit.json_decode_early
         return cls(
             shapes=[
-                base.json_to_class[s["class"]].from_json_dict(s) for s in data["shapes"]
+                s if isinstance(s, base.Orbitit)
+                else base.json_to_class[s["class"]].from_json_dict(s)
+                for s in data["shapes"]
             ],
             name=data["name"],
         )
@@ -2799,6 +3701,9 @@ class CompoundShape(base.Orbitit):
         Note: you need to make sure yourself to have the generate_normals set
         consistently for all shapes.
         """
+        # The OpenGL buffers of the replaced shapes are freed when drawing, see gl_draw
+        kept = {id(shape) for shape in shapes}
+        self._dropped_shapes.extend(shape for shape in self._shapes if id(shape) not in kept)
         self._shapes = shapes
         self.gl_force_set_vs(True)
         self.merge_needed = True
@@ -2822,10 +3727,8 @@ class CompoundShape(base.Orbitit):
             s = s.simple_shape
             # Apply shape orientation here, needed, since the can be different
             # for the various shapes
-            for v in s.vs:
-                vs.append(s.orientation * v)
-            for v in s.ns:
-                ns.append(s.orientation * v)
+            vs.extend(s.orientation.apply_many(s.vs))
+            ns.extend(s.orientation.apply_many(s.ns))
             # offset all faces:
             fs.extend([[i + vs_offset for i in f] for f in s.fs])
             es.extend([i + vs_offset for i in s.es])
@@ -2858,9 +3761,22 @@ class CompoundShape(base.Orbitit):
 
         If you want to draw it as one, draw the SimpleShape instead
         """
+        self._gl_delete_dropped_shapes()
         for shape in self._shapes:
             shape.gl_draw()
 
+    def _gl_delete_dropped_shapes(self):
+        """Free the OpenGL buffers of the shapes that were replaced by set_shapes."""
+        for shape in self._dropped_shapes:
+            shape.gl_delete()
+        self._dropped_shapes = []
+
+    def gl_delete(self):
+        """Free the OpenGL buffer objects of all shapes, see SimpleShape.gl_delete."""
+        self._gl_delete_dropped_shapes()
+        for shape in self._shapes:
+            shape.gl_delete()
+
     def regen_edges(self):
         """Regenerate the edges of the shape."""
         for shape in self._shapes:
@@ -3079,6 +3995,17 @@ class CompoundShape(base.Orbitit):
             self.merge_shapes()
         return self.merged_shape.to_off(precision, info, color_floats)
 
+    def write_off(
+        self, fd, precision=geomtypes.FLOAT_OUT_PRECISION, info=False, color_floats=False
+    ):
+        """Write the object in the 3D 'OFF' file format to the file object fd.
+
+        See SimpleShape.write_off
+        """
+        if self.merge_needed:
+            self.merge_shapes()
+        self.merged_shape.write_off(fd, precision, info, color_floats)
+
     def to_postscript(
         self,
         face_indices=None,
@@ -3172,71 +4099,94 @@ class SymmetricShape(CompoundShape):
         self.needs_apply_isoms = True
         self.show_base_only = False
 
-    def __repr__(self):
+    def write_repr(self, writer, suffix=""):
+        """Write the Python representation, as returned by __repr__, with an indent.Writer.
+
+        suffix: text to add after the closing bracket, e.g. a separator.
+        """
+        prefix = f"{__name__}." if __name__ != "__main__" else ""
         # comment out class name, see comment at __fix_repr__ below:
-        # s = indent.Str('%s(\n' % base.find_module_class_name(self.__class__, __name__))
-        s = indent.Str("SymmetricShape(\n")
-        s = s.add_incr_line("vs=[")
-        s.incr()
+        # writer.add_line(f"{prefix}{base.find_module_class_name(self.__class__, __name__)}(")
+        writer.add_line(f"{prefix}SymmetricShape(")
+        self._write_base_shape_repr(writer)
+        if self.isometries is not None:
+            writer.add_line("isometries=[")
+            writer.incr()
+            writer.add_blocks(repr(i) for i in self.isometries)
+            writer.add_decr_line("],")
+        writer.add_line(f"name='{self.name}',")
+        writer.add_block(f"orientation={repr(self.base_shape.orientation)}")
+        writer.add_decr_line(f"){suffix}")
+
+    def _write_base_shape_repr(self, writer):
+        """Write the keyword arguments for the base shape and the colours for write_repr."""
+        writer.add_incr_line("vs=[")
+        writer.incr()
         try:
-            s = s.glue_line(
-                ",\n".join(
-                    indent.Str(repr(v)).reindent(s.indent) for v in self.base_shape.vs
-                )
-            )
+            writer.add_blocks(repr(v) for v in self.base_shape.vs)
         except AttributeError:
             logging.error("Are you sure the vertices are all of type geomtypes.Vec3?")
             raise
-        s = s.add_decr_line("],")
-        s = s.add_line("fs=[")
-        s.incr()
-        s = s.glue_line(
-            ",\n".join(
-                indent.Str(repr(f)).reindent(s.indent) for f in self.base_shape.fs
-            )
-        )
-        s = s.add_decr_line("],")
+        writer.add_decr_line("],")
+        writer.add_line("fs=[")
+        writer.incr()
+        writer.add_blocks(repr(f) for f in self.base_shape.fs)
+        writer.add_decr_line("],")
         if self.base_shape.es != []:
-            s = s.add_line(f"es={self.base_shape.es},")
+            writer.add_line(f"es={self.base_shape.es},")
         if self.base_shape.ns != []:
-            s = s.add_incr_line("ns=[")
-            s.incr()
-            try:
-                s = s.glue_line(
-                    ",\n".join(repr(n).reindent(s.indent) for n in self.base_shape.ns)
-                )
-            except AttributeError:
-                logging.error(
-                    "Are you sure the normals are all of type geomtypes.Vec3?"
-                )
-                raise
-            s = s.add_decr_line("],")
-        s = s.add_line("colors=[")
-        s.incr()
-        cols = self._shape_colors
-        s = s.glue_line(
-            ",\n".join(indent.Str(repr(c)).reindent(s.indent) for c in cols)
-        )
-        s = s.add_decr_line("],")
-        if self.isometries is not None:
-            s = s.add_line("isometries=[")
-            s.incr()
-            s = s.glue_line(
-                ",\n".join(
-                    indent.Str(repr(i)).reindent(s.indent) for i in self.isometries
-                )
-            )
-            s = s.add_decr_line("],")
-        s = s.add_line(f"name='{self.name}',")
-        s = s.glue_line(
-            indent.Str(f"orientation={repr(self.base_shape.orientation)}").reindent(
-                s.indent
-            )
-        )
-        s = s.add_decr_line(")")
-        if __name__ != "__main__":
-            s = s.insert(f"{__name__}.")
-        return s
+            writer.add_line("ns=[")
+            writer.incr()
+            writer.add_blocks(repr(n) for n in self.base_shape.ns)
+            writer.add_decr_line("],")
+        writer.add_line("colors=[")
+        writer.incr()
+        writer.add_blocks(repr(c) for c in self._shape_colors)
+        writer.add_decr_line("],")
+
+    @property
+    def repr_data(self):
+        """Return the class and the keyword arguments that are used by __repr__.
+
+        This is what is saved by save_data_file.
+        """
+        return {
+            "class": base.class_to_json[SymmetricShape],
+            "kwargs": dict(
+                self._get_base_shape_repr_data(),
+                isometries=[i.repr_dict for i in self.isometries],
+                name=self.name,
+                orientation=self.base_shape.orientation.repr_dict,
+            ),
+        }
+
+    def _get_base_shape_repr_data(self):
+        """Return the keyword arguments for the base shape and the colours for repr_data."""
+        kwargs = {
+            "vs": _vs_to_array(self.base_shape.vs),
+            "fs": self.base_shape.fs,
+            "colors": _cols_to_json(self._shape_colors),
+        }
+        if self.base_shape.es != []:
+            kwargs["es"] = self.base_shape.es
+        if self.base_shape.ns != []:
+            kwargs["ns"] = _vs_to_array(self.base_shape.ns)
+        return kwargs
+
+    @classmethod
+    def from_repr_data(cls, kwargs):
+        """Create object from the keyword arguments created by repr_data."""
+        o = kwargs["orientation"]
+        kwargs["orientation"] = base.json_to_class[o["class"]].from_json_dict(o)
+        kwargs["isometries"] = [
+            base.json_to_class[s["class"]].from_json_dict(s) for s in kwargs["isometries"]
+        ]
+        return cls(**kwargs)
+
+    @property
+    def json_parts(self):
+        """Return repr_dict, since only the base shape is saved."""
+        return self.repr_dict
 
     @property
     def repr_dict(self):
@@ -3246,7 +4196,7 @@ class SymmetricShape(CompoundShape):
             "class": base.class_to_json[self.json_class],
             "data": {
                 "name": self.name,
-                "vs": self.base_shape.vs,
+                "vs": list(self.base_shape.vs),
                 "fs": self.base_shape.fs,
                 "cols": self._shape_colors,
                 "orientation": self.base_shape.orientation.repr_dict,
@@ -3461,12 +4411,18 @@ class SymmetricShape(CompoundShape):
 
     def gl_draw(self):
         if self.show_base_only:
+            self._gl_delete_dropped_shapes()
             self.base_shape.gl_draw()
         else:
             if self.needs_apply_isoms:
                 self.apply_isoms()
             CompoundShape.gl_draw(self)
 
+    def gl_delete(self):
+        """Free the OpenGL buffer objects of all shapes, see SimpleShape.gl_delete."""
+        super().gl_delete()
+        self.base_shape.gl_delete()
+
     def to_postscript(
         self,
         face_indices=None,
@@ -3597,14 +4553,14 @@ class OrbitShape(SymmetricShape):
         colors: the colours per isometry. (use [] for none)
         """
         try:
-            fs_quotient_set = final_sym / stab_sym
+            fs_cosets = final_sym.coset_decomposition(stab_sym)
         except isometry.ImproperSubgroupError:
             logging.error("Stabiliser not a subgroup of final symmetry")
             raise
         len_f = len(final_sym)
         len_s = len(stab_sym)
         assert len_f % len_s == 0, f"Expected divisable group length {len_f} / {len_s}"
-        fs_orbit = [coset.get_one() for coset in fs_quotient_set]
+        fs_orbit = fs_cosets.transversal
         if not quiet:
             logging.info("Applying an orbit of order %d", len(fs_orbit))
         super().__init__(
@@ -3628,7 +4584,7 @@ class OrbitShape(SymmetricShape):
             "class": base.class_to_json[self.json_class],
             "data": {
                 "name": self.name,
-                "vs": self.base_shape.vs,
+                "vs": list(self.base_shape.vs),
                 "fs": self.base_shape.fs,
                 "final_sym": self.final_sym.repr_dict,
                 "stab_sym": self.stab_sym.repr_dict,
@@ -3652,68 +4608,52 @@ class OrbitShape(SymmetricShape):
         )
         return result
 
-    def __repr__(self):
+    def write_repr(self, writer, suffix=""):
+        """Write the Python representation, as returned by __repr__, with an indent.Writer.
+
+        suffix: text to add after the closing bracket, e.g. a separator.
+        """
         # This repr should be fixed, since you cannot be sure in which order the
         # isometry operation will be printed (there is no ordering in a Set.
         # This requires a more user friendly class interface for the user:
         # provide an array of colours and a symmetry (and index) on which the
         # colouring is based. For now fall back on the parental repr.
-        s = indent.Str(f"{base.find_module_class_name(self.__class__, __name__)}(\n")
-        s = s.add_incr_line("vs=[")
-        s.incr()
-        try:
-            s = s.glue_line(
-                ",\n".join(
-                    indent.Str(repr(v)).reindent(s.indent) for v in self.base_shape.vs
-                )
-            )
-        except AttributeError:
-            logging.error("Are you sure the vertices are all of type geomtypes.Vec3?")
-            raise
-        s = s.add_decr_line("],")
-        s = s.add_line("fs=[")
-        s.incr()
-        s = s.glue_line(
-            ",\n".join(
-                indent.Str(repr(f)).reindent(s.indent) for f in self.base_shape.fs
-            )
-        )
-        s = s.add_decr_line("],")
-        if self.base_shape.es != []:
-            s = s.add_line(f"es={self.base_shape.es},")
-        if self.base_shape.ns != []:
-            s = s.add_incr_line("ns=[")
-            s.incr()
-            try:
-                s = s.glue_line(
-                    ",\n".join(repr(n).reindent(s.indent) for n in self.base_shape.ns)
-                )
-            except AttributeError:
-                logging.error(
-                    "Are you sure the normals are all of type geomtypes.Vec3?"
-                )
-                raise
-            s = s.add_decr_line("],")
-        s = s.add_line("colors=[")
-        s.incr()
-        cols = self._shape_colors
-        s = s.glue_line(
-            ",\n".join(indent.Str(repr(c)).reindent(s.indent) for c in cols)
-        )
-        s = s.add_decr_line("],")
-        s = s.add_line("final_sym=")
-        s.incr()
-        s = s.glue_line((repr(self.final_sym) + ",").reindent(s.indent))
-        s.decr()
-        s = s.add_line("stab_sym=")
-        s.incr()
-        s = s.glue_line((repr(self.stab_sym) + ",").reindent(s.indent))
-        s.decr()
-        s = s.add_line(f"name='{self.name}',")
-        s = s.add_decr_line(")")
-        if __name__ != "__main__":
-            s = s.insert(f"{__name__}.")
-        return s
+        prefix = f"{__name__}." if __name__ != "__main__" else ""
+        writer.add_line(f"{prefix}{base.find_module_class_name(self.__class__, __name__)}(")
+        self._write_base_shape_repr(writer)
+        writer.add_line("final_sym=")
+        writer.incr()
+        writer.add_block(repr(self.final_sym) + ",")
+        writer.decr()
+        writer.add_line("stab_sym=")
+        writer.incr()
+        writer.add_block(repr(self.stab_sym) + ",")
+        writer.decr()
+        writer.add_line(f"name='{self.name}',")
+        writer.add_decr_line(f"){suffix}")
+
+    @property
+    def repr_data(self):
+        """Return the class and the keyword arguments that are used by __repr__.
+
+        This is what is saved by save_data_file.
+        """
+        return {
+            "class": base.class_to_json[self.json_class],
+            "kwargs": dict(
+                self._get_base_shape_repr_data(),
+                final_sym=self.final_sym.repr_dict,
+                stab_sym=self.stab_sym.repr_dict,
+                name=self.name,
+            ),
+        }
+
+    @classmethod
+    def from_repr_data(cls, kwargs):
+        """Create object from the keyword arguments created by repr_data."""
+        kwargs["final_sym"] = isometry.Set.from_json_dict(kwargs["final_sym"])
+        kwargs["stab_sym"] = isometry.Set.from_json_dict(kwargs["stab_sym"])
+        return cls(**kwargs)
 
     def set_cols(self, colours, stab_sym):
         """
@@ -33,6 +33,8 @@ import logging
 import math
 from typing import overload
 
+import numpy as np
+
 from orbitit import base, indent
 from orbitit.base import Singleton  # to prevent pylint (2.4.4): Undefined variable 'base.Singleton'
 
@@ -83,6 +85,40 @@ def f2s(f, precision=None):
     return '0'
 
 
+def f2s_rows(array, precision=None):
+    """Return the rows of a 2 dimensional numpy array as lines with the numbers separated by spaces.
+
+    The floats are written like f2s does, i.e. with the specified maximum amount of decimals, but
+    without trailing zeros.
+    """
+    if not precision:
+        precision = DEFAULT_FLOAT_OUT_PRECISION
+    if array.size == 0:
+        return ""
+    line = " ".join([f"%.{precision}f"] * array.shape[1]) + "\n"
+    chars = np.frombuffer(
+        ((line * len(array)) % tuple(array.ravel().tolist())).encode(), dtype=np.uint8
+    )
+    n = len(chars)
+    is_space = np.isin(chars, np.frombuffer(b" \n", dtype=np.uint8))
+    is_zero = chars == ord("0")
+    # For each character the index of the first character from there on that isn't a zero
+    next_non_zero = np.minimum.accumulate(np.where(is_zero, n, np.arange(n))[::-1])[::-1]
+    # Whether there are only zeros from there on till the end of the number
+    zeros_till_end = np.append(is_space, True)[np.append(next_non_zero, n)]
+    # Remove the trailing zeros and the decimal point if no decimals are left
+    remove_point = (chars == ord(".")) & zeros_till_end[1:]
+    remove = is_zero & zeros_till_end[:-1] | remove_point
+    # and write -0 as 0
+    remove[:-2] |= (
+        (chars[:-2] == ord("-"))
+        & np.append(True, is_space[:-3])
+        & is_zero[1:-1]
+        & remove_point[2:]
+    )
+    return chars[~remove].tobytes().decode()
+
+
 # TODO: move this to own module?
 
 class StdFloatHandler(metaclass=Singleton):
@@ -297,6 +333,10 @@ class RoundedFloat(float):
 # To save the floats in JSON as I want (ref https://stackoverflow.com/questions/54370322)
 json.encoder.c_make_encoder = None
 json.encoder.float = RoundedFloat
+# and the same for numpy arrays with floats that are written by base.JsonWriter
+base.JsonWriter.format_float_rows = staticmethod(
+    lambda array: f2s_rows(array, FloatHandler.precision)
+)
 
 def _get_mat_rot(w, x, y, z, sign=1):
     """Return matrix for a quarternion that is supposed to represent a rotation
@@ -312,6 +352,83 @@ def _get_mat_rot(w, x, y, z, sign=1):
         Vec([sign*(dxz-dyw), sign*(dyz+dxw), sign*(1-dx2-dy2)])])
 
 
+def _to_array(vs):
+    """Return the vertices vs, a list, a VertexArray or a numpy array, as a numpy array"""
+    if isinstance(vs, np.ndarray):
+        return vs
+    if isinstance(vs, VertexArray):
+        return vs.array
+    return np.array(vs, dtype=float)
+
+
+def _from_array(result, vs, vec_class):
+    """Return the numpy array result in the same type as the vertices vs
+
+    vs: a list of vertices, a VertexArray or a numpy array.
+    vec_class: the class of the vertices that are returned if vs is a list.
+    """
+    if isinstance(vs, np.ndarray):
+        return result
+    if isinstance(vs, VertexArray):
+        return VertexArray(result)
+    return [vec_class(v) for v in result.tolist()]
+
+
+def _quat_mul_many(v, w):
+    """Multiply quaternions where each component can be a float or a numpy array.
+
+    The calculation is done in the same way as Quat.__mul__ so that the results are exactly the
+    same.
+    """
+    return (
+        v[0]*w[0] - v[1]*w[1] - v[2] * w[2] - v[3] * w[3],
+        v[0]*w[1] + v[1]*w[0] + v[2] * w[3] - v[3] * w[2],
+        v[0]*w[2] - v[1]*w[3] + v[2] * w[0] + v[3] * w[1],
+        v[0]*w[3] + v[1]*w[2] - v[2] * w[1] + v[3] * w[0],
+    )
+
+
+def _apply_matrix(m, vs, vec_class):
+    """Multiply all vertices with a matrix in one go.
+
+    The calculation is done in the same way as Mat.__mul__ for one vertex, so that the results are
+    exactly the same.
+
+    m: a Mat object. If it has one row more than the dimension of the vertices, then it is used as
+        a homogeneous matrix.
+    vs: a numpy array with one vertex per row, a VertexArray or a list of vertices.
+    vec_class: the class of the vertices that are returned if vs is a list.
+
+    Return the result in the same type as vs.
+    """
+    if len(vs) == 0:
+        return vs.copy()
+    arr = _to_array(vs)
+    cols = list(arr.T)
+    is_homogeneous = m.rows == len(cols) + 1
+    if is_homogeneous:
+        cols.append(1.0)
+    assert m.cols == len(cols), f"Cannot multiply {m.rows}x{m.cols} matrix with {len(cols)}D"
+    rows = []
+    for row in m:
+        r = 0
+        for a, b in zip(row, cols):
+            r += a*b
+        rows.append(r)
+    if is_homogeneous:
+        # see Vec.cartesian
+        w = np.broadcast_to(rows.pop(), arr.shape[:1])
+        divide = (
+            (np.abs(w - 1) >= FloatHandler.margin) & (np.abs(w) >= FloatHandler.margin)
+        )
+        if divide.any():
+            rows = [np.where(divide, r / np.where(divide, w, 1), r) for r in rows]
+    result = np.empty((len(arr), len(rows)))
+    for i, r in enumerate(rows):
+        result[:, i] = r
+    return _from_array(result, vs, vec_class)
+
+
 class NoRotation(Exception):
     """The transform doesn't represent a rotation"""
 
@@ -327,6 +444,8 @@ class UnsupportedOperand(Exception):
 # Use tuples instead of lists to enable building sets used for isometries
 class Vec(tuple, base.Orbitit):
     """Define a Euclidean vector"""
+    # No attribute dict: vectors are created in big numbers
+    __slots__ = ()
     is_homogeneous = False
 
     def __new__(cls, v):
@@ -457,9 +576,7 @@ class Vec(tuple, base.Orbitit):
     @property
     def homogeneous(self):
         """Return the homogeneous coordinate."""
-        result = self.insert(1, i=len(self))
-        result.is_homogeneous = True
-        return result
+        return HomogeneousVec(self.insert(1, i=len(self)))
 
     @property
     def cartesian(self):
@@ -473,8 +590,16 @@ class Vec(tuple, base.Orbitit):
     # TODO cross product from GA?
 
 
+class HomogeneousVec(Vec):
+    """Define a vector with homogeneous coordinates"""
+    __slots__ = ()
+    is_homogeneous = True
+
+
 class Vec3(Vec):
     """Define a Euclidean vector in 3D"""
+    __slots__ = ()
+
     def __new__(cls, v):
         return super().__new__(cls, [float(v[i]) for i in range(3)])
 
@@ -527,8 +652,112 @@ UY = Vec3([0, 1, 0])
 UZ = Vec3([0, 0, 1])
 
 
+class VertexArray:
+    """Define a list of 3D vertices that are saved in one numpy array
+
+    The vertices are saved in a contiguous float64 array with shape (N, 3), see the attribute
+    array. This can be used directly to transform all vertices in one go or to pass them to OpenGL.
+    For compatibility with a list of Vec3 objects each vertex can be indexed (and iterated) as a
+    Vec3 object. These are created the first time they are needed.
+    """
+    __slots__ = ("_array", "_vecs")
+
+    def __init__(self, vs=()):
+        """
+        vs: a list of vertices, a numpy array with one vertex per row or a VertexArray. Only the
+            first 3 coordinates of each vertex are used.
+        """
+        if isinstance(vs, VertexArray):
+            self._array = vs.array
+            self._vecs = vs._vecs
+            return
+        if len(vs) == 0:
+            arr = np.empty((0, 3))
+        else:
+            arr = np.array(vs, dtype=float)[:, :3]
+        self._array = np.ascontiguousarray(arr)
+        # The vertices can only be changed by methods of this class to keep the Vec3 objects valid
+        self._array.flags.writeable = False
+        self._vecs = None
+
+    @classmethod
+    def from_array(cls, array):
+        """Create a vertex array that uses the numpy array without copying it.
+
+        array: a contiguous float64 numpy array with shape (N, 3), e.g. a view on a memory mapped
+            file. The caller shouldn't change it afterwards.
+        """
+        result = cls.__new__(cls)
+        result._array = array.view()
+        result._array.flags.writeable = False
+        result._vecs = None
+        return result
+
+    def __repr__(self):
+        s = f"{self.__class__.__name__}({[list(v) for v in self]})"
+        if __name__ != '__main__':
+            s = f"{__name__}.{s}"
+        return s
+
+    @property
+    def array(self):
+        """Return a read-only numpy array with shape (N, 3) with the coordinates"""
+        return self._array
+
+    @property
+    def vecs(self):
+        """Return the list of Vec3 objects for all vertices."""
+        if self._vecs is None:
+            self._vecs = [Vec3(v) for v in self._array.tolist()]
+        return self._vecs
+
+    def __len__(self):
+        return len(self._array)
+
+    def __iter__(self):
+        return iter(self.vecs)
+
+    def __getitem__(self, i):
+        """Return the Vec3 with index i, or a list of Vec3 objects for a slice."""
+        return self.vecs[i]
+
+    def __eq__(self, w):
+        try:
+            if len(self) != len(w):
+                return False
+        except TypeError:
+            return False
+        return all(v == u for v, u in zip(self, w))
+
+    def __ne__(self, w):
+        return not self == w
+
+    __hash__ = None
+
+    def copy(self):
+        """Return a copy of the vertex array."""
+        return self.__class__(self)
+
+    def append(self, v):
+        """Add one vertex at the end."""
+        self.extend([v])
+
+    def extend(self, vs):
+        """Add a list of vertices at the end."""
+        vecs = self._vecs
+        added = self.__class__(vs)
+        self._array = np.concatenate([self._array, added.array])
+        self._array.flags.writeable = False
+        if vecs is not None:
+            self._vecs = vecs + added.vecs
+        else:
+            self._vecs = None
+
+
 class Vec4(Vec):
     """Define a Euclidean vector in 4D"""
+    __slots__ = ()
+
     def __new__(cls, v):
         """Create a new object."""
         return super().__new__(cls, [float(v[i]) for i in range(4)])
@@ -634,15 +863,14 @@ def unit_vec4(i):
 
 class Quat(Vec):
     """Define a quarternion"""
+    __slots__ = ()
+
     def __new__(cls, v=None):
         # if 3D vector, use it to set vector part only and use 0 for scalar
         if len(v) == 3:
             v = [0, v[0], v[1], v[2]]
         return super().__new__(cls, [float(v[i]) for i in range(4)])
 
-    def __init__(self, *args, **kwargs):  # pylint: disable=super-init-not-called,unused-argument
-        self._cache = {}
-
     @classmethod
     def from_dict_data(cls, data):
         """Create object from dictionary data."""
@@ -677,9 +905,7 @@ class Quat(Vec):
 
     def vector(self):
         """Return the vector part of self (as a Vec3)"""
-        if 'vector_part' not in self._cache:
-            self._cache['vector_part'] = Vec3(self[1:])
-        return self._cache['vector_part']
+        return Vec3(self[1:])
 
     inner = dot
     S = scalar
@@ -711,8 +937,47 @@ def _is_quat_pair(q):
     )
 
 
+def _eq_unit_norm(q):
+    """Check whether q has norm 1 using a very wide margin.
+
+    The margin is the one that is used for the precision 1 - d * d, with d = 1 - margin. With this
+    the kind of a transform doesn't depend on the precision that is used when it is created.
+    """
+    d = 1 - FloatHandler.margin
+    return abs(q.squared_norm() - 1) < 10**-(1 - d * d)
+
+
+def _is_rot_pair(q0, q1):
+    """Check whether the quaternions q0 * .. * q1 represent a rotation"""
+    s = q1[0]
+    return (
+        FloatHandler.eq(q0[0], s)
+        and FloatHandler.eq(q0[1], -q1[1])
+        and FloatHandler.eq(q0[2], -q1[2])
+        and FloatHandler.eq(q0[3], -q1[3])
+        and _eq_unit_norm(q1)
+        and (s < 1 or FloatHandler.eq(s, 1))
+        and (s > -1 or FloatHandler.eq(s, -1))
+    )
+
+
+def _is_refl_pair(q0, q1):
+    """Check whether the quaternions q0 * .. * q1 represent a reflection"""
+    return q1 == q0 and _eq_unit_norm(q1) and FloatHandler.eq(q1[0], 0)
+
+
+# Sign of the canonical quaternion pair of a Transform3 is chosen on the first coordinate that is
+# bigger than this. Since the quaternions are unit quaternions there is always one.
+_CANONICAL_SIGN_LIMIT = 0.25
+
+
 class Transform3(tuple, base.Orbitit):
-    """Define a 3D tranformation using quarternions"""
+    """Define a 3D tranformation using quarternions
+
+    The quaternion pairs q0 * .. * q1 and -q0 * .. * -q1 represent the same transform. When a
+    transform is created the kind of transform is determined and a canonical pair is chosen, which
+    is used for comparing and hashing.
+    """
     debug = False
 
     def __new__(cls, quat_pair):
@@ -724,10 +989,44 @@ class Transform3(tuple, base.Orbitit):
         assert len(quat_pair) == 2, assert_str + str(quat_pair)
         assert isinstance(quat_pair[0], Quat), assert_str + str(quat_pair)
         assert isinstance(quat_pair[1], Quat), assert_str + str(quat_pair)
-        return super().__new__(cls, quat_pair)
+        result = super().__new__(cls, quat_pair)
+        # A tuple cannot have slots, but setting all attributes in the same order makes all
+        # transforms share the keys of their attribute dict. The None values are calculated when
+        # needed.
+        result._type = None
+        result._canonical = None
+        result._key = None
+        result._hash = None
+        result._angle = None
+        result._axis = None
+        result._normal = None
+        result._matrix = None
+        result._inverse = None
+        result._inverted = None
+        result._set_canonical()
+        return result
 
-    def __init__(self, *args, **kwargs):  # pylint: disable=super-init-not-called,unused-argument
-        self._cache = {}
+    def _set_canonical(self):
+        """Set the kind of transform, the canonical quaternion pair and the key for comparing."""
+        q0, q1 = self
+        if _is_rot_pair(q0, q1):
+            self._type = self.Rot
+        elif _is_refl_pair(q0, q1):
+            self._type = self.Refl
+        elif _is_rot_pair(-q0, q1):
+            self._type = self.RotInv
+        else:
+            self._type = None
+        coords = (*q0, *q1)
+        for c in coords:
+            if c > _CANONICAL_SIGN_LIMIT:
+                break
+            if c < -_CANONICAL_SIGN_LIMIT:
+                coords = tuple(-c for c in coords)
+                break
+        self._canonical = coords
+        # Key for a quick compare, adding 0.0 replaces -0.0 by 0.0
+        self._key = (self._type, tuple(round(c, FLOAT_PRECISION) + 0.0 for c in coords))
 
     def __repr__(self):
         s = indent.Str(f"{_transform3_type_str(self.type())}((\n")
@@ -753,16 +1052,18 @@ class Transform3(tuple, base.Orbitit):
         return cls([Quat.from_json_dict(q) for q in data])
 
     def __hash__(self):
-        if 'hash_nr' not in self._cache:
-            if self.is_rot():
-                self._cache['hash_nr'] = self.__hash_rot()
-            elif self.is_refl():
-                self._cache['hash_nr'] = self.__hash_refl()
-            elif self.is_rot_inv():
-                self._cache['hash_nr'] = self.__hash_rot_inv()
+        # Note that the hash isn't based on the canonical pair, so that the order of the
+        # transforms in a set doesn't change, e.g. when saving files.
+        if self._hash is None:
+            if self._type == self.Rot:
+                self._hash = self.__hash_rot()
+            elif self._type == self.Refl:
+                self._hash = self.__hash_refl()
+            elif self._type == self.RotInv:
+                self._hash = self.__hash_rot_inv()
             else:
                 raise UnsupportedTransform("Not a (supported) transform")
-        return self._cache['hash_nr']
+        return self._hash
 
     def __str__(self):
         if self.is_rot():
@@ -790,13 +1091,19 @@ class Transform3(tuple, base.Orbitit):
     def __eq__(self, u):
         if not isinstance(u, Transform3):
             return False
-        if self.is_rot() and u.is_rot():
-            is_eq = self.__eq_rot(u)
-        elif self.is_refl() and u.is_refl():
-            is_eq = self.__eq_refl(u)
-        elif self.is_rot_inv() and u.is_rot_inv():
-            is_eq = self._eq_rot_inv(u)
-        else:
+        if self._type is not None and self._type == u._type:
+            # The key is rounded with FLOAT_PRECISION, it can't be used with a higher precision
+            if self._key == u._key and FloatHandler.precision <= FLOAT_PRECISION:
+                return True
+            # The canonical pairs might differ in sign, or be rounded differently
+            for sign in (1, -1):
+                for a, b in zip(self._canonical, u._canonical):
+                    if abs(a - sign * b) >= FloatHandler.margin:
+                        break
+                else:
+                    return True
+            return False
+        if self._type is None or u._type is None:
             is_eq = self[0] == u[0] and self[1] == u[1]
             if is_eq:
                 logging.info(
@@ -809,13 +1116,7 @@ class Transform3(tuple, base.Orbitit):
             assert not is_eq, \
                 f"oops, fallback: unknown transform \n{self}\nor\n{u}"
             return is_eq
-        if (is_eq and (self.__hash__() != u.__hash__())):
-            logging.info(
-                "Note: transforms considered equal, but hashes will not be for\n%s and\n%s",
-                self,
-                u,
-            )
-        return is_eq
+        return False
 
     def __ne__(self, u):
         return not self == u
@@ -834,12 +1135,8 @@ class Transform3(tuple, base.Orbitit):
             self.RotInv: for a rotary inversion (which is the same as a rotary
                          reflection.
         """
-        if self.is_rot():
-            return self.Rot
-        if self.is_refl():
-            return self.Refl
-        if self.is_rot_inv():
-            return self.RotInv
+        if self._type is not None:
+            return self._type
         raise UnsupportedTransform(f"Not a (supported) transform: {self[1].norm()} != 1?")
 
     # TODO make this a property e.a.
@@ -902,6 +1199,22 @@ class Transform3(tuple, base.Orbitit):
 
         return result.homogeneous
 
+    def apply_many(self, vs):
+        """Transform a list of 3D vertices in one go.
+
+        This gives the same result as multiplying each vertex with this transform.
+
+        vs: a list of Vec3 objects, a VertexArray or a numpy array with shape (N, 3)
+
+        Return the transformed vertices in the same type as vs.
+        """
+        if len(vs) == 0:
+            return vs.copy()
+        arr = _to_array(vs)
+        q = _quat_mul_many(self[0], (0.0, arr[:, 0], arr[:, 1], arr[:, 2]))
+        q = _quat_mul_many(q, self[1])
+        return _from_array(np.stack(q[1:], axis=1), vs, Vec3)
+
     def inverse(self):
         """Return a new object with the inverse of this transform"""
         if self.is_rot():
@@ -927,31 +1240,7 @@ class Transform3(tuple, base.Orbitit):
     # *** ROTATION specific functions:
     def is_rot(self):
         """Return whether this tranform is a rotation."""
-        d = 1 - FloatHandler.margin
-        with FloatHandler(1 - d * d) as fh:
-            eq_square_norm = fh.eq(self[1].squared_norm(), 1)
-        return (
-            self[1].conjugate() == self[0]
-            and
-            eq_square_norm
-            and
-            (self[1].S() < 1 or FloatHandler.eq(self[1].S(), 1))
-            and
-            (self[1].S() > -1 or FloatHandler.eq(self[1].S(), -1))
-        )
-
-    def __eq_rot(self, u):
-        """Compare two transforms that represent rotations
-        """
-        return (
-            (self[0] == u[0] and self[1] == u[1])
-            or
-            # negative axis with negative angle:
-            (self[0] == -u[0] and self[1] == -u[1])
-            or
-            # half turn (equal angle) around opposite axes
-            (FloatHandler.eq(self[0][0], 0) and self[0] == u[1])
-        )
+        return self._type == self.Rot
 
     def __hash_rot(self):
         axis = self.__axis_rot()
@@ -972,24 +1261,24 @@ class Transform3(tuple, base.Orbitit):
         )
 
     def __angle_rot(self):
-        if 'angleRot' not in self._cache:
+        if self._angle is None:
             self._define_unique_angle_axis()
-        return self._cache['angleRot']
+        return self._angle
 
     def __axis_rot(self):
-        if 'axisRot' not in self._cache:
+        if self._axis is None:
             self._define_unique_angle_axis()
-        return self._cache['axisRot']
+        return self._axis
 
     def _define_unique_angle_axis(self):
         # rotation axis
         try:
-            self._cache['axisRot'] = self[0].V().normalise()
+            self._axis = self[0].V().normalise()
         except ZeroDivisionError:
             assert self[0] == Quat([1, 0, 0, 0]) or \
                 self[0] == Quat([-1, 0, 0, 0]), \
                 f"{repr(self)} doesn't represent a rotation"
-            self._cache['axisRot'] = self[0].V()
+            self._axis = self[0].V()
         # rotation angle
         cos = self[0][0]
         for i in range(3):
@@ -1002,76 +1291,66 @@ class Transform3(tuple, base.Orbitit):
                         self[0] == Quat([-1, 0, 0, 0]), \
                         f"{repr(self)} doesn't represent a rotation"
                     sin = 0
-        self._cache['angleRot'] = 2 * math.atan2(sin, cos)
+        self._angle = 2 * math.atan2(sin, cos)
 
         # make unique: -pi < angle < pi
-        if not (self._cache['angleRot'] < math.pi
-                or FloatHandler.eq(self._cache['angleRot'], math.pi)):
-            self._cache['angleRot'] = self._cache['angleRot'] - \
+        if not (self._angle < math.pi
+                or FloatHandler.eq(self._angle, math.pi)):
+            self._angle = self._angle - \
                 2 * math.pi
-        if not (self._cache['angleRot'] > -math.pi
-                or FloatHandler.eq(self._cache['angleRot'], -math.pi)):
-            self._cache['angleRot'] = self._cache['angleRot'] + \
+        if not (self._angle > -math.pi
+                or FloatHandler.eq(self._angle, -math.pi)):
+            self._angle = self._angle + \
                 2 * math.pi
 
         # make unique: 0 < angle < pi
-        if FloatHandler.eq(self._cache['angleRot'], 0):
-            self._cache['angleRot'] = 0.0
-        if self._cache['angleRot'] < 0:
-            self._cache['angleRot'] = -self._cache['angleRot']
-            self._cache['axisRot'] = -self._cache['axisRot']
-        if FloatHandler.eq(self._cache['angleRot'], math.pi):
+        if FloatHandler.eq(self._angle, 0):
+            self._angle = 0.0
+        if self._angle < 0:
+            self._angle = -self._angle
+            self._axis = -self._axis
+        if FloatHandler.eq(self._angle, math.pi):
             # if halfturn, make axis unique: make the first non-zero element
             # positive:
-            if FloatHandler.eq(self._cache['axisRot'][0], 0):
-                self._cache['axisRot'] = Vec3(
+            if FloatHandler.eq(self._axis[0], 0):
+                self._axis = Vec3(
                     [0.0,
-                     self._cache['axisRot'][1],
-                     self._cache['axisRot'][2]])
-            if self._cache['axisRot'][0] < 0:
-                self._cache['axisRot'] = -self._cache['axisRot']
-            elif self._cache['axisRot'][0] == 0:
-                if FloatHandler.eq(self._cache['axisRot'][1], 0):
-                    self._cache['axisRot'] = Vec3(
-                        [0.0, 0.0, self._cache['axisRot'][2]])
-                if self._cache['axisRot'][1] < 0:
-                    self._cache['axisRot'] = -self._cache['axisRot']
-                elif self._cache['axisRot'][1] == 0:
-                    # not valid axis: if FloatHandler.eq(self._cache['axisRot'][2], 0):
-                    if self._cache['axisRot'][2] < 0:
-                        self._cache['axisRot'] = -self._cache['axisRot']
-        elif FloatHandler.eq(self._cache['angleRot'], 0):
-            self._cache['angleRot'] = 0.0
-            self._cache['axisRot'] = Vec3([1.0, 0.0, 0.0])
+                     self._axis[1],
+                     self._axis[2]])
+            if self._axis[0] < 0:
+                self._axis = -self._axis
+            elif self._axis[0] == 0:
+                if FloatHandler.eq(self._axis[1], 0):
+                    self._axis = Vec3(
+                        [0.0, 0.0, self._axis[2]])
+                if self._axis[1] < 0:
+                    self._axis = -self._axis
+                elif self._axis[1] == 0:
+                    # not valid axis: if FloatHandler.eq(self._axis[2], 0):
+                    if self._axis[2] < 0:
+                        self._axis = -self._axis
+        elif FloatHandler.eq(self._angle, 0):
+            self._angle = 0.0
+            self._axis = Vec3([1.0, 0.0, 0.0])
 
     def __matrix_rot(self):
-        if 'matrix_rot' not in self._cache:
+        if self._matrix is None:
             w, x, y, z = self[0]
-            self._cache['matrix_rot'] = _get_mat_rot(w, x, y, z)
-        return self._cache['matrix_rot']
+            self._matrix = _get_mat_rot(w, x, y, z)
+        return self._matrix
 
     def __inverse_rot(self):
-        if 'inverse_rot' not in self._cache:
-            self._cache['inverse_rot'] = Rot3(axis=self.axis(),
-                                              angle=-self.angle())
-        return self._cache['inverse_rot']
+        if self._inverse is None:
+            self._inverse = Rot3(
+                axis=self.axis(),
+                angle=-self.angle(),
+            )
+        return self._inverse
 
     # *** REFLECTION specific functions:
     def is_refl(self):
         """Return whether this tranform is a reflection."""
-        return (
-            self[1] == self[0]
-            and
-            FloatHandler.eq(self[1].squared_norm(), 1)
-            and
-            FloatHandler.eq(self[1].S(), 0)
-        )
-
-    def __eq_refl(self, u):
-        """Compare two transforms that represent reflections"""
-        # not needed: and self[1] == u[1]
-        # since __eq_refl is called for self and u reflections
-        return (self[0] == u[0]) or (self[0] == -u[0])
+        return self._type == self.Refl
 
     def __hash_refl(self):
         normal = self.plane_normal()
@@ -1099,43 +1378,40 @@ class Transform3(tuple, base.Orbitit):
 
         Should only be called when this is a reflection.
         """
-        if 'plane_normal' not in self._cache:
-            self._cache['plane_normal'] = self[0].V()
+        if self._normal is None:
+            self._normal = self[0].V()
             # make normal unique: make the first non-zero element positive:
-            if FloatHandler.eq(self._cache['plane_normal'][0], 0):
-                self._cache['plane_normal'] = Vec3(
+            if FloatHandler.eq(self._normal[0], 0):
+                self._normal = Vec3(
                     [0.0,
-                     self._cache['plane_normal'][1],
-                     self._cache['plane_normal'][2]])
-            if self._cache['plane_normal'][0] < 0:
-                self._cache['plane_normal'] = -self._cache[
-                    'plane_normal']
-            elif self._cache['plane_normal'][0] == 0:
-                if FloatHandler.eq(self._cache['plane_normal'][1], 0):
-                    self._cache['plane_normal'] = Vec3(
-                        [0.0, 0.0, self._cache['plane_normal'][2]])
-                if self._cache['plane_normal'][1] < 0:
-                    self._cache['plane_normal'] = -self._cache[
-                        'plane_normal']
-                elif self._cache['plane_normal'][1] == 0:
+                     self._normal[1],
+                     self._normal[2]])
+            if self._normal[0] < 0:
+                self._normal = -self._normal
+            elif self._normal[0] == 0:
+                if FloatHandler.eq(self._normal[1], 0):
+                    self._normal = Vec3(
+                        [0.0, 0.0, self._normal[2]])
+                if self._normal[1] < 0:
+                    self._normal = -self._normal
+                elif self._normal[1] == 0:
                     # not needed (since not valid axis):
-                    # if FloatHandler.eq(self._cache['plane_normal'][2], 0):
-                    if self._cache['plane_normal'][2] < 0:
-                        self._cache['plane_normal'] = -self._cache[
-                            'plane_normal']
-        return self._cache['plane_normal']
+                    # if FloatHandler.eq(self._normal[2], 0):
+                    if self._normal[2] < 0:
+                        self._normal = -self._normal
+        return self._normal
 
     def __matrix_refl(self):
-        if 'matrix_refl' not in self._cache:
+        if self._matrix is None:
             _, x, y, z = self[0]
             dxy, dxz, dyz = 2*x*y, 2*x*z, 2*y*z
             dx2, dy2, dz2 = 2*x*x, 2*y*y, 2*z*z
-            self._cache['matrix_refl'] = Mat([
+            self._matrix = Mat([
                 Vec([1-dx2, -dxy, -dxz]),
                 Vec([-dxy, 1-dy2, -dyz]),
                 Vec([-dxz, -dyz, 1-dz2]),
             ])
-        return self._cache['matrix_refl']
+        return self._matrix
 
     def __inverse_refl(self):
         return self
@@ -1143,17 +1419,14 @@ class Transform3(tuple, base.Orbitit):
     # *** ROTARY INVERSION (= ROTARY RELECTION) specific functions:
     def I(self):
         """Apply a central inversion on this transform."""
-        if 'central_inverted' not in self._cache:
-            self._cache['central_inverted'] = Transform3(
+        if self._inverted is None:
+            self._inverted = Transform3(
                 [-self[0], self[1]])
-        return self._cache['central_inverted']
+        return self._inverted
 
     def is_rot_inv(self):
         """Return whether the transform is a rotary inversion."""
-        return self.I().is_rot() and not self.is_refl()
-
-    def _eq_rot_inv(self, u):
-        return self.I() == u.I()
+        return self._type == self.RotInv
 
     def __hash_rot_inv(self):
         axis = self.__axis_rot_inv()
@@ -1193,20 +1466,22 @@ class Transform3(tuple, base.Orbitit):
 
         Should only be called when this is a rotary inversion
         """
-        if 'matrix_rot_inv' not in self._cache:
+        if self._matrix is None:
             w, x, y, z = self[0]
-            self._cache['matrix_rot_inv'] = _get_mat_rot(w, x, y, z, -1)
-        return self._cache['matrix_rot_inv']
+            self._matrix = _get_mat_rot(w, x, y, z, -1)
+        return self._matrix
 
     def __inverse_rot_inv(self):
         """If this is a rotary inversion, return the reverse.
 
         Should only be called when this is a rotary inversion
         """
-        if 'inverse_rot_inv' not in self._cache:
-            self._cache['inverse_rot_inv'] = RotInv3(axis=self.axis(),
-                                                     angle=-self.angle())
-        return self._cache['inverse_rot_inv']
+        if self._inverse is None:
+            self._inverse = RotInv3(
+                axis=self.axis(),
+                angle=-self.angle(),
+            )
+        return self._inverse
 
     is_rot_refl = is_rot_inv
     # not needed: since they are the same (you can use the axis method):
@@ -1359,7 +1634,6 @@ class RotInv3(Transform3):
         result = None
         if _is_quat_pair(quat_pair):
             result = super().__new__(cls, quat_pair)
-            result._cache = {}
             assert result.is_rot_inv(), f"{quat_pair} doesn't represent a rotary inversion"
         else:
             ri = Rot3(quat_pair, axis, angle).I()
@@ -1425,6 +1699,15 @@ class Rot3NonCentered():
         """Return False a rotation is never opposite."""
         return False
 
+    def apply_many(self, vs):
+        """Rotate a list of 3D vertices by converting this rotation to a matrix once.
+
+        vs: a list of Vec3 objects, a VertexArray or a numpy array with shape (N, 3)
+
+        Return the rotated vertices in the same type as vs.
+        """
+        return _apply_matrix(self.matrix(), vs, Vec3)
+
     @overload
     def __mul__(self, v: Vec3) -> Vec3:
         """Left rotate a 3D vector and return as 3D vector"""
@@ -1495,6 +1778,21 @@ class Transform4(tuple):
             return self[0] * Quat(u) * self[1]
         return u.__rmul__(self)
 
+    def apply_many(self, vs):
+        """Transform a list of 4D vertices in one go.
+
+        vs: a list of Vec4 (or Quat) objects or a numpy array with shape (N, 4)
+
+        Return the transformed vertices in the same type as vs, where a list consists of Quat
+        objects.
+        """
+        if len(vs) == 0:
+            return vs.copy()
+        arr = _to_array(vs)
+        q = _quat_mul_many(self[0], tuple(arr.T))
+        q = _quat_mul_many(q, self[1])
+        return _from_array(np.stack(q, axis=1), vs, Quat)
+
     def angle(self):
         """return the angle of a rotation or raise NoRotation"""
         if self.is_rot():
@@ -1919,6 +2217,22 @@ class Mat(list):
         result.is_homogeneous = True
         return result
 
+    def apply_many(self, vs):
+        """Multiply a list of vertices with this matrix in one go.
+
+        vs: a list of Vec objects, a VertexArray or a numpy array with one vertex per row. If the
+            matrix has one row and column more than the dimension of the vertices, then it is used
+            as a homogeneous matrix.
+
+        Return the result in the same type as vs, where a list consists of objects of the class
+        of the first vertex.
+        """
+        if isinstance(vs, (np.ndarray, VertexArray)) or len(vs) == 0:
+            vec_class = Vec
+        else:
+            vec_class = vs[0].__class__
+        return _apply_matrix(self, vs, vec_class)
+
     def glMatrix(self):
         """Return the glMatrix representation"""
         return self.homogeneous.transpose()
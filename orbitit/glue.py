@@ -26,6 +26,10 @@
 
 import logging
 
+import numpy as np
+
+from orbitit import geomtypes
+
 
 def getVUsageIn1D(vs, es, vUsage=None):
     """
@@ -54,81 +58,116 @@ def getVUsageIn2D(vs, fs, vUsage = None):
             vUsage[vIndex] = vUsage[vIndex] + 1
     return vUsage
 
-def clean_up_vs_fs(vs, fs):
+def clean_up_vs_fs(vs, fs, es=None, min_face_len=0):
     """cleanup vs and update fs by removing unused vertices.
 
     Note that the arrays themselves are updated. If this is not wanted, send in
     copies.
-    It returns an array with tuples expressing which vertices are deleted. This
-    array can be used as input to filterEs
+    vs: list of vertices.
+    fs: list of faces, each face is a list of vertex indices. Faces with less
+        than min_face_len unique vertices are removed.
+    es: optional 1D array of vertex indices, where each two indices form an
+        edge. The vertices of the edges are kept as well.
+    It returns a tuple with:
+    - an array with the usage of each vertex that is kept.
+    - an array with for each original face the new face index, or -1 if the
+      face is removed.
     """
     # The clean up is done as follows:
-    # first construct an array of unused vertex indices
-    # remove all unused indices from vs and subtract the approproate amount
-    # from the indices in fs that are bigger
-    # vUsage contains for each vertex a tuple that expresses:
-    # - how often the vertex is used:
-    # After the unused vertices are deleted, vRemoved will contain:
-    # - how many vertices that come before this (vertex) index are deleted.
-    #
-    vUsage = getVUsageIn2D(vs, fs)
-    vRemoved = [0 for x in vUsage]
-    notUsed = 0 # counts the amount of vertices that are not used until vertex i
-    for i in range(len(vUsage)):
-        # If the vertex is not used
-        if vUsage[i - notUsed] == 0:
-            del vs[i - notUsed]
-            del vUsage[i - notUsed]
-            notUsed += 1
-        # change the value of vUsage to the amount of vertices that are (not
-        # used and from now on) deleted until vertex i
-        vRemoved[i] = notUsed
+    # - remove the faces that have too few unique vertices
+    # - construct an array that maps each old vertex index on the new one,
+    #   where unused vertices get -1 and are removed.
+    # - map the indices in fs and es in one go.
+    face_map = []
+    kept_fs = []
     for f in fs:
-        for faceIndex in range(len(f)):
-            f[faceIndex] = f[faceIndex] - vRemoved[f[faceIndex]]
-    return vUsage
+        if len(set(f)) < min_face_len:
+            face_map.append(-1)
+        else:
+            face_map.append(len(kept_fs))
+            kept_fs.append(f)
+    fs[:] = kept_fs
+    vUsage = getVUsageIn2D(vs, fs)
+    if es:
+        vUsage = getVUsageIn1D(vs, es, vUsage)
+    v_map = []
+    no_of_vs = 0
+    for used in vUsage:
+        if used:
+            v_map.append(no_of_vs)
+            no_of_vs += 1
+        else:
+            v_map.append(-1)
+    if no_of_vs < len(vs):
+        vs[:] = [v for v, used in zip(vs, vUsage) if used]
+        for f in fs:
+            f[:] = [v_map[i] for i in f]
+        if es:
+            es[:] = [v_map[i] for i in es]
+    return [used for used in vUsage if used], face_map
+
+def _cell_offsets(dimension):
+    """Return the offsets of all cells that neighbour a cell (including itself) in a grid."""
+    offsets = [()]
+    for _ in range(dimension):
+        offsets = [o + (d,) for o in offsets for d in (-1, 0, 1)]
+    return offsets
 
 def mergeVs(vs, fs, precision=12):
     """
     Merges vertices that are equal into one vertex.
 
-    Note that this might change the content of fs and es.
+    Note that this might change the content of fs.
     Note that vs is not cleaned up. This means that some vertices might not be
-    used. The return value indicates if some vertices are unused now.
+    used. The return value indicates if some vertices are unused now. Faces
+    might end up with less than 3 unique vertices; clean_up_vs_fs can be used
+    to remove these and the unused vertices.
+    Vertices are compared within the margin of geomtypes.FloatHandler. Each
+    vertex is replaced by the vertex with the lowest index that is equal.
     """
     replaced = False
     replace_by = [-1 for v in vs]
     # first build up an array that expresses for each vertex by which vertex it
     # can be replaced.
     logging.info("Find multiple occurences of vertices")
-    log_handler = logging.getLogger().handlers[0]
+    # Overwrite the progress lines, if logging is configured
+    log_handlers = logging.getLogger().handlers
+    log_handler = log_handlers[0] if log_handlers else logging.StreamHandler()
     end_bac, log_handler.terminator = log_handler.terminator, '\r'
 
-    for i in range(len(vs) - 1, -1, -1):
-        logging.info(f"checking vertex {len(vs) - i} (of {len(vs)})")
-        v = vs[i]
-        for j in range(i):
-            if v == vs[j]:
-                replaced = True
-                replace_by[i] = j
-                break
+    if len(vs) > 0:
+        if isinstance(vs, geomtypes.VertexArray):
+            coords = vs.array
+        else:
+            coords = np.array(vs, dtype=float)
+        margin = geomtypes.FloatHandler.margin
+        # Put the vertices in a grid. Vertices that are equal within the margin
+        # are in the same cell or in neighbouring cells. The cells are twice
+        # as big as the margin so that rounding errors in the division don't
+        # matter.
+        cells = np.floor(coords / (2 * margin)).tolist()
+        coords = coords.tolist()
+        offsets = _cell_offsets(len(coords[0]))
+        grid = {}
+        for i, (v, cell) in enumerate(zip(coords, cells)):
+            if i % 10000 == 0:
+                logging.info(f"checking vertex {i} (of {len(vs)})")
+            for offset in offsets:
+                neighbour = tuple(c + d for c, d in zip(cell, offset))
+                # each cell has its vertex indices in increasing order
+                for j in grid.get(neighbour, ()):
+                    if replace_by[i] > -1 and j > replace_by[i]:
+                        break
+                    if all(abs(a - b) < margin for a, b in zip(v, coords[j])):
+                        replaced = True
+                        replace_by[i] = j
+                        break
+            grid.setdefault(tuple(cell), []).append(i)
     # Apply the changes now. Don't delete the vertices, since that means
     # re-indexing
     log_handler.terminator = end_bac
     logging.info("")
     logging.info("Clean up fs")
-    for f_i in range(len(fs) - 1, -1, -1):
-        f = fs[f_i]
-        face_vertices = []  # array holding unique face vertices
-        for i in range(len(f)):
-            if replace_by[f[i]] > -1:
-                f[i] = replace_by[f[i]]
-            if not f[i] in face_vertices:
-                face_vertices.append(f[i])
-        # remove any faces with only 2 (or less) unique vertices
-        if len(face_vertices) < 3:
-            del(fs[f_i])
-#    for i in range(len(es)):
-#       if replace_by[es[i]] > -1:
-#           es[i] = replace_by[es[i]]
+    for f in fs:
+        f[:] = [i if replace_by[i] == -1 else replace_by[i] for i in f]
     return replaced
@@ -101,3 +101,103 @@ class Str(str):
         return Str(
             "\n".join(s if s == "" else (i * " ") + s for s in self.splitlines())
         )
+
+
+class Writer:
+    """Write text with indentation to a file object.
+
+    It supports the same methods as Str to add lines, but instead of creating a new string each
+    time, the lines are written directly to the file object.
+    """
+
+    def __init__(self, fd, indent_step=4, indent=0):
+        """
+        fd: the file object to write to.
+        indent_step: the number of spaces to increase or decrease the indentation with.
+        indent: the initial indentation in number of spaces.
+        """
+        assert indent_step >= 0, f"indent_step must be bigger than 0, got {indent_step}"
+        self.fd = fd
+        self.indent_step = indent_step
+        self.indent = max(indent, 0)
+
+    def glue_line(self, s):
+        """Add a line that already has indentation, i.e. don't indent.
+
+        s: the text string to be added. A new line is added at the end of the provided text.
+        """
+        self.fd.write(f"{s}\n")
+
+    def add_line(self, s):
+        """Add a line with the current indentation.
+
+        s: the text string to be indented and added. A new line is added at the end of the provided
+            text.
+        """
+        self.fd.write(f"{' ' * self.indent}{s}\n")
+
+    def add_incr_line(self, s, i=1):
+        """Add a line with an increased indentation.
+
+        s: the text string to be indented and added. A new line is added at the end of the provided
+            text.
+        i: express with how many steps the indentation needs to be increased. Default 1.
+        """
+        self.incr(i)
+        self.add_line(s)
+
+    def add_decr_line(self, s, i=1):
+        """Add a line with an decreased indentation.
+
+        s: the text string to be indented and added. A new line is added at the end of the provided
+            text.
+        i: express with how many steps the indentation needs to be decreased. Default 1.
+        """
+        self.decr(i)
+        self.add_line(s)
+
+    def add_block(self, s):
+        """Add a text with one or more lines that all get the current indentation.
+
+        Empty lines will not get an indentation. A new line is added at the end of the provided
+        text.
+        """
+        self.add_blocks([s])
+
+    def add_blocks(self, blocks, separator=","):
+        """Add texts with one or more lines that all get the current indentation.
+
+        This gives the same result as joining the texts after reindenting them with Str.reindent
+        and then adding them with glue_line, but the texts are written one by one.
+
+        blocks: an iterable with the texts. Empty lines will not get an indentation.
+        separator: the texts are separated by this string and a new line.
+        """
+        indentation = " " * self.indent
+        end = ""
+        for block in blocks:
+            self.fd.write(end)
+            if "\n" in block:
+                self.fd.write(
+                    "\n".join(s if s == "" else indentation + s for s in block.splitlines())
+                )
+            elif block:
+                self.fd.write(f"{indentation}{block}")
+            end = f"{separator}\n"
+        self.fd.write("\n")
+
+    def incr(self, i=1):
+        """
+        Increase the indentation with the specified amount of steps
+
+        i: express with how many steps the indentation needs to be increased. Default 1.
+        """
+        self.indent = self.indent + i * self.indent_step
+
+    def decr(self, i=1):
+        """
+        Decrease the indentation with the specified amount of steps
+
+        i: express with how many steps the indentation needs to be decreased. Default 1.
+        """
+        self.indent = max(self.indent - i * self.indent_step, 0)
@@ -26,7 +26,9 @@
 # pylint: disable=too-many-locals,too-many-statements,too-many-instance-attributes
 
 
+from collections import OrderedDict
 from copy import copy, deepcopy
+import itertools
 import logging
 import math
 import re
@@ -198,9 +200,9 @@ def _get_alternative_subgroups(sg, pars, chk, realise):
     sg: class of subgroup to be realised (instantiated)
     pars: list of possible parameters in the setup for sg realisation
     chk: function to check whether a sg object already is added. The parameters
-         of this function is (g, p), where g is a subgroup object and p is the
+         of this function is (d, p), where d is a subgroup descriptor and p is the
          parameter from pars that is being checked.
-    realise: function to call to instantiate sg with a p in the setup
+    realise: function to call to get a SubgroupDescriptor for sg with a p in the setup
     """
     result = []
     for p in pars:
@@ -231,11 +233,445 @@ def get_axes(transforms, n=0):
     return res
 
 
+# The isometries in a Set are indexed on their quaternion pair. The cells of this index are much
+# bigger than the float margin so that isometries that are considered equal normally end up in the
+# same cell. Only for a coordinate close to a cell border the neighbouring cell is checked as well.
+_INDEX_CELL_FACTOR = 1024
+
+# A unit quaternion always has a coordinate with an absolute value of at least 1/2. The sign of the
+# first coordinate that is bigger than this limit is used to normalise the quaternion pair. The
+# limit is smaller than 1/2 so that there is always such a coordinate that isn't within the float
+# margin of the limit.
+_INDEX_SIGN_LIMIT = 0.25
+
+
+def _index_cells(coords, margin):
+    """Return all index cell keys for the coordinates that are within margin."""
+    cell_size = _INDEX_CELL_FACTOR * margin
+    cells = []
+    for x in coords:
+        cell = math.floor(x / cell_size)
+        options = [cell]
+        if x - cell * cell_size < margin:
+            options.append(cell - 1)
+        elif (cell + 1) * cell_size - x < margin:
+            options.append(cell + 1)
+        cells.append(options)
+    return list(itertools.product(*cells))
+
+
+def _index_keys(isom, margin):
+    """Return the keys of the index cells where an isometry equal to isom can be found.
+
+    The quaternion pair q0, q1 of a transform represents the same isometry as -q0, -q1. That is why
+    the pair is sign-normalised first.
+
+    isom: the geomtypes.Transform3 object to get the keys for.
+    margin: the float margin that is used for comparing floats.
+
+    Return a list of keys, where the first key is the one to use for storing isom. For anything
+    that isn't a transform the list [None] is returned.
+    """
+    if not isinstance(isom, geomtypes.Transform3):
+        return [None]
+    coords = tuple(isom[0]) + tuple(isom[1])
+    ambiguous = True
+    near_limit = False
+    for x in coords:
+        # If a coordinate is close to the limit, then an equal isometry might be normalised on
+        # another coordinate. Then both signs are looked up.
+        near_limit = near_limit or abs(abs(x) - _INDEX_SIGN_LIMIT) < 2 * margin
+        if abs(abs(x) - _INDEX_SIGN_LIMIT) < margin:
+            continue
+        if abs(x) > _INDEX_SIGN_LIMIT:
+            if x < 0:
+                coords = tuple(-x for x in coords)
+            ambiguous = near_limit
+            break
+    keys = _index_cells(coords, margin)
+    if ambiguous:
+        keys.extend(_index_cells([-x for x in coords], margin))
+    return keys
+
+
 class ImproperSubgroupError(ValueError):
     "Raised when subgroup is not really a subgroup"
 
 
-class Set(set, base.Orbitit):
+class CayleyTable:
+    """Compiled form of a finite set of isometries.
+
+    The isometries are numbered 0..n-1 and the products and inverses are saved as tables of these
+    numbers, so that group operations can be done by integer look-ups. The tables are only created
+    when they are used. A subset of the isometries can be represented by an integer bitmask where
+    bit i is set if isometry i is part of the subset.
+    """
+
+    def __init__(self, isometries):
+        """Create the tables by multiplying all isometries once.
+
+        isometries: an iterable of geomtypes.Transform3 objects. This doesn't need to be a group. If
+            a product or an inverse isn't part of the isometries, then the table entry is None.
+        """
+        self.elements = []
+        self._lookup = Set([])
+        self._ids = {}
+        for e in isometries:
+            if e not in self._lookup:
+                self._lookup.add(e)
+                self._ids[id(e)] = len(self.elements)
+                self.elements.append(e)
+        self.unit = self.index(geomtypes.E)
+        self._mult = None
+        self._inv = None
+        self._products = {}
+        self._conjugacy_classes = None
+
+    def __len__(self):
+        return len(self.elements)
+
+    @property
+    def mult(self):
+        """The table with the number of a * b for the numbers of all isometries a and b."""
+        if self._mult is None:
+            self._mult = [
+                [self.index(a * b) for b in self.elements] for a in self.elements
+            ]
+        return self._mult
+
+    @property
+    def inv(self):
+        """A list with the number of the inverse of each isometry."""
+        if self._inv is None:
+            self._inv = [self.index(a.inverse()) for a in self.elements]
+        return self._inv
+
+    def product(self, i, j):
+        """Return the number of the product of the isometries with number i and j.
+
+        Without a multiplication table only the products that are asked for are calculated.
+        """
+        if self._mult is not None:
+            return self._mult[i][j]
+        if (i, j) not in self._products:
+            self._products[(i, j)] = self.index(self.elements[i] * self.elements[j])
+        return self._products[(i, j)]
+
+    def index(self, isom):
+        """Return the number of isom or None if it isn't part of the table."""
+        # pylint: disable=protected-access
+        e = self._lookup._find(isom)
+        if e is None:
+            return None
+        return self._ids[id(e)]
+
+    def indices(self, isoms):
+        """Return a set with the numbers of isoms or None if any of them isn't part of the table."""
+        result = set()
+        for isom in isoms:
+            i = self.index(isom)
+            if i is None:
+                return None
+            result.add(i)
+        return result
+
+    def mask(self, isoms):
+        """Return the bitmask for isoms or None if any of them isn't part of the table."""
+        result = 0
+        for isom in isoms:
+            i = self.index(isom)
+            if i is None:
+                return None
+            result |= 1 << i
+        return result
+
+    @staticmethod
+    def mask_ids(mask):
+        """Return a list with the numbers of the isometries in the bitmask."""
+        result = []
+        i = 0
+        while mask:
+            if mask & 1:
+                result.append(i)
+            mask >>= 1
+            i += 1
+        return result
+
+    def subset(self, mask):
+        """Return a Set with the isometries of the bitmask."""
+        result = Set([self.elements[i] for i in self.mask_ids(mask)])
+        result._bits = (self, mask)  # pylint: disable=protected-access
+        return result
+
+    def is_closed_mask(self, mask):
+        """Check whether the isometries in the bitmask form a group.
+
+        For a finite set of isometries it is enough to check that it is closed under
+        multiplication.
+        """
+        ids = self.mask_ids(mask)
+        if not ids:
+            return False
+        for i in ids:
+            for j in ids:
+                k = self.product(i, j)
+                if k is None or not mask >> k & 1:
+                    return False
+        return True
+
+    def is_group(self):
+        """Check whether the isometries form an algebraic group."""
+        return (
+            self.unit is not None
+            and None not in self.inv
+            and all(None not in row for row in self.mult)
+        )
+
+    def is_closed(self, ids):
+        """Check whether the isometries with the specified numbers form a group.
+
+        This should only be called when the table itself represents a group.
+        """
+        if not ids:
+            return False
+        for i in ids:
+            if self.inv[i] not in ids:
+                return False
+            row = self.mult[i]
+            for j in ids:
+                if row[j] not in ids:
+                    return False
+        return True
+
+    def cosets(self, ids):
+        """Return the left cosets g * H for the subgroup H with the specified numbers.
+
+        These are the cosets that Set.coset_decomposition uses.
+
+        ids: the numbers of the isometries of the subgroup.
+
+        Return a list of cosets, where each coset is a list of numbers.
+        """
+        found = [False] * len(self.elements)
+        result = []
+        for i, row in enumerate(self.mult):
+            if not found[i]:
+                coset = [row[j] for j in ids]
+                for j in coset:
+                    found[j] = True
+                result.append(coset)
+        return result
+
+    @property
+    def conjugacy_classes(self):
+        """Return a list with the conjugacy classes, where each class is a set of numbers."""
+        if self._conjugacy_classes is None:
+            found = [False] * len(self.elements)
+            self._conjugacy_classes = []
+            for i in range(len(self.elements)):
+                if not found[i]:
+                    conj_class = {
+                        self.mult[self.mult[h][i]][self.inv[h]]
+                        for h in range(len(self.elements))
+                    }
+                    for j in conj_class:
+                        found[j] = True
+                    self._conjugacy_classes.append(conj_class)
+        return self._conjugacy_classes
+
+
+class CosetDecomposition:
+    """Decomposition of a group of isometries in the cosets of a subgroup.
+
+    The decomposition is only valid as long as the group isn't changed.
+    """
+
+    def __init__(self, group, cosets, elements, labels):
+        """Initialise the decomposition
+
+        group: the Set object that was decomposed.
+        cosets: a list of Set objects, one for each coset.
+        elements: a list of all the isometries in group.
+        labels: a list with the index of the coset for each isometry in elements.
+        """
+        self.group = group
+        self.cosets = cosets
+        self.elements = elements
+        self.labels = labels
+        self.transversal = [coset.get_one() for coset in cosets]
+        self._pos = {id(e): i for i, e in enumerate(elements)}
+
+    def __len__(self):
+        return len(self.cosets)
+
+    def label(self, isom):
+        """Return the index of the coset that isom belongs to or None if isom isn't in the group."""
+        # pylint: disable=protected-access
+        e = self.group._find(isom)
+        if e is None:
+            return None
+        return self.labels[self._pos[id(e)]]
+
+
+def _setup_key(value, precision):
+    """Return a hashable key for a group setup with the floats rounded to precision.
+
+    Raise a TypeError if the setup contains something that isn't supported.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _setup_key(v, precision)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_setup_key(v, precision) for v in value)
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        # Adding 0.0 replaces -0.0 by 0.0
+        return round(value, precision) + 0.0
+    raise TypeError(f"Unsupported setup value {value}")
+
+
+class GroupCache:
+    """A least recently used cache of symmetry groups that were constructed from a setup.
+
+    The groups are saved per class and setup, where the floats in the setup are rounded to the
+    current float precision. A copy of the saved group is returned, so the saved group itself is
+    never changed.
+    """
+
+    def __init__(self, max_size=128):
+        """Initialise the cache
+
+        max_size: the maximum number of groups that are kept.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._groups = OrderedDict()
+
+    def __len__(self):
+        return len(self._groups)
+
+    def get(self, cls, setup, create):
+        """Get a group of class cls with the specified setup.
+
+        cls: the class of the group.
+        setup: the setup of the group as used by the class.
+        create: a function without arguments that creates the group if it isn't in the cache.
+
+        Return a new group object.
+        """
+        precision = geomtypes.FloatHandler.precision
+        try:
+            key = (cls, precision, _setup_key(setup, precision))
+        except TypeError:
+            return create()
+        if key in self._groups:
+            self.hits += 1
+            self._groups.move_to_end(key)
+            return copy(self._groups[key])
+        self.misses += 1
+        group = create()
+        # Save a copy, since the generator of the group might refer to the setup of the caller
+        self._groups[key] = copy(group)
+        if len(self._groups) > self.max_size:
+            self._groups.popitem(last=False)
+        return group
+
+    def clear(self):
+        """Remove all groups from the cache and reset the counters."""
+        self._groups.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """Return a dictionary with the counters and the size of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._groups),
+            "max_size": self.max_size,
+        }
+
+
+# The cache used by all the symmetry groups in this module:
+group_cache = GroupCache()
+
+
+class SubgroupDescriptor:
+    """Description of a realised subgroup: its class and the setup that defines its orientation.
+
+    The isometries of the subgroup are only created when the group is accessed.
+    """
+
+    def __init__(self, sg, setup=None, group=None):
+        """Initialise the descriptor
+
+        sg: the class of the subgroup
+        setup: the setup for the class that defines the orientation of the subgroup.
+        group: the subgroup object if it is created already.
+        """
+        self.sg = sg
+        self.setup = {} if setup is None else setup
+        self._group = group
+
+    def __repr__(self):
+        return f"{__name__}.SubgroupDescriptor({self.sg.__name__}, setup={self.setup})"
+
+    @property
+    def group(self):
+        """Get the subgroup, create it if this hasn't been done yet."""
+        if self._group is None:
+            self._group = self.sg(setup=self.setup)
+        return self._group
+
+    @property
+    def repr_dict(self):
+        """Return a short representation of the subgroup."""
+        if self._group is not None:
+            return self._group.repr_dict
+        return {
+            "class": base.class_to_json[self.sg],
+            "data": {"generator": self.setup},
+        }
+
+    @classmethod
+    def from_group(cls, group):
+        """Create a descriptor for a group that exists already."""
+        return cls(group.__class__, group.generator, group)
+
+    @classmethod
+    def from_json_dict(cls, repr_dict):
+        """Create a descriptor from the JSON dict representation of a group."""
+        if "generator" in repr_dict["data"]:
+            return cls(
+                Set.from_json_class_name(repr_dict["class"]), repr_dict["data"]["generator"]
+            )
+        return cls.from_group(Set.from_json_dict(repr_dict))
+
+
+class MetaSet(type(base.Orbitit)):
+    """Meta class for isometry sets
+
+    Symmetry groups that are created from a setup are taken from the group_cache.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        if (
+            cls is Set
+            or args
+            or kwargs.get("isometries") is not None
+            or not set(kwargs.keys()) <= {"isometries", "setup"}
+        ):
+            return super().__call__(*args, **kwargs)
+        setup = kwargs.get("setup")
+        return group_cache.get(
+            cls, {} if setup is None else setup, lambda: super(MetaSet, cls).__call__(**kwargs)
+        )
+
+
+class Set(set, base.Orbitit, metaclass=MetaSet):
     """
     Base class for the symmetry groups, which are sets of isometries.
     """
@@ -255,6 +691,111 @@ class Set(set, base.Orbitit):
             self.generator = {}
         super().__init__(*args)
         self.short_string = True
+        self._changed()
+        self._reindex()
+
+    def __copy__(self):
+        # Faster than the default copy, which recreates the isometry set through __init__
+        new = self.__class__.__new__(self.__class__)
+        set.__init__(new, self)
+        new.__dict__.update(self.__dict__)
+        # Some classes update the generator of the groups they are built from
+        new.generator = copy(self.generator)
+        # A copy might be changed, so it cannot share the descriptors
+        new._subgroup_descriptors = {}
+        new._index = {key: list(bucket) for key, bucket in self._index.items()}
+        return new
+
+    def __getstate__(self):
+        # The index is rebuilt by __init__, it shouldn't be shared by copies
+        state = dict(self.__dict__)
+        state.pop("_index", None)
+        state.pop("_index_margin", None)
+        return state
+
+    def _reindex(self):
+        """(Re)build the index that is used to look up isometries."""
+        self._index_margin = geomtypes.FloatHandler.margin
+        self._index = {}
+        for e in self:
+            self._index.setdefault(_index_keys(e, self._index_margin)[0], []).append(e)
+
+    def _find(self, o):
+        """Return the element in the set that equals o or None if there is none."""
+        if self._index_margin != geomtypes.FloatHandler.margin:
+            self._reindex()
+        for key in _index_keys(o, self._index_margin):
+            for e in self._index.get(key, []):
+                if e == o:
+                    return e
+        return None
+
+    def _unindex(self, e):
+        """Remove element e, which must be part of the set, from the index."""
+        self._changed()
+        bucket = self._index[_index_keys(e, self._index_margin)[0]]
+        for i, b in enumerate(bucket):
+            if b is e:
+                del bucket[i]
+                break
+
+    def _changed(self):
+        """Forget everything that was derived from the isometries in the set."""
+        self._cayley = None
+        # Tuple with a CayleyTable and the bitmask of this set in that table
+        self._bits = None
+        self._is_group = None
+        # Non-oriented subgroup -> descriptors of its oriented subgroups, see iter_subgroups
+        self._subgroup_descriptors = {}
+
+    def bitmask(self, table):
+        """Return the bitmask of this set in a CayleyTable or None if it isn't a subset of it.
+
+        The bitmask is remembered, so that operations with other subsets of the same table are
+        done by bit operations.
+
+        table: the CayleyTable of a set with this set as subset, e.g. of a parent group.
+        """
+        if self._bits is None or self._bits[0] is not table:
+            self._bits = (table, table.mask(self))
+        return self._bits[1]
+
+    def _shared_table(self, o):
+        """Return a known CayleyTable that has o as subset or None if there is none."""
+        if not isinstance(o, Set):
+            return None
+        for table in (
+            o._bits[0] if o._bits else None,
+            self._bits[0] if self._bits else None,
+            o._cayley,
+            self._cayley,
+        ):
+            if table is not None and o.bitmask(table) is not None:
+                return table
+        return None
+
+    def compile(self):
+        """Compile the set into a Cayley table to speed up group operations.
+
+        After this the group operations are done by integer look-ups. The
+        table is dropped as soon as the set is changed.
+
+        Return the CayleyTable object.
+        """
+        if self._cayley is None:
+            self._cayley = CayleyTable(self)
+        return self._cayley
+
+    @property
+    def cayley_table(self):
+        """The Cayley table of the set or None if the set isn't compiled."""
+        return self._cayley
+
+    def _compiled_group(self):
+        """Return the Cayley table if the set is compiled and is a group, otherwise None."""
+        if self._cayley is not None and self._cayley.is_group():
+            return self._cayley
+        return None
 
     def __repr__(self):
         s = indent.Str(f"{base.find_module_class_name(self.__class__, __name__)}(\n")
@@ -297,7 +838,7 @@ class Set(set, base.Orbitit):
         new_class = None
         if class_name not in cls.to_class:
             if re_result := re.search(cls.RE_XN, class_name):
-                elements = re_result.groups()[0]
+                elements = re_result.groups()
                 sym = elements[0]
                 n = int(elements[1])
                 syms = {"C": C, "D": D}
@@ -312,17 +853,17 @@ class Set(set, base.Orbitit):
                     new_class = syms[sym](n)
             elif re_result := re.search(cls.RE_X2NXN, class_name):
                 elements = re_result.groups()
-                sym_m = int(elements[0])
+                sym_m = elements[0]
                 m = int(elements[1])
-                sym_n = int(elements[2])
+                sym_n = elements[2]
                 n = int(elements[3])
                 syms = {"C": C2nC, "D": D2nD}
                 if sym_m == sym_n and sym_m in syms and m == 2 * n:
-                    new_class = syms[sym](n)
+                    new_class = syms[sym_m](n)
             elif re_result := re.search(cls.RE_DNCN, class_name):
                 elements = re_result.groups()
-                m = elements[0]
-                n = elements[1]
+                m = int(elements[0])
+                n = int(elements[1])
                 if m == n:
                     new_class = DnC(n)
 
@@ -331,15 +872,20 @@ class Set(set, base.Orbitit):
             base.class_to_json[new_class] = class_name
 
     @classmethod
-    def from_json_dict(cls, repr_dict):
-        """Recreate object from complete dict representation."""
-        cls.create_dihedral_and_cyclic_on_the_fly(repr_dict)
+    def from_json_class_name(cls, class_name):
+        """Return the isometry class for the class name used in JSON, create it if needed."""
+        cls.create_dihedral_and_cyclic_on_the_fly({"class": class_name})
         try:
-            sub_class = cls.to_class[repr_dict["class"]]
+            return cls.to_class[class_name]
         except KeyError as e:
             raise ValueError(
-                f'{repr_dict["class"]} not in {cls.to_class} (expected)'
+                f"{class_name} not in {cls.to_class} (expected)"
             ) from e
+
+    @classmethod
+    def from_json_dict(cls, repr_dict):
+        """Recreate object from complete dict representation."""
+        sub_class = cls.from_json_class_name(repr_dict["class"])
         return sub_class.from_dict_data(repr_dict["data"])
 
     @classmethod
@@ -382,6 +928,9 @@ class Set(set, base.Orbitit):
     def __eq__(self, o):
         eq = len(self) == len(o)
         if eq:
+            table = self._shared_table(o)
+            if table is not None:
+                return self.bitmask(table) == o.bitmask(table)
             for e in self:
                 eq = e in o
                 if not eq:
@@ -392,18 +941,60 @@ class Set(set, base.Orbitit):
         new = Set([])
         for e in self:
             if e not in o:
-                set.add(new, e)
+                new.add(e)
         return new
 
     def __or__(self, o):
+        table = self._shared_table(o)
+        if table is not None:
+            mask = self.bitmask(table)
+            if mask is not None:
+                return table.subset(mask | o.bitmask(table))
         new = Set(self)
         for e in o:
             new.add(e)
         return new
 
+    def __and__(self, o):
+        table = self._shared_table(o)
+        if table is not None:
+            mask = self.bitmask(table)
+            if mask is not None:
+                return table.subset(mask & o.bitmask(table))
+        return Set([e for e in self if e in o])
+
+    def union(self, *others):
+        """Return a new set with the elements of this set and of all the others"""
+        new = copy(self)
+        for o in others:
+            new = new | o
+        return new
+
+    def intersection(self, *others):
+        """Return a new set with the elements that are part of this set and all the others"""
+        new = copy(self)
+        for o in others:
+            new = new & o
+        return new
+
+    def issubset(self, o):
+        """Return whether all elements of this set are part of o"""
+        table = self._shared_table(o)
+        if table is not None:
+            mask = self.bitmask(table)
+            return mask is not None and not mask & ~o.bitmask(table)
+        return len(self) <= len(o) and all(e in o for e in self)
+
     def __mul__(self, o):
         if isinstance(o, Set):
             # Set(self) * Set(o)
+            table = self._compiled_group()
+            if table is not None:
+                ids = table.indices(o)
+                if ids is not None:
+                    return Set(
+                        [table.elements[k] for k in {r[j] for r in table.mult for j in ids}]
+                    )
             new = Set([])
             for d in o:
                 new.update(self * d)
@@ -421,6 +1012,16 @@ class Set(set, base.Orbitit):
         # A group should at least have 'E', it cannot be empty
         if not self:
             return False
+        if self._is_group is None:
+            self._is_group = self._chk_group()
+        return self._is_group
+
+    def _chk_group(self):
+        """Check whether self is a algebraic group, without using the saved result"""
+        if self._cayley is not None:
+            return self._cayley.is_group()
+        if self._bits is not None and self._bits[1] is not None:
+            return self._bits[0].is_closed_mask(self._bits[1])
         this_is_group = True
         for e in self:
             # optimised away, done as part of next loop:
@@ -443,6 +1044,12 @@ class Set(set, base.Orbitit):
         """returns whether this is a subgroup of o)"""
         if len(self) > len(o):
             return False  # optimisation
+        table = self._shared_table(o)
+        if table is not None:
+            mask = self.bitmask(table)
+            if mask is None or mask & ~o.bitmask(table):
+                return False
+            return not check_group or self.is_group()
         return (not check_group or self.is_group()) and self.issubset(o)
 
     def subgroup(self, o):
@@ -459,6 +1066,9 @@ class Set(set, base.Orbitit):
             for e in o:
                 assert e in self, f"{e} not in {self.__class__.__name__}"
             subgroup = copy(o)
+            table = self._compiled_group()
+            if table is not None and table.is_closed(table.indices(o)):
+                return subgroup
             # for optimisation: don't call group (slow) for self == o:
             if len(subgroup) < len(self):
                 subgroup.group()
@@ -476,48 +1086,162 @@ class Set(set, base.Orbitit):
                 " (with this orientation)"
             ) from e
 
+    def iter_subgroups(self, sg):
+        """Iterate over descriptors of all possible oriented subgroups for non-oriented sg
+
+        This is the lazy form of realise_subgroups: the descriptors only hold the class and the
+        setup, the isometries of a subgroup are created when the group of the descriptor is
+        accessed. The descriptors are saved per subgroup class.
+
+        sg: the class of the subgroup.
+        """
+        if sg not in self._subgroup_descriptors:
+            self._subgroup_descriptors[sg] = self._describe_subgroups(sg)
+        yield from self._subgroup_descriptors[sg]
+
+    def realise_subgroups(self, sg):
+        """
+        realise an array of possible oriented subgroups for non-oriented sg
+        """
+        return [descriptor.group for descriptor in self.iter_subgroups(sg)]
+
+    def _describe_subgroups(self, sg):
+        """Return a list of SubgroupDescriptor objects for non-oriented sg, see iter_subgroups."""
+        raise ImproperSubgroupError(
+            f"{sg.__name__} not subgroup of {self.__class__.__name__}"
+        )
+
     def __truediv__(self, o):
         # this * subgroup: right quotient set
         # make sure o is a subgroup:
         if len(o) > len(self):
             return o.__truediv__(self)
-        o = self.subgroup(o)
-        assert len(o) <= len(self)
-        # use a list of sets, since sets are unhashable
-        quotient_set = []
-        # use a big set for all elems found so for
-        found_so_far = Set([])
-        for te in self:
-            q = te * o
-            if q.get_one() not in found_so_far:
-                quotient_set.append(q)
-                found_so_far = found_so_far.union(q)
-        return quotient_set
+        return self.coset_decomposition(o).cosets
 
     quotient_set = __truediv__
 
+    def coset_decomposition(self, o):
+        """Divide this group in the cosets te * o, where o is a subgroup and te is in this group.
+
+        This is done in one pass over the isometries of this group.
+
+        o: a subgroup of this group. If o isn't a group yet, then it is made into one. If that isn't
+            a subgroup of this group an ImproperSubgroupError is raised.
+
+        Return a CosetDecomposition object.
+        """
+        o = self.subgroup(o)
+        table = self._compiled_group()
+        if table is not None:
+            cosets = table.cosets(table.indices(o))
+            labels = [None] * len(table)
+            for label, coset in enumerate(cosets):
+                for i in coset:
+                    labels[i] = label
+            return CosetDecomposition(
+                self,
+                [Set([table.elements[i] for i in coset]) for coset in cosets],
+                table.elements,
+                labels,
+            )
+        elements = list(self)
+        pos = {id(e): i for i, e in enumerate(elements)}
+        labels = [None] * len(elements)
+        cosets = []
+        for i, te in enumerate(elements):
+            if labels[i] is None:
+                q = te * o
+                for e in q:
+                    e = self._find(e)
+                    if e is not None:
+                        labels[pos[id(e)]] = len(cosets)
+                cosets.append(q)
+        return CosetDecomposition(self, cosets, elements, labels)
+
     def __rdiv__(self, o):
         #  subgroup * self: left quotient set
         pass  # TODO
 
     def __contains__(self, o):
-        # Needed for 'in' relationship: default doesn't work, it seems to
-        # compare the elements id.
-        for e in self:
-            if e == o:
-                return True
-        return False
+        # Needed for 'in' relationship: default doesn't work, since the hash of
+        # two isometries that are considered equal might differ.
+        return self._find(o) is not None
 
     def add(self, e):
         """Add element e to the set"""
-        if e not in self:
+        if self._find(e) is None:
             set.add(self, e)
+            self._changed()
+            self._index.setdefault(_index_keys(e, self._index_margin)[0], []).append(e)
 
     def update(self, o):
         """Update the set with new elements in o"""
         for e in o:
             self.add(e)
 
+    def __ior__(self, o):
+        self.update(o)
+        return self
+
+    def discard(self, e):
+        """Remove element e from the set if it is part of it"""
+        found = self._find(e)
+        if found is not None:
+            set.discard(self, found)
+            self._unindex(found)
+
+    def remove(self, e):
+        """Remove element e from the set, raise a KeyError if it isn't part of it"""
+        found = self._find(e)
+        if found is None:
+            raise KeyError(e)
+        set.discard(self, found)
+        self._unindex(found)
+
+    def pop(self):
+        """Remove and return an arbitrary element from the set"""
+        e = set.pop(self)
+        self._unindex(e)
+        return e
+
+    def clear(self):
+        """Remove all elements from the set"""
+        set.clear(self)
+        self._changed()
+        self._index = {}
+
+    def difference_update(self, *others):
+        """Remove all elements that are part of the others"""
+        for o in others:
+            for e in o:
+                self.discard(e)
+
+    def intersection_update(self, *others):
+        """Only keep the elements that are part of all the others"""
+        for e in list(self):
+            if not all(e in o for o in others):
+                self.discard(e)
+
+    def symmetric_difference_update(self, o):
+        """Only keep the elements that are either part of the set or of o"""
+        for e in o:
+            if e in self:
+                self.discard(e)
+            else:
+                self.add(e)
+
+    def __isub__(self, o):
+        self.difference_update(o)
+        return self
+
+    def __iand__(self, o):
+        self.intersection_update(o)
+        return self
+
+    def __ixor__(self, o):
+        self.symmetric_difference_update(o)
+        return self
+
     def get_one(self):
         """Just get any element in the set.
 
@@ -546,15 +1270,17 @@ class Set(set, base.Orbitit):
     def close(self, max_iter=5):
         """
         Return a closed set, if it can be generated within max_iter steps.
+
+        In each step the set used to be multiplied by itself, which doubles
+        the length of the products of isometries that are checked. So the
+        set should be closed by products of less than 2**max_iter isometries
+        of this set, otherwise an AssertionError is raised.
+
+        The result is a copy of this set, i.e. an object of the same class.
         """
+        group, _ = generate_group(self, 2**max_iter)
         result = copy(self)
-        for _ in range(max_iter):
-            l_prev = len(result)
-            result.update(result * result)
-            l_new = len(result)
-            if l_new == l_prev:
-                break
-        assert l_new == l_prev, f"Couldn't close group after {max_iter} iterations"
+        result.update(group)
         return result
 
     def chk_setup(self, setup):
@@ -598,6 +1324,48 @@ class Set(set, base.Orbitit):
         return self.generator
 
 
+def generate_group(generators, max_word_len=None):
+    """Generate the closed set of isometries from generators with a breadth-first search.
+
+    Each new isometry that is found is multiplied by the generators only, i.e. each isometry is
+    expressed as a word: a product of generators.
+
+    generators: an iterable of geomtypes.Transform3 objects.
+    max_word_len: the maximum length of the words that are checked. If None, then there is no
+        limit. If the set isn't closed with words of this length an AssertionError is raised.
+
+    Return a tuple (group, words) where group is a Set of all the isometries generated by the
+    generators and words is a list of (isometry, word) pairs for all the isometries in the group in
+    the order they were found. A word is a tuple of indices in the list of generators; the isometry
+    is the product of these generators. The order of the group is the length of this list.
+    """
+    generators = list(generators)
+    group = Set([])
+    words = []
+    for i, g in enumerate(generators):
+        if g not in group:
+            group.add(g)
+            words.append((g, (i,)))
+    new = list(words)
+    word_len = 1
+    while new:
+        if max_word_len is not None and word_len >= max_word_len:
+            raise AssertionError(
+                f"Couldn't close group with words of maximum length {max_word_len}"
+            )
+        word_len += 1
+        found = []
+        for isom, word in new:
+            for i, g in enumerate(generators):
+                product = isom * g
+                if product not in group:
+                    group.add(product)
+                    found.append((product, word + (i,)))
+        words.extend(found)
+        new = found
+    return group, words
+
+
 def init_dict(**kwargs):
     """Create a dict with kwargs"""
     return kwargs
@@ -635,13 +1403,13 @@ class E(Set):
         """Create object from dictionary data."""
         return cls()
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if sg == E:
-            return [E()]
+            return [SubgroupDescriptor(E)]
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
         )
@@ -682,15 +1450,15 @@ class ExI(Set):
         """Create object from dictionary data."""
         return cls()
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if sg == ExI:
-            return [self]
+            return [SubgroupDescriptor.from_group(self)]
         if sg == E:
-            return [E()]
+            return [SubgroupDescriptor(E)]
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
         )
@@ -801,19 +1569,19 @@ class Cn(Set, metaclass=MetaCn):
         self.subgroups = _cn_get_subgroups(n)
         self.subgroups.insert(0, C(n))
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if sg == E:
-            return [E()]
+            return [SubgroupDescriptor(E)]
         if sg.n > self.n:
             return []
         if isinstance(sg, MetaCn):
             if sg.n == self.n:
-                return [self]
-            return [sg(setup={"axis": self.rot_axes["n"]})]
+                return [SubgroupDescriptor.from_group(self)]
+            return [SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]})]
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
         )
@@ -933,19 +1701,19 @@ class C2nCn(Set, metaclass=MetaC2nCn):
             self.subgroups = _c2ncn_get_subgroups(self.n)
             self.subgroups.insert(0, C2nC(self.n))
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if isinstance(sg, MetaC2nCn):
             if sg.n == self.n:
-                return [self]
-            return [sg(setup={"axis": self.rot_axes["n"]})]
+                return [SubgroupDescriptor.from_group(self)]
+            return [SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]})]
         if isinstance(sg, MetaCn):
-            return [sg(setup={"axis": self.rot_axes["n"]})]
+            return [SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]})]
         if sg == E:
-            return [E()]
+            return [SubgroupDescriptor(E)]
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
         )
@@ -1067,21 +1835,21 @@ class CnxI(Set, metaclass=MetaCnxI):
             self.subgroups = _cnxi_get_subgroups(self.n)
             self.subgroups.insert(0, CxI(self.n))
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if isinstance(sg, MetaCnxI):
             if sg.n == self.n:
-                return [self]
-            return [sg(setup={"axis": self.rot_axes["n"]})]
+                return [SubgroupDescriptor.from_group(self)]
+            return [SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]})]
         if isinstance(sg, (MetaC2nCn, MetaCn)):
-            return [sg(setup={"axis": self.rot_axes["n"]})]
+            return [SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]})]
         if sg == ExI:
-            return [ExI()]
+            return [SubgroupDescriptor(ExI)]
         if sg == E:
-            return [E()]
+            return [SubgroupDescriptor(E)]
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
         )
@@ -1200,29 +1968,29 @@ class DnCn(Set, metaclass=MetaDnCn):
             self.subgroups = _dncn_get_subgroups(self.n)
             self.subgroups.insert(0, DnC(self.n))
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if sg == E:
-            return [E()]
+            return [SubgroupDescriptor(E)]
         if isinstance(sg, MetaDnCn):
             if sg.n == self.n:
-                return [self]
+                return [SubgroupDescriptor.from_group(self)]
             return _get_alternative_subgroups(
                 sg,
                 self.refl_normals,
-                lambda r, p: p in r.refl_normals,
-                lambda sg, p: sg(setup={"axis_n": self.rot_axes["n"], "normal_r": p}),
+                lambda r, p: p in r.group.refl_normals,
+                lambda sg, p: SubgroupDescriptor(sg, {"axis_n": self.rot_axes["n"], "normal_r": p}),
             )
         if isinstance(sg, MetaC2nCn):
             assert sg.n == 1, f"Only C2C1 can be subgroup of DnCn (n={sg.n})"
             # C2C1 ~= E, plus reflection, with normal == rotation axis (0)
             # provide the normal of the one reflection:
-            return [sg(setup={"axis": self.refl_normals[0]})]
+            return [SubgroupDescriptor(sg, {"axis": self.refl_normals[0]})]
         if isinstance(sg, MetaCn):
-            return [sg(setup={"axis": self.rot_axes["n"]})]
+            return [SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]})]
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
         )
@@ -1350,36 +2118,36 @@ class Dn(Set, metaclass=MetaDn):
             self.subgroups = _dn_get_subgroups(self.n)
             self.subgroups.insert(0, D(self.n))
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if sg == E:
-            return [E()]
+            return [SubgroupDescriptor(E)]
         if isinstance(sg, MetaCn):
             if sg.n == self.n:
-                return [sg(setup={"axis": self.rot_axes["n"]})]
+                return [SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]})]
             if sg.n == 2:  # sg = C2
                 isoms = [
-                    sg(setup={"axis": self.rot_axes[2][i]})
+                    SubgroupDescriptor(sg, {"axis": self.rot_axes[2][i]})
                     for i in range(len(self.rot_axes[2]))
                 ]
                 if self.n % 2 == 0:  # if D2, D4, etc
-                    isoms.insert(0, sg(setup={"axis": self.rot_axes["n"]}))
+                    isoms.insert(0, SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]}))
                 return isoms
-            return [sg(setup={"axis": self.rot_axes["n"]})]
+            return [SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]})]
         if sg.n > self.n:
             return []
 
         if isinstance(sg, MetaDn):
             if sg.n == self.n:
-                return [self]
+                return [SubgroupDescriptor.from_group(self)]
             return _get_alternative_subgroups(
                 sg,
                 self.rot_axes[2],
-                lambda r, p: p in r.rot_axes[2],
-                lambda sg, p: sg(setup={"axis_n": self.rot_axes["n"], "axis_2": p}),
+                lambda r, p: p in r.group.rot_axes[2],
+                lambda sg, p: SubgroupDescriptor(sg, {"axis_n": self.rot_axes["n"], "axis_2": p}),
             )
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
@@ -1533,50 +2301,50 @@ class DnxI(Set, metaclass=MetaDnxI):
             self.subgroups = _dnxi_get_subgroups(self.n)
             self.subgroups.insert(0, DxI(self.n))
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if sg == ExI:
-            return [ExI()]
+            return [SubgroupDescriptor(ExI)]
         if sg == E:
-            return [E()]
+            return [SubgroupDescriptor(E)]
         if sg.n > self.n:
             return []
         if isinstance(sg, MetaDnxI):
             if sg.n == self.n:
-                return [self]
+                return [SubgroupDescriptor.from_group(self)]
             return _get_alternative_subgroups(
                 sg,
                 self.rot_axes[2],
-                lambda r, p: p in r.rot_axes[2],
-                lambda sg, p: sg(setup={"axis_n": self.rot_axes["n"], "axis_2": p}),
+                lambda r, p: p in r.group.rot_axes[2],
+                lambda sg, p: SubgroupDescriptor(sg, {"axis_n": self.rot_axes["n"], "axis_2": p}),
             )
         if isinstance(sg, (MetaDn, MetaD2nDn)):
             return _get_alternative_subgroups(
                 sg,
                 self.rot_axes[2],
-                lambda r, p: p in r.rot_axes[2],
-                lambda sg, p: sg(setup={"axis_n": self.rot_axes["n"], "axis_2": p}),
+                lambda r, p: p in r.group.rot_axes[2],
+                lambda sg, p: SubgroupDescriptor(sg, {"axis_n": self.rot_axes["n"], "axis_2": p}),
             )
         if isinstance(sg, MetaDnCn):
             return _get_alternative_subgroups(
                 sg,
                 self.rot_axes[2],
-                lambda r, p: p in r.refl_normals,
-                lambda sg, p: sg(setup={"axis_n": self.rot_axes["n"], "normal_r": p}),
+                lambda r, p: p in r.group.refl_normals,
+                lambda sg, p: SubgroupDescriptor(sg, {"axis_n": self.rot_axes["n"], "normal_r": p}),
             )
         if isinstance(sg, MetaC2nCn):
             if sg.n == 1:
-                return [sg(setup={"axis": r}) for r in self.refl_normals]
-            return [sg(setup={"axis": self.rot_axes["n"]})]
+                return [SubgroupDescriptor(sg, {"axis": r}) for r in self.refl_normals]
+            return [SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]})]
         if isinstance(sg, (MetaCn, MetaCnxI)):
             # standard realisation:
-            real_std = sg(setup={"axis": self.rot_axes["n"]})
+            real_std = SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]})
             if sg.n == 2:
                 # special realisation (note D1xI ~= C2xI or D1 ~= C2)
-                real_spc = [sg(setup={"axis": r}) for r in self.rot_axes[2]]
+                real_spc = [SubgroupDescriptor(sg, {"axis": r}) for r in self.rot_axes[2]]
                 if self.n % 2 != 0:
                     return real_spc
                 real_spc.insert(0, real_std)
@@ -1739,59 +2507,59 @@ class D2nDn(Set, metaclass=MetaD2nDn):
             self.subgroups = _d2ndn_get_subgroups(self.n)
             self.subgroups.insert(0, D2nD(self.n))
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if sg == ExI:
-            return [ExI()]
+            return [SubgroupDescriptor(ExI)]
         if sg == E:
-            return [E()]
+            return [SubgroupDescriptor(E)]
         if sg.n > self.n:
             return []
         if isinstance(sg, MetaD2nDn):
             if sg.n == self.n:
-                return [self]
+                return [SubgroupDescriptor.from_group(self)]
             return _get_alternative_subgroups(
                 sg,
                 self.rot_axes[2],
-                lambda r, p: p in r.rot_axes[2],
-                lambda sg, p: sg(setup={"axis_n": self.rot_axes["n"], "axis_2": p}),
+                lambda r, p: p in r.group.rot_axes[2],
+                lambda sg, p: SubgroupDescriptor(sg, {"axis_n": self.rot_axes["n"], "axis_2": p}),
             )
         if isinstance(sg, MetaDn):
             return _get_alternative_subgroups(
                 sg,
                 self.rot_axes[2],
-                lambda r, p: p in r.rot_axes[2],
-                lambda sg, p: sg(setup={"axis_n": self.rot_axes["n"], "axis_2": p}),
+                lambda r, p: p in r.group.rot_axes[2],
+                lambda sg, p: SubgroupDescriptor(sg, {"axis_n": self.rot_axes["n"], "axis_2": p}),
             )
         if isinstance(sg, MetaDnCn):
             if sg.n == 2 and self.n % 2 != 0:
                 return [
-                    sg(setup={"axis_n": h, "normal_r": self.rot_axes["n"]})
+                    SubgroupDescriptor(sg, {"axis_n": h, "normal_r": self.rot_axes["n"]})
                     for h in self.rot_axes[2]
                 ]
             return _get_alternative_subgroups(
                 sg,
                 self.refl_normals,
-                lambda r, p: p in r.refl_normals,
-                lambda sg, p: sg(setup={"axis_n": self.rot_axes["n"], "normal_r": p}),
+                lambda r, p: p in r.group.refl_normals,
+                lambda sg, p: SubgroupDescriptor(sg, {"axis_n": self.rot_axes["n"], "normal_r": p}),
             )
         if isinstance(sg, MetaC2nCn):
             if sg.n == 1:
-                sg_base = [sg(setup={"axis": r}) for r in self.refl_normals]
+                sg_base = [SubgroupDescriptor(sg, {"axis": r}) for r in self.refl_normals]
                 if self.n % 2 != 0:
-                    sg_base.insert(0, sg(setup={"axis": self.rot_axes["n"]}))
+                    sg_base.insert(0, SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]}))
                 return sg_base
-            return [sg(setup={"axis": self.rot_axes["n"]})]
+            return [SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]})]
         if isinstance(sg, MetaCn):
             if sg.n == 2:
-                sg_base = [sg(setup={"axis": h}) for h in self.rot_axes[2]]
+                sg_base = [SubgroupDescriptor(sg, {"axis": h}) for h in self.rot_axes[2]]
                 if self.n % 2 == 0:
-                    sg_base.insert(0, sg(setup={"axis": self.rot_axes["n"]}))
+                    sg_base.insert(0, SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]}))
                 return sg_base
-            return [sg(setup={"axis": self.rot_axes["n"]})]
+            return [SubgroupDescriptor(sg, {"axis": self.rot_axes["n"]})]
         # Note: no DnxI, CnxI subgroups exist, see _d2ndn_get_subgroups
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
@@ -1906,24 +2674,24 @@ class A4(Set):
                 3: [r1_1.axis(), r2_1.axis(), r3_1.axis(), r4_1.axis()],
             }
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if sg == A4:
-            return [self]
+            return [SubgroupDescriptor.from_group(self)]
         if sg == D2:
             o2a = self.rot_axes[2]
-            return [D2(setup={"axis_n": o2a[0], "axis_2": o2a[1]})]
+            return [SubgroupDescriptor(D2, {"axis_n": o2a[0], "axis_2": o2a[1]})]
         if sg == C2:
             o2a = self.rot_axes[2]
-            return [C2(setup={"axis": a}) for a in o2a]
+            return [SubgroupDescriptor(C2, {"axis": a}) for a in o2a]
         if sg == C3:
             o3a = self.rot_axes[3]
-            return [C3(setup={"axis": a}) for a in o3a]
+            return [SubgroupDescriptor(C3, {"axis": a}) for a in o3a]
         if sg == E:
-            return [E()]
+            return [SubgroupDescriptor(E)]
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
         )
@@ -2043,23 +2811,23 @@ class S4A4(Set):
                 3: [r1_1.axis(), r2_1.axis(), r3_1.axis(), r4_1.axis()],
             }
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         # S4A4, A4, D2nDn, DnCn, C2nCn, Dn, Cn
         # C3, C2, E
         if sg == S4A4:
-            return [self]
+            return [SubgroupDescriptor.from_group(self)]
         if sg == A4:
             o2a = self.rot_axes[2]
-            return [sg(setup={"o2axis0": o2a[0], "o2axis1": o2a[1]})]
+            return [SubgroupDescriptor(sg, {"o2axis0": o2a[0], "o2axis1": o2a[1]})]
         if sg == D4D2:
             o2a = self.rot_axes[2]
             l_o2a = len(o2a)
             return [
-                sg(setup={"axis_n": o2a[i], "axis_2": o2a[(i + 1) % l_o2a]})
+                SubgroupDescriptor(sg, {"axis_n": o2a[i], "axis_2": o2a[(i + 1) % l_o2a]})
                 for i in range(l_o2a)
             ]
         if sg == D3C3:
@@ -2067,20 +2835,20 @@ class S4A4(Set):
             for o3 in self.rot_axes[3]:
                 for rn in self.refl_normals:
                     if geomtypes.FloatHandler.eq(rn * o3, 0):
-                        isoms.append(sg(setup={"axis_n": o3, "normal_r": rn}))
+                        isoms.append(SubgroupDescriptor(sg, {"axis_n": o3, "normal_r": rn}))
                         break
             assert len(isoms) == 4, f"len(isoms) == {len(isoms)} != 4"
             return isoms
         if sg == C4C2:
-            return [C4C2(setup={"axis": a}) for a in self.rot_axes[2]]
+            return [SubgroupDescriptor(C4C2, {"axis": a}) for a in self.rot_axes[2]]
         if sg == C3:
-            return [sg(setup={"axis": a}) for a in self.rot_axes[3]]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in self.rot_axes[3]]
         if sg == C2:
-            return [sg(setup={"axis": a}) for a in self.rot_axes[2]]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in self.rot_axes[2]]
         if sg == C2C1:
-            return [sg(setup={"axis": normal}) for normal in self.refl_normals]
+            return [SubgroupDescriptor(sg, {"axis": normal}) for normal in self.refl_normals]
         if sg == E:
-            return [E()]
+            return [SubgroupDescriptor(E)]
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
         )
@@ -2127,57 +2895,54 @@ class A4xI(Set):
             Set.__init__(self, a4 * ExI())
             self.rot_axes = a4.rot_axes
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if sg == A4xI:
-            return [self]
+            return [SubgroupDescriptor.from_group(self)]
         if sg == A4:
             # other ways of orienting A4 into A4xI don't give anything new
             return [
-                A4(
-                    setup={
-                        "o2axis0": self.rot_axes[2][0],
-                        "o2axis1": self.rot_axes[2][1],
-                    }
+                SubgroupDescriptor(
+                    A4, {"o2axis0": self.rot_axes[2][0], "o2axis1": self.rot_axes[2][1]}
                 )
             ]
         if sg == D2xI:
             o2a = self.rot_axes[2]
-            return [sg(setup={"axis_n": o2a[0], "axis_2": o2a[1]})]
+            return [SubgroupDescriptor(sg, {"axis_n": o2a[0], "axis_2": o2a[1]})]
         if sg == C3xI:
             o3a = self.rot_axes[3]
-            return [sg(setup={"axis": a}) for a in o3a]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in o3a]
         if sg == D2:
             o2a = self.rot_axes[2]
-            return [sg(setup={"axis_n": o2a[0], "axis_2": o2a[1]})]
+            return [SubgroupDescriptor(sg, {"axis_n": o2a[0], "axis_2": o2a[1]})]
         if sg == D2C2:
             isoms = []
             for o2 in self.rot_axes[2]:
                 for rn in self.rot_axes[2]:
                     if geomtypes.FloatHandler.eq(rn * o2, 0):
-                        isoms.append(sg(setup={"axis_n": o2, "normal_r": rn}))
+                        isoms.append(SubgroupDescriptor(sg, {"axis_n": o2, "normal_r": rn}))
                         break
             assert len(isoms) == 3, f"len(isoms) == {len(isoms)} != 3"
             return isoms
         if sg == C2xI:
             o2a = self.rot_axes[2]
-            return [sg(setup={"axis": a}) for a in o2a]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in o2a]
         if sg == C3:
             o3a = self.rot_axes[3]
-            return [sg(setup={"axis": a}) for a in o3a]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in o3a]
         if sg == C2:
             o2a = self.rot_axes[2]
-            return [sg(setup={"axis": a}) for a in o2a]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in o2a]
         if sg == C2C1:
             o2a = self.rot_axes[2]
-            return [sg(setup={"axis": a}) for a in o2a]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in o2a]
         if sg == ExI:
-            return [sg()]
+            return [SubgroupDescriptor(sg)]
         if sg == E:
-            return [sg()]
+            return [SubgroupDescriptor(sg)]
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
         )
@@ -2301,28 +3066,25 @@ class S4(Set):
                 4: [ax0, ax1, ax2],
             }
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if sg == S4:
-            return [self]
+            return [SubgroupDescriptor.from_group(self)]
         if sg == A4:
             # other ways of orienting A4 into S4 don't give anything new
             return [
-                A4(
-                    setup={
-                        "o2axis0": self.rot_axes[4][0],
-                        "o2axis1": self.rot_axes[4][1],
-                    }
+                SubgroupDescriptor(
+                    A4, {"o2axis0": self.rot_axes[4][0], "o2axis1": self.rot_axes[4][1]}
                 )
             ]
         if sg == D4:
             o4a = self.rot_axes[4]
             l_o4a = len(o4a)
             return [
-                sg(setup={"axis_n": o4a[i], "axis_2": o4a[(i + 1) % l_o4a]})
+                SubgroupDescriptor(sg, {"axis_n": o4a[i], "axis_2": o4a[(i + 1) % l_o4a]})
                 for i in range(l_o4a)
             ]
         if sg == D3:
@@ -2330,7 +3092,7 @@ class S4(Set):
             for o3 in self.rot_axes[3]:
                 for o2 in self.rot_axes[2]:
                     if geomtypes.FloatHandler.eq(o2 * o3, 0):
-                        isoms.append(sg(setup={"axis_n": o3, "axis_2": o2}))
+                        isoms.append(SubgroupDescriptor(sg, {"axis_n": o3, "axis_2": o2}))
                         break
             assert len(isoms) == 4, f"len(isoms) == {len(isoms)} != 4"
             return isoms
@@ -2340,28 +3102,28 @@ class S4(Set):
             # 1. one consisting of the three 4-fold axes
             # 2. 3 consisting of a 4 fold axis and two 2-fold axes.
             o4a = self.rot_axes[4]
-            isoms = [sg(setup={"axis_n": o4a[0], "axis_2": o4a[1]})]
+            isoms = [SubgroupDescriptor(sg, {"axis_n": o4a[0], "axis_2": o4a[1]})]
             for o4 in self.rot_axes[4]:
                 for o2 in self.rot_axes[2]:
                     if geomtypes.FloatHandler.eq(o2 * o4, 0):
-                        isoms.append(sg(setup={"axis_n": o4, "axis_2": o2}))
+                        isoms.append(SubgroupDescriptor(sg, {"axis_n": o4, "axis_2": o2}))
                         break
             assert len(isoms) == 4, f"len(isoms) == {len(isoms)} != 4"
             return isoms
         if sg == C4:
             o4a = self.rot_axes[4]
-            return [sg(setup={"axis": a}) for a in o4a]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in o4a]
         if sg == C3:
             o3a = self.rot_axes[3]
-            return [sg(setup={"axis": a}) for a in o3a]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in o3a]
         if sg == C2:
             o4a = self.rot_axes[4]
-            isoms = [sg(setup={"axis": a}) for a in o4a]
+            isoms = [SubgroupDescriptor(sg, {"axis": a}) for a in o4a]
             o2a = self.rot_axes[2]
-            isoms.extend([sg(setup={"axis": a}) for a in o2a])
+            isoms.extend([SubgroupDescriptor(sg, {"axis": a}) for a in o2a])
             return isoms
         if sg == E:
-            return [E()]
+            return [SubgroupDescriptor(E)]
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
         )
@@ -2416,37 +3178,31 @@ class S4xI(Set):
             Set.__init__(self, s4 * ExI())
             self.rot_axes = s4.rot_axes
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if sg == S4xI:
-            return [self]
+            return [SubgroupDescriptor.from_group(self)]
         if sg == S4:
             # other ways of orienting S4 into S4xI don't give anything new
             return [
-                sg(
-                    setup={
-                        "o4axis0": self.rot_axes[4][0],
-                        "o4axis1": self.rot_axes[4][1],
-                    }
+                SubgroupDescriptor(
+                    sg, {"o4axis0": self.rot_axes[4][0], "o4axis1": self.rot_axes[4][1]}
                 )
             ]
         if sg in (A4xI, A4, S4A4):
             return [
-                sg(
-                    setup={
-                        "o2axis0": self.rot_axes[4][0],
-                        "o2axis1": self.rot_axes[4][1],
-                    }
+                SubgroupDescriptor(
+                    sg, {"o2axis0": self.rot_axes[4][0], "o2axis1": self.rot_axes[4][1]}
                 )
             ]
         if sg in (D4xI, D8D4, D4):
             o4a = self.rot_axes[4]
             l_o4a = len(o4a)
             return [
-                sg(setup={"axis_n": o4a[i], "axis_2": o4a[(i + 1) % l_o4a]})
+                SubgroupDescriptor(sg, {"axis_n": o4a[i], "axis_2": o4a[(i + 1) % l_o4a]})
                 for i in range(l_o4a)
             ]
         if sg in (D3xI, D3):
@@ -2454,7 +3210,7 @@ class S4xI(Set):
             for o3 in self.rot_axes[3]:
                 for o2 in self.rot_axes[2]:
                     if geomtypes.FloatHandler.eq(o2 * o3, 0):
-                        isoms.append(sg(setup={"axis_n": o3, "axis_2": o2}))
+                        isoms.append(SubgroupDescriptor(sg, {"axis_n": o3, "axis_2": o2}))
                         break
             assert len(isoms) == 4, f"len(isoms) == {len(isoms)} != 4"
             return isoms
@@ -2463,31 +3219,31 @@ class S4xI(Set):
             for a4 in self.rot_axes[4]:
                 for rn in self.rot_axes[2]:
                     if geomtypes.FloatHandler.eq(rn * a4, 0):
-                        isoms.append(sg(setup={"axis_n": a4, "normal_r": rn}))
+                        isoms.append(SubgroupDescriptor(sg, {"axis_n": a4, "normal_r": rn}))
                         break
             return isoms
         if sg == D4D2:
             o4a = self.rot_axes[4]
             l_o4a = len(o4a)
             isoms = [
-                sg(setup={"axis_n": o4a[i], "axis_2": o4a[(i + 1) % l_o4a]})
+                SubgroupDescriptor(sg, {"axis_n": o4a[i], "axis_2": o4a[(i + 1) % l_o4a]})
                 for i in range(l_o4a)
             ]
             o2a = self.rot_axes[2]
             for a4 in o4a:
                 for a2 in o2a:
                     if geomtypes.FloatHandler.eq(a2 * a4, 0):
-                        isoms.append(sg(setup={"axis_n": a4, "axis_2": a2}))
+                        isoms.append(SubgroupDescriptor(sg, {"axis_n": a4, "axis_2": a2}))
                         break
             return isoms
         if sg in (D2xI, D2):
             o4a = self.rot_axes[4]
-            isoms = [sg(setup={"axis_n": o4a[0], "axis_2": o4a[1]})]
+            isoms = [SubgroupDescriptor(sg, {"axis_n": o4a[0], "axis_2": o4a[1]})]
             o2a = self.rot_axes[2]
             for a4 in o4a:
                 for a2 in o2a:
                     if geomtypes.FloatHandler.eq(a2 * a4, 0):
-                        isoms.append(sg(setup={"axis_n": a4, "axis_2": a2}))
+                        isoms.append(SubgroupDescriptor(sg, {"axis_n": a4, "axis_2": a2}))
                         break
             assert len(isoms) == 4, f"len(isoms) == {len(isoms)} != 4"
             return isoms
@@ -2496,46 +3252,45 @@ class S4xI(Set):
             for o3 in self.rot_axes[3]:
                 for rn in self.rot_axes[2]:
                     if geomtypes.FloatHandler.eq(rn * o3, 0):
-                        isoms.append(sg(setup={"axis_n": o3, "normal_r": rn}))
+                        isoms.append(SubgroupDescriptor(sg, {"axis_n": o3, "normal_r": rn}))
                         break
             assert len(isoms) == 4, f"len(isoms) == {len(isoms)} != 4"
             return isoms
         if sg in (C3xI, C3):
             o3a = self.rot_axes[3]
-            return [sg(setup={"axis": a}) for a in o3a]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in o3a]
         if sg == D2C2:
             o4a = self.rot_axes[4]
             l_o4a = len(o4a)
             isoms = [
-                sg(setup={"axis_n": o4a[i], "normal_r": o4a[(i + 1) % l_o4a]})
+                SubgroupDescriptor(sg, {"axis_n": o4a[i], "normal_r": o4a[(i + 1) % l_o4a]})
                 for i in range(l_o4a)
             ]
             o2a = self.rot_axes[2]
             for a4 in o4a:
                 for a2 in o2a:
                     if geomtypes.FloatHandler.eq(a2 * a4, 0):
-                        isoms.append(sg(setup={"axis_n": a4, "normal_r": a2}))
+                        isoms.append(SubgroupDescriptor(sg, {"axis_n": a4, "normal_r": a2}))
                         break
             for o2 in self.rot_axes[2]:
                 for rn in self.rot_axes[4]:
                     if geomtypes.FloatHandler.eq(rn * o2, 0):
-                        isoms.append(sg(setup={"axis_n": o2, "normal_r": rn}))
+                        isoms.append(SubgroupDescriptor(sg, {"axis_n": o2, "normal_r": rn}))
                         break
             assert len(isoms) == 12, f"len(isoms) == {len(isoms)} != 12"
             return isoms
         if sg in (C4xI, C4, C4C2):
             o4a = self.rot_axes[4]
-            return [sg(setup={"axis": a}) for a in o4a]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in o4a]
         if sg in (C2xI, D1xI, C2, D1):
-            o2a = self.rot_axes[4]
-            o2a.extend(self.rot_axes[2])
-            return [sg(setup={"axis": a}) for a in o2a]
+            o2a = self.rot_axes[4] + self.rot_axes[2]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in o2a]
         if sg == C2C1:
-            isoms = [sg(setup={"axis": a}) for a in self.rot_axes[2]]
-            isoms.extend([sg(setup={"axis": a}) for a in self.rot_axes[4]])
+            isoms = [SubgroupDescriptor(sg, {"axis": a}) for a in self.rot_axes[2]]
+            isoms.extend([SubgroupDescriptor(sg, {"axis": a}) for a in self.rot_axes[4]])
             return isoms
         if sg in (E, ExI):
-            return [sg()]
+            return [SubgroupDescriptor(sg)]
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
         )
@@ -2738,29 +3493,29 @@ class A5(Set):
             ]
         return self._sub_d2_setup
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if sg == A5:
-            return [self]
+            return [SubgroupDescriptor.from_group(self)]
         if sg == A4:
-            return [sg(setup=setup) for setup in self.sub_a4_setup]
+            return [SubgroupDescriptor(sg, setup) for setup in self.sub_a4_setup]
         if sg == D5:
-            return [sg(setup=setup) for setup in self.sub_d5_setup]
+            return [SubgroupDescriptor(sg, setup) for setup in self.sub_d5_setup]
         if sg == D3:
-            return [sg(setup=setup) for setup in self.sub_d3_setup]
+            return [SubgroupDescriptor(sg, setup) for setup in self.sub_d3_setup]
         if sg == D2:
-            return [sg(setup=setup) for setup in self.sub_d2_setup]
+            return [SubgroupDescriptor(sg, setup) for setup in self.sub_d2_setup]
         if sg == C5:
-            return [sg(setup={"axis": a}) for a in self.rot_axes[5]]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in self.rot_axes[5]]
         if sg == C3:
-            return [sg(setup={"axis": a}) for a in self.rot_axes[3]]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in self.rot_axes[3]]
         if sg == C2:
-            return [sg(setup={"axis": a}) for a in self.rot_axes[2]]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in self.rot_axes[2]]
         if sg == E:
-            return [sg()]
+            return [SubgroupDescriptor(sg)]
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
         )
@@ -2892,40 +3647,42 @@ class A5xI(Set):
             ]
         return self._sub_d2c2_setup
 
-    def realise_subgroups(self, sg):
+    def _describe_subgroups(self, sg):
         """
-        realise an array of possible oriented subgroups for non-oriented sg
+        Return descriptors of the possible oriented subgroups for non-oriented sg
         """
         assert isinstance(sg, type)
         if sg == A5xI:
-            return [self]
+            return [SubgroupDescriptor.from_group(self)]
         if sg == A5:
             # other ways of orienting A5 into A5xI don't give anything new
             return [
-                sg(setup={"o3axis": self.rot_axes[3][0], "o5axis": self.rot_axes[5][0]})
+                SubgroupDescriptor(
+                    sg, {"o3axis": self.rot_axes[3][0], "o5axis": self.rot_axes[5][0]}
+                )
             ]
         if sg in (A4xI, A4):
-            return [sg(setup=setup) for setup in self.sub_a4_setup]
+            return [SubgroupDescriptor(sg, setup) for setup in self.sub_a4_setup]
         if sg in (D5xI, D5):
-            return [sg(setup=setup) for setup in self.sub_d5_setup]
+            return [SubgroupDescriptor(sg, setup) for setup in self.sub_d5_setup]
         if sg == D5C5:
-            return [sg(setup=setup) for setup in self.sub_d5c5_setup]
+            return [SubgroupDescriptor(sg, setup) for setup in self.sub_d5c5_setup]
         if sg in (D3xI, D3):
-            return [sg(setup=setup) for setup in self.sub_d3_setup]
+            return [SubgroupDescriptor(sg, setup) for setup in self.sub_d3_setup]
         if sg == D3C3:
-            return [sg(setup=setup) for setup in self.sub_d3c3_setup]
+            return [SubgroupDescriptor(sg, setup) for setup in self.sub_d3c3_setup]
         if sg in (D2xI, D2):
-            return [sg(setup=setup) for setup in self.sub_d2_setup]
+            return [SubgroupDescriptor(sg, setup) for setup in self.sub_d2_setup]
         if sg == D2C2:
-            return [sg(setup=setup) for setup in self.sub_d2c2_setup]
+            return [SubgroupDescriptor(sg, setup) for setup in self.sub_d2c2_setup]
         if sg in (C5xI, C5):
-            return [sg(setup={"axis": a}) for a in self.rot_axes[5]]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in self.rot_axes[5]]
         if sg in (C3xI, C3):
-            return [sg(setup={"axis": a}) for a in self.rot_axes[3]]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in self.rot_axes[3]]
         if sg in (C2xI, C2, C2C1, D1xI, D1):
-            return [sg(setup={"axis": a}) for a in self.rot_axes[2]]
+            return [SubgroupDescriptor(sg, {"axis": a}) for a in self.rot_axes[2]]
         if sg in (E, ExI):
-            return [sg()]
+            return [SubgroupDescriptor(sg)]
         raise ImproperSubgroupError(
             f"{sg.__class__.__name__} not subgroup of {self.__class__.__name__}"
         )
@@ -24,16 +24,150 @@
 # Old sins:
 # pylint: disable=too-many-positional-arguments
 
+import atexit
+import io
+import json
 import logging
+import os
+from pathlib import Path
+import tempfile
 
 from orbitit import base as orbit_base
 from orbitit import colors, geom_3d, geomtypes, isometry
 
+# Increase this when the format of the cache file changes or when the calculation of the higher
+# order stabilisers changes
+HOSP_CACHE_VERSION = 2
+
+# The symmetry groups for which the cache of higher order stabilisers can be prepared:
+STD_FINAL_SYMS = [
+    isometry.A4,
+    isometry.S4A4,
+    isometry.A4xI,
+    isometry.S4,
+    isometry.S4xI,
+    isometry.A5,
+    isometry.A5xI,
+]
+
 
 class ColourDivideError(Exception):
     """Raise specific error when failing to divide colours using a certain symmetry."""
 
 
+class HospCache:
+    """A cache on disk for the higher order stabilisers of orbits.
+
+    The higher order stabilisers only depend on the final symmetry and the stabiliser, including
+    their orientations. These are saved in a JSON file, so that they don't need to be calculated
+    again in a next session. The file contains a version and if this doesn't match
+    HOSP_CACHE_VERSION the content is ignored.
+
+    New entries are saved in one go when the program exits or when save is called.
+    """
+
+    def __init__(self, path, enabled=True):
+        """Initialise the cache
+
+        path: the path of the JSON file to use
+        enabled: set to False to stop using the cache
+        """
+        self.path = Path(path)
+        self.enabled = enabled
+        # Set to False to only save the cache on an explicit call to save
+        self.autosave = True
+        self._entries = None
+        self._changed = False
+        self._save_at_exit = False
+
+    @staticmethod
+    def key(final, stabiliser):
+        """Return the key in the cache for the orbit final / stabiliser"""
+        return f"{final.json_str} / {stabiliser.json_str}"
+
+    def _load(self):
+        """Read the cache from file"""
+        self._entries = {}
+        try:
+            with open(self.path) as fd:
+                data = json.load(fd)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning("Ignoring cache file %s: %s", self.path, e)
+            return
+        if data.get("version") != HOSP_CACHE_VERSION:
+            logging.info("Ignoring cache file %s with a different version", self.path)
+            return
+        self._entries = data["entries"]
+
+    def get(self, final, stabiliser):
+        """Return the cached data for the orbit final / stabiliser or None if it isn't available"""
+        if not self.enabled:
+            return None
+        if self._entries is None:
+            self._load()
+        return self._entries.get(self.key(final, stabiliser))
+
+    def put(self, final, stabiliser, data):
+        """Save the data for the orbit final / stabiliser in the cache"""
+        if not self.enabled:
+            return
+        if self._entries is None:
+            self._load()
+        self._entries[self.key(final, stabiliser)] = data
+        self._changed = True
+        if self.autosave and not self._save_at_exit:
+            atexit.register(self.save)
+            self._save_at_exit = True
+
+    def save(self):
+        """Write the new entries of the cache to file
+
+        Entries that were saved by another process in the mean time are kept. The file is written
+        under another name first and then replaced, so it is never read while half written.
+        """
+        if not self._changed:
+            return
+        entries = self._entries
+        self._load()
+        self._entries.update(entries)
+        tmp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.path.parent, prefix=f".{self.path.name}.", delete=False
+            ) as fd:
+                tmp_path = fd.name
+                json.dump({"version": HOSP_CACHE_VERSION, "entries": self._entries}, fd)
+            os.replace(tmp_path, self.path)
+            tmp_path = None
+        except OSError as e:
+            logging.warning("Couldn't save cache file %s: %s", self.path, e)
+        else:
+            self._changed = False
+        finally:
+            if tmp_path is not None:
+                os.unlink(tmp_path)
+
+    def invalidate(self):
+        """Remove all cached data, including the cache file"""
+        self._entries = {}
+        self._changed = False
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+# Save the cache next to the models of the user. By default in the home directory. It is enabled by
+# the orbitit program, so that using this module doesn't write any files.
+hosp_cache = HospCache(
+    Path(os.environ.get("ORBITIT_LIB", Path.home() / ".orbitit")) / "orbit_cache.json",
+    enabled=False,
+)
+
+
 class Orbit(list):  # pylint: disable=too-many-instance-attributes
     """A class for handling algebraic orbits."""
 
@@ -46,6 +180,9 @@ class Orbit(list):  # pylint: disable=too-many-instance-attributes
     def __init__(self, v):
         super().__init__(v)
         self.final = v[0]
+        # Number the isometries of the final symmetry, then the subgroup checks and the coset
+        # decompositions of the final symmetry are done by look-ups and bitmasks
+        self.final.compile()
         self.stabiliser = v[1]
         self.higher_order_stabs = None
         self.__hosp_called = False
@@ -96,9 +233,16 @@ class Orbit(list):  # pylint: disable=too-many-instance-attributes
 
     def __hosp(self):
         """See higher_order_stab_props"""
+        cached = hosp_cache.get(self.final, self.stabiliser)
+        if cached is not None:
+            try:
+                return self.__hosp_from_cache(cached)
+            except (KeyError, TypeError, ValueError, AssertionError) as e:
+                logging.warning("Ignoring cached higher order stabilisers: %s", e)
         higher_order_stab_props = []
         self.higher_order_stabs = []
         self.index_covered = {}
+        self.stabiliser.bitmask(self.final.compile())
         for sub_group in self.final.subgroups:
             assert sub_group.order != 0, f"{sub_group} ({sub_group.__class__.__name__})"
             if self.stabiliser.__class__ in sub_group.subgroups:
@@ -113,10 +257,11 @@ class Orbit(list):  # pylint: disable=too-many-instance-attributes
                 # However the D2C2 that is a subgroup of the A4xI subgroup of
                 # S4xI has a principle axis that is a 4-fold axis of S4xI.
 
-                higher_order_stabs = self.final.realise_subgroups(sub_group)
+                # Use descriptors, only the subgroups that are checked are created
+                higher_order_stabs = list(self.final.iter_subgroups(sub_group))
                 # from end to beginning, because elements will be filtered out:
                 for i in range(len(higher_order_stabs)-1, -1, -1):
-                    if self.stabiliser.is_subgroup(higher_order_stabs[i]):
+                    if self.stabiliser.is_subgroup(higher_order_stabs[i].group):
                         break
                     # remove this from the list, this is part of the work
                     # of filtering the list. This is not done completely
@@ -143,8 +288,46 @@ class Orbit(list):  # pylint: disable=too-many-instance-attributes
                     self.index_covered[order] = True
                 # else filter out, since no real subgroup
             # else: this subgroup of G doesn't have the stabiliser as subgroup
+        self.__hosp_to_cache(higher_order_stab_props)
+        return higher_order_stab_props
+
+    def __hosp_from_cache(self, cached):
+        """Set the higher order stabilisers from the data in the cache and return the properties"""
+        higher_order_stab_props = [
+            {
+                'class': isometry.Set.from_json_class_name(props['class']),
+                'order': props['order'],
+                'filtered': props['filtered'],
+            }
+            for props in cached['props']
+        ]
+        self.higher_order_stabs = [
+            [isometry.SubgroupDescriptor.from_json_dict(stab) for stab in stabs]
+            for stabs in cached['stabs']
+        ]
+        self.index_covered = {props['order']: True for props in higher_order_stab_props}
         return higher_order_stab_props
 
+    def __hosp_to_cache(self, higher_order_stab_props):
+        """Save the higher order stabilisers in the cache"""
+        hosp_cache.put(
+            self.final,
+            self.stabiliser,
+            {
+                'props': [
+                    {
+                        'class': orbit_base.class_to_json[props['class']],
+                        'order': props['order'],
+                        'filtered': props['filtered'],
+                    }
+                    for props in higher_order_stab_props
+                ],
+                'stabs': [
+                    [stab.repr_dict for stab in stabs] for stabs in self.higher_order_stabs
+                ],
+            }
+        )
+
     def higher_order_stab(self, n):
         """Get possible higher order stabilisers with index 'n'
 
@@ -176,13 +359,33 @@ class Orbit(list):  # pylint: disable=too-many-instance-attributes
             # but not necessarily this orientation. In fact only one of the
             # three possible D4xI will have this D2C2 as subgroup.
             for i in range(props[n]['filtered']-1, -1, -1):
-                if not self.stabiliser.is_subgroup(self.higher_order_stabs[n][i]):
+                if not self.stabiliser.is_subgroup(self.higher_order_stabs[n][i].group):
                     del self.higher_order_stabs[n][i]
             assert len(self.higher_order_stabs[n]) != 0, (
                 "This case should have been checked in __hosp"
             )
             props[n]['filtered'] = 0
-        return self.higher_order_stabs[n]
+            self.__hosp_to_cache(props)
+        return [stab.group for stab in self.higher_order_stabs[n]]
+
+
+def warm_hosp_cache(final_syms=None):
+    """Calculate and cache the higher order stabilisers for all stabilisers of the final symmetries
+
+    final_syms: a list of symmetry classes to use as final symmetry. By default STD_FINAL_SYMS.
+    """
+    if final_syms is None:
+        final_syms = STD_FINAL_SYMS
+    try:
+        for final_sym in final_syms:
+            final = final_sym()
+            for sub_group in final.subgroups:
+                for stabiliser in final.iter_subgroups(sub_group):
+                    orbit = Orbit((final, stabiliser.group))
+                    for i in range(len(orbit.higher_order_stab_props)):
+                        orbit.higher_order_stab(i)
+    finally:
+        hosp_cache.save()
 
 
 class Shape(geom_3d.OrbitShape):  # pylint: disable=too-many-instance-attributes
@@ -314,13 +517,10 @@ class Shape(geom_3d.OrbitShape):  # pylint: disable=too-many-instance-attributes
                 self.total_no_of_col_alt - 1,
             )
             col_alt = self.total_no_of_col_alt - 1
-        col_quotient_set = self.orbit.final / col_syms[col_alt]
-        self.col_per_isom = []
-        for isom in self.isoms:
-            for i, sub_set in enumerate(col_quotient_set):
-                if isom in sub_set:
-                    self.col_per_isom.append(self.orbit_cols[i])
-                    break
+        col_cosets = self.orbit.final.coset_decomposition(col_syms[col_alt])
+        # isometries outside the final symmetry don't get a colour
+        labels = [col_cosets.label(isom) for isom in self.isoms]
+        self.col_per_isom = [self.orbit_cols[label] for label in labels if label is not None]
         # update with correct format
         self.col_alt = col_alt
         self.shape_colors = self.col_per_isom.copy()
@@ -331,7 +531,7 @@ class Shape(geom_3d.OrbitShape):  # pylint: disable=too-many-instance-attributes
         trans: a geomtypes.quat object (or matrix) for left multiplying all
                vertices.
         """
-        self.base_vs = [trans * v for v in self.base_vs]
+        self.base_vs = trans.apply_many(self.base_vs)
 
     def set_rot_axis(self, axis, domain=None):
         """Set the rotation axis for rotating the descriptive.
@@ -356,10 +556,17 @@ class Shape(geom_3d.OrbitShape):  # pylint: disable=too-many-instance-attributes
 
     def to_off(self, precision=geomtypes.FLOAT_OUT_PRECISION, info=False, color_floats=False):
         """Return to off-format representation."""
-        s = self.simple_shape.to_off(precision, info, color_floats)
-        s += f"# Color alternative based on {self.same_col_isom}\n".format(self.same_col_isom)
-        s += f"# Used colour alternative {self.col_alt} (max {self.total_no_of_col_alt - 1})"
-        return s
+        fd = io.StringIO()
+        self.write_off(fd, precision, info, color_floats)
+        return fd.getvalue()
+
+    def write_off(
+        self, fd, precision=geomtypes.FLOAT_OUT_PRECISION, info=False, color_floats=False
+    ):
+        """Write the off-format representation to the file object fd."""
+        self.simple_shape.write_off(fd, precision, info, color_floats)
+        fd.write(f"# Color alternative based on {self.same_col_isom}\n")
+        fd.write(f"# Used colour alternative {self.col_alt} (max {self.total_no_of_col_alt - 1})")
 
     def to_js(self, name=""):
         """Return javascript representation so it can be shown with the showoff library."""
@@ -402,6 +609,23 @@ class Shape(geom_3d.OrbitShape):  # pylint: disable=too-many-instance-attributes
         """Representation of the object."""
         return f"{self.__class__.__name__}.from_dict_data({self.repr_dict['data']})"
 
+    def write_repr(self, writer, suffix=""):
+        """Write the representation of the object to an indent.Writer."""
+        writer.add_block(repr(self) + suffix)
+
+    @property
+    def repr_data(self):
+        """Return the data that is used by __repr__, see geom_3d.save_data_file."""
+        return {
+            "class": orbit_base.class_to_json[self.json_class],
+            "kwargs": {"data": self.repr_dict["data"]},
+        }
+
+    @classmethod
+    def from_repr_data(cls, kwargs):
+        """Create object from the keyword arguments created by repr_data."""
+        return cls.from_dict_data(kwargs["data"])
+
     def col_syms_for_index(self, i):
         """Return possible colour symmetries for the requested index."""
         return self.orbit.higher_order_stab(i)
@@ -430,7 +654,7 @@ class Shape(geom_3d.OrbitShape):  # pylint: disable=too-many-instance-attributes
                 "version": 2,
                 "name": self.name,
                 "base": {
-                    "vs": self.base_shape.vs,
+                    "vs": list(self.base_shape.vs),
                     "fs": self.base_shape.fs,
                 },
                 "final_sym": self.final_sym.repr_dict,
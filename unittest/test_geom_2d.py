@@ -417,5 +417,35 @@ class TestPolygon(unittest.TestCase):
             expected = [(geomtypes.Vec(c0), geomtypes.Vec(c1)) for c0, c1 in expected]
             self.assertEqual(result, expected, f"Test case {test_case} failed")
 
+    def test_even_odd_triangles(self):
+        """Test dividing a polygon into triangles according to the even-odd rule."""
+        pentagon = [
+            [math.cos(2 * math.pi * i / 5), math.sin(2 * math.pi * i / 5)] for i in range(5)
+        ]
+        test_matrix = {  # test case: coords, vs, expected signed area
+            "square": ([[0, 0], [1, 0], [1, 1], [0, 1]], [0, 1, 2, 3], -1),
+            "square clockwise": ([[0, 0], [1, 0], [1, 1], [0, 1]], [3, 2, 1, 0], 1),
+            "concave": ([[0, 0], [2, 0], [2, 2], [1, 1], [0, 2]], [0, 1, 2, 3, 4], -3),
+            "pentagon": (pentagon, [0, 1, 2, 3, 4], -2.5 * math.sin(2 * math.pi / 5)),
+            # the pentagon in the middle is covered twice
+            "pentagram": (pentagon, [0, 2, 4, 1, 3], -0.7756767521667438),
+            # the orientation of the halves differ, the triangles are clockwise then
+            "bow tie": ([[0, 0], [2, 2], [2, 0], [0, 2]], [0, 1, 2, 3], -2),
+            "flat": ([[0, 0], [1, 0], [2, 0]], [0, 1, 2], 0),
+        }
+        for test_case, (coords, vs, expected) in test_matrix.items():
+            result, triangles = geom_2d.Polygon(coords, vs).even_odd_triangles()
+            self.assertEqual(len(triangles) % 3, 0, f"Test case {test_case} failed")
+            area = 0
+            for i in range(0, len(triangles), 3):
+                v0, v1, v2 = (geomtypes.Vec(result[j]) for j in triangles[i : i + 3])
+                v1, v2 = v1 - v0, v2 - v0
+                signed_area = (v1[0] * v2[1] - v2[0] * v1[1]) / 2
+                if expected:
+                    # All triangles have the same orientation
+                    self.assertTrue(signed_area * expected > 0, f"Test case {test_case} failed")
+                area += signed_area
+            self.assertAlmostEqual(area, expected, msg=f"Test case {test_case} failed")
+
 if __name__ == '__main__':
     unittest.main()
@@ -24,11 +24,17 @@
 # Since these tests are quite straight forward tests, and thers is no gain to
 # split the methods and the file other than to shut up pylint:
 # pylint: disable=too-many-lines,too-many-statements,too-many-locals,too-many-branches
+import io
+import json
 import math
 from os import path
+import random
+import tempfile
 import unittest
 
-from orbitit import geom_3d, geomtypes, isometry, orbit, rgb
+import numpy as np
+
+from orbitit import geom_3d, geomtypes, glue, isometry, orbit, rgb, Scenes3D
 
 RED = (0.8, 0.1, 0.1)
 YELLOW = (0.8, 0.8, 0.3)
@@ -926,6 +932,499 @@ class TestSimpleShape(unittest.TestCase):
                     f"test case '{test_case}' failed for check_proper_edges.",
                 )
 
+    def test_topology(self):
+        """Test the edges, and neighbours of faces and vertices."""
+        shape = get_cube()
+        topology = shape.topology
+        self.assertEqual(len(topology.edges), 12)
+        for edge, shared_with in topology.edges.items():
+            self.assertEqual(len(shared_with), 2, f"edge {edge}")
+            self.assertEqual(sorted(o for _, _, o in shared_with), [-1, 1], f"edge {edge}")
+            for face_i, e_i, orientation in shared_with:
+                face = shape.fs[face_i]
+                v_i, v_j = face[e_i], face[(e_i + 1) % len(face)]
+                self.assertEqual(edge, (v_i, v_j)[::orientation], f"edge {edge}")
+        self.assertEqual(topology.edges[(0, 1)], [(0, 0, 1), (2, 0, -1)])
+        self.assertEqual(topology.vertex_faces[0], [0, 1, 2])
+        self.assertNotIn(8, topology.vertex_faces)
+        self.assertEqual(topology.face_neighbours[0], [1, 2, 3, 4])
+        self.assertEqual(topology.face_neighbours[5], [1, 2, 3, 4])
+        # pylint: disable=protected-access
+        dihedral_angles = shape._get_dihedral_angles()
+        self.assertEqual(list(dihedral_angles.keys()), [round(math.pi / 2, 12)])
+        self.assertEqual(sorted(dihedral_angles[round(math.pi / 2, 12)]), sorted(topology.edges))
+        shape.face_props = {"fs": [[0, 1, 2, 3]]}
+        self.assertEqual(list(shape.topology.edges), [(0, 1), (1, 2), (2, 3), (0, 3)])
+
+    def test_metrics(self):
+        """Test the metrics of an octahedron."""
+        shape = get_octahedron()
+        shape.regen_edges()
+        metrics = shape.metrics()
+        self.assertEqual(metrics["vertices"], 6)
+        self.assertEqual(metrics["edges"], 12)
+        self.assertEqual(metrics["faces"], 8)
+        self.assertEqual(metrics["circumscribed"], {2.0: 6})
+        self.assertEqual(metrics["mid"], {round(math.sqrt(2), 12): 12})
+        self.assertEqual(metrics["inscribed"], {round(2 / math.sqrt(3), 12): 8})
+        self.assertEqual(list(metrics["edge_lengths"]), [round(2 * math.sqrt(2), 12)])
+        self.assertEqual(
+            sorted(metrics["edge_lengths"][round(2 * math.sqrt(2), 12)]),
+            sorted(shape.topology.edges),
+        )
+        self.assertEqual(list(metrics["dihedral_angles"]), [round(math.acos(-1 / 3), 12)])
+        self.assertEqual(len(metrics["dihedral_angles"][round(math.acos(-1 / 3), 12)]), 12)
+        off = shape.to_off(info=True)
+        self.assertIn("# Length: 2.828427124746 for 12 edges", off)
+        self.assertIn("# circumscribed sphere(s): {2.0: 6}", off)
+
+    def test_vertex_normals(self):
+        """Test that vertex normals are updated when vertices, faces or edges change."""
+        shape = get_tetrahedron()
+        shape.regen_edges()
+        shape.create_vertex_normals(True)
+        triangles = shape.triangulated_faces_n_index
+        self.assertEqual(len(shape.vertex_per_normal), 4 * 3 + 4)
+        self.assertEqual(shape.vertex_per_normal[3], shape.vs[0])
+        self.assertEqual(shape.normal_per_vertex[0], shape.face_normals[0])
+        self.assertEqual(shape.normal_per_vertex[3], shape.face_normals[1])
+        self.assertEqual(shape.normal_per_vertex[-1], shape.vs[-1].normalise())
+        self.assertEqual(shape.edges_n_index[:2], [12, 13])
+
+        # moving the vertices only updates the normals
+        shape.vertex_props = {"vs": [2 * v for v in shape.vs]}
+        shape.create_vertex_normals(False)
+        self.assertIs(shape.triangulated_faces_n_index, triangles)
+        self.assertEqual(shape.vertex_per_normal[3], 2 * get_tetrahedron().vs[0])
+        self.assertEqual(shape.normal_per_vertex[-1], shape.vs[-1])
+        for face, normal in zip(shape.fs, shape.face_normals):
+            self.assertEqual(normal, shape.generate_face_normal(face, False))
+
+        shape.es = [0, 1]
+        shape.face_props = {"fs": [[0, 1, 2, 3]]}
+        shape.use_cpu_triangulation = False
+        shape.create_vertex_normals(True)
+        self.assertEqual(shape.triangulated_faces_n_index, [[0, 2, 1, 0, 3, 2]])
+        self.assertEqual(shape.face_needs_stencil, [True])
+        self.assertEqual(shape.edges_n_index, [4, 5])
+
+        # changing the faces only moves the edges to after the new face vertices
+        shape.face_props = {"fs": [[0, 1, 2], [0, 2, 3]]}
+        shape.create_vertex_normals(True)
+        self.assertEqual(len(shape.vertex_per_normal), 2 * 3 + 4)
+        self.assertEqual(shape.edges_n_index, [6, 7])
+
+    def test_gl_delete(self):
+        """Test that the OpenGL buffers of replaced shapes are freed when drawing."""
+
+        class Buffers:
+            """Replacement of geom_3d.GlBuffers that doesn't need OpenGL"""
+
+            deleted = 0
+
+            def delete(self):
+                """Count the deleted buffers"""
+                Buffers.deleted += 1
+
+        sym = geom_3d.SymmetricShape(
+            [[0, 0, 1], [1, 0, 0], [0, 1, 0]], [[0, 1, 2]], isometries=isometry.A4(), name="sym"
+        )
+        sym.apply_isoms()
+        for shape in sym.shapes:
+            shape.gl.buffers = Buffers()
+        # pylint: disable=protected-access
+        sym.apply_isoms()
+        self.assertEqual(Buffers.deleted, 0)
+        sym._gl_delete_dropped_shapes()
+        self.assertEqual(Buffers.deleted, 12)
+        self.assertEqual(sym._dropped_shapes, [])
+        sym.shapes[0].gl.buffers = Buffers()
+        sym.shapes[0].gl.batch_buffers = {"spheres": Buffers()}
+        sym.gl_delete()
+        self.assertEqual(Buffers.deleted, 14)
+        self.assertIsNone(sym.shapes[0].gl.buffers)
+        self.assertTrue(sym.shapes[0].gl.update_vertices)
+
+
+    def test_gl_buffers(self):
+        """Test the bookkeeping of the OpenGL buffer objects, without using OpenGL."""
+
+        class FakeGl:
+            """Replacement of the OpenGL module that records the buffer calls"""
+
+            # pylint: disable=invalid-name,missing-function-docstring
+            GL_ARRAY_BUFFER = 1
+            GL_ELEMENT_ARRAY_BUFFER = 2
+            GL_DYNAMIC_DRAW = 3
+            GL_STATIC_DRAW = 4
+            GL_DOUBLE = 5
+            GL_FLOAT = 6
+            GL_UNSIGNED_INT = 7
+            GL_LINES = 8
+
+            def __init__(self):
+                self.calls = []
+                self.no_of_buffers = 0
+
+            def glGenBuffers(self, _):
+                self.no_of_buffers += 1
+                return self.no_of_buffers
+
+            def glBindBuffer(self, target, buf_id):
+                pass
+
+            def glBufferData(self, target, size, data, usage):
+                self.calls.append(("data", target, size))
+
+            def glBufferSubData(self, target, offset, size, data):
+                self.calls.append(("sub_data", target, size))
+
+            def glDrawElements(self, mode, count, index_type, offset):
+                self.calls.append(("draw", mode, count, offset.value))
+
+            def glDeleteBuffers(self, n, ids):
+                self.calls.append(("delete", n, sorted(ids)))
+
+        fake_gl = FakeGl()
+        org_gl, geom_3d.GL = geom_3d.GL, fake_gl
+        try:
+            buffers = geom_3d.GlBuffers()
+            buffers.set_indices("edges", [0, 1, 1, 2])
+            self.assertEqual(buffers.index_buffers["edges"], (1, 4))
+            # the same amount of indices overwrites the buffer
+            buffers.set_indices("edges", [0, 2, 2, 3])
+            self.assertEqual(buffers.index_buffers["edges"], (1, 4))
+            buffers.set_indices("edges", [0, 1, 1, 2, 2, 0])
+            self.assertEqual(buffers.index_buffers["edges"], (1, 6))
+            self.assertEqual(
+                fake_gl.calls,
+                [("data", 2, 16), ("sub_data", 2, 16), ("data", 2, 24)],
+            )
+            fake_gl.calls = []
+            buffers.draw_elements(fake_gl.GL_LINES, "edges", 2)
+            self.assertEqual(fake_gl.calls, [("draw", 8, 4, 8)])
+            buffers.set_arrays(np.zeros((3, 3)), np.ones((3, 3)))
+            self.assertEqual(buffers.coord_type, fake_gl.GL_DOUBLE)
+            self.assertEqual(buffers.vertex_buffer, (2, 72))
+            self.assertEqual(buffers.normal_buffer, (3, 72))
+            buffers.set_arrays(
+                np.zeros((3, 3), dtype=np.float32), np.ones((3, 3), dtype=np.float32)
+            )
+            self.assertEqual(buffers.coord_type, fake_gl.GL_FLOAT)
+            self.assertEqual(buffers.vertex_buffer, (2, 36))
+            fake_gl.calls = []
+            buffers.delete()
+            self.assertEqual(fake_gl.calls, [("delete", 3, [1, 2, 3])])
+            self.assertEqual(buffers.index_buffers, {})
+            self.assertIsNone(buffers.vertex_buffer)
+        finally:
+            geom_3d.GL = org_gl
+
+        # sources are compared by identity and version
+        es = [0, 1]
+        self.assertTrue(buffers.changed("edges", es, 0))
+        self.assertFalse(buffers.changed("edges", es, 0))
+        es[:] = [1, 2]
+        self.assertTrue(buffers.changed("edges", es, 1))
+        self.assertTrue(buffers.changed("edges", list(es), 1))
+        sphere = Scenes3D.VSphere()
+        self.assertTrue(buffers.changed("sphere", sphere, 0))
+        self.assertFalse(buffers.changed("sphere", sphere, 0))
+        self.assertTrue(buffers.changed("sphere", Scenes3D.VSphere(), 0))
+
+        # a shape increases its data version when its data changes
+        shape = get_cube()
+        versions = [shape._data_version]  # pylint: disable=protected-access
+        shape.reverse_face(0)
+        shape.faces_updated()
+        versions.append(shape._data_version)  # pylint: disable=protected-access
+        shape.edge_props = {"es": [0, 1]}
+        versions.append(shape._data_version)  # pylint: disable=protected-access
+        shape.vertex_props = {"vs": shape.vs}
+        versions.append(shape._data_version)  # pylint: disable=protected-access
+        shape.face_props = {"colors": ([rgb.red, rgb.blue], [0, 1] * 3)}
+        versions.append(shape._data_version)  # pylint: disable=protected-access
+        self.assertEqual(len(set(versions)), len(versions))
+
+    def test_even_odd_triangles(self):
+        """Test that faces that aren't triangles are divided into triangles on the CPU."""
+        # A pentagram and a square in the plane z = 1
+        vs = [[math.cos(2 * math.pi * i / 5), math.sin(2 * math.pi * i / 5), 1] for i in range(5)]
+        vs.extend([[2, 0, 1], [3, 0, 1], [3, 1, 1], [2, 1, 1]])
+        shape = geom_3d.SimpleShape(vs, [[0, 2, 4, 1, 3], [5, 6, 7, 8], [0, 1, 5]])
+        shape.create_vertex_normals(True)
+        self.assertEqual(shape.face_needs_stencil, [False, False, False])
+        self.assertEqual(shape.triangulated_faces_n_index[2], [9, 11, 10])
+        triangles = shape.triangulated_faces_n_index[:2]
+        for face, expected in zip(triangles, [0.7756767521667438, 1]):
+            area = 0
+            for i in range(0, len(face), 3):
+                v0, v1, v2 = (shape.vertex_per_normal[j] for j in face[i : i + 3])
+                self.assertEqual(v0[2], 1)
+                normal = (v2 - v0).cross(v1 - v0)
+                # Same orientation as the face
+                self.assertEqual(normal.normalise(), shape.face_normals[0])
+                area += normal.norm() / 2
+            self.assertAlmostEqual(area, expected)
+        for i in range(12 + 9, len(shape.vertex_per_normal)):
+            self.assertEqual(shape.normal_per_vertex[i], shape.face_normals[0])
+
+        # Only triangulated again when the vertices of a face move
+        square = shape.vertex_per_normal[-1]
+        shape.vertex_props = {"vs": vs[:5] + [[2 * x, y, 1] for x, y, _ in vs[5:]]}
+        shape.create_vertex_normals(True)
+        self.assertEqual(shape.triangulated_faces_n_index[:2], triangles)
+        self.assertEqual(shape.vertex_per_normal[-1], square + geomtypes.Vec3([square[0], 0, 0]))
+
+    def test_face_batches(self):
+        """Test that the faces are grouped per colour with the triangle faces first."""
+        shape = geom_3d.SimpleShape(
+            [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0, 0, 1]],
+            [[0, 1, 2, 3], [0, 1, 4], [1, 2, 4], [2, 3, 4]],
+            colors=([rgb.red, rgb.blue], [0, 0, 1, 0]),
+        )
+        batches = shape._get_face_batches()  # pylint: disable=protected-access
+        self.assertEqual(
+            batches,
+            [
+                ([0, 4, 1, 2, 4, 3, 0, 2, 1, 0, 3, 2], 6, [(6, 6)]),
+                ([1, 4, 2], 3, []),
+            ],
+        )
+
+    def test_read_off_file(self):
+        """Test that reading all faces at once gives the same result as reading line by line."""
+        off = """OFF
+# A square pyramid
+5 5 8
+
+0 0 1 0.5 0.5 0.5
+1 0 0 0.5 0.5 0.5
+0 1 0 0.5 0.5 0.5
+-1 0 0 0.5 0.5 0.5
+0 -1 0 0.5 0.5 0.5
+{}
+"""
+        face = [" ".join(str((i + j) % 5) for j in range(4)) for i in range(5)]
+        test_matrix = {
+            "int colours": "\n".join(f"4 {face[i]} 255 {i} 0 1" for i in range(5)),
+            "float colours": "\n".join(f"4 {face[i]} 0.5 0.{i} 1" for i in range(5)),
+            "mixed colours": "\n".join(
+                f"4 {face[i]} 0.5 {i}e-1 1" if i % 2 else f"4 {face[i]} 25 {i} 1" for i in range(5)
+            ),
+            "no colours": "\n".join(f"4 {face[i]}" for i in range(5)),
+            "irregular": "4 1 2 3 4\n3 0 1 2\n3 0 2 3\n3 0 3 4 255 0 0\n3 0 4 1",
+            "edges": "3 0 1 2\n3 0 2 3\n3 0 3 4\n3 0 4 1\n2 1 3",
+        }
+        for test_case, faces in test_matrix.items():
+            off_str = off.format(faces)
+            expected = geom_3d._read_off_lines(  # pylint: disable=protected-access
+                off_str.splitlines()
+            )
+            result = geom_3d._read_off_bulk(off_str)  # pylint: disable=protected-access
+            if test_case in ("irregular", "edges"):
+                self.assertIsNone(result, f"Test case {test_case} failed")
+            else:
+                self.assertEqual(
+                    [list(v) for v in result[0]],
+                    [list(v) for v in expected[0]],
+                    f"Test case {test_case} failed",
+                )
+                self.assertEqual(result[1:], expected[1:], f"Test case {test_case} failed")
+            shape = geom_3d.read_off_file(io.StringIO(off_str), regen_edges=False)
+            self.assertEqual(shape.fs, expected[1], f"Test case {test_case} failed")
+        off_str = off.format("\n".join(f"4 {face[i]}" for i in range(4)) + "\n4 0 1 2.5 3")
+        self.assertIsNone(geom_3d._read_off_bulk(off_str))  # pylint: disable=protected-access
+        with self.assertRaises(ValueError):
+            geom_3d.read_off_file(io.StringIO(off_str), regen_edges=False)
+        # a colour is read as float colour if any channel is a float
+        off_str = off.format(
+            "\n".join(f"4 {face[i]} 0 1 1" for i in range(4)) + "\n4 1 2 3 4 0 0.5 0"
+        )
+        for result in (
+            geom_3d._read_off_lines(off_str.splitlines()),  # pylint: disable=protected-access
+            geom_3d._read_off_bulk(off_str),  # pylint: disable=protected-access
+        ):
+            self.assertEqual(result[3], [[0, 1, 1]] * 4 + [[0, 127, 0]])
+
+    def test_write_off(self):
+        """Test that writing to a file object gives the same result as to_off."""
+        shape = get_cube()
+        shape.vertex_props = {"vs": list(shape.vs) + [[-0.0, 1 / 3, 1e-20], [100, -2.5, 0.125]]}
+        for precision in (3, 15):
+            fd = io.StringIO()
+            shape.write_off(fd, precision, info=True)
+            self.assertEqual(fd.getvalue(), shape.to_off(precision, info=True))
+            lines = fd.getvalue().splitlines()
+            vertex_line = lines.index("# Vertices") + 1
+            for v, line in zip(shape.vs, lines[vertex_line : vertex_line + len(shape.vs)]):
+                self.assertEqual(line, " ".join(geomtypes.f2s(c, precision) for c in v))
+
+    def test_binary_file(self):
+        """Test that a shape saved in the binary format is read back without any change."""
+        shape = get_cube()
+        shape.face_props = {"colors": ([rgb.red, rgb.blue, rgb.yellow + [128]], [0, 1, 2] * 4)}
+        shape.regen_edges()
+        sym = geom_3d.SymmetricShape(
+            [[0, 0, 1], [1, 0, 0], [0, 1, 0]], [[0, 1, 2]], isometries=isometry.A4(), name="sym"
+        )
+        for test_shape in (shape, sym):
+            with tempfile.TemporaryFile() as fd:
+                geom_3d.write_binary_file(fd, test_shape)
+                fd.seek(0)
+                result = geom_3d.read_binary_file(fd)
+                fd.seek(0)
+                orbit_result = geom_3d.read_binary_file(fd, orbit=True)
+            # The vertices are used from the memory mapped file
+            self.assertFalse(result.vs.array.flags.owndata)
+            self.assertEqual(result.name, test_shape.name)
+            self.assertEqual(result.to_off(), test_shape.simple_shape.to_off())
+            self.assertEqual(result.es, test_shape.simple_shape.es)
+            self.assertIsInstance(orbit_result, type(test_shape))
+            self.assertEqual(orbit_result.simple_shape.to_off(), test_shape.simple_shape.to_off())
+        with self.assertRaises(ValueError):
+            geom_3d.read_binary_file(io.BytesIO(b"OFF\n0 0 0\n" * 10))
+
+    def test_write_json(self):
+        """Test that writing JSON while walking the shapes gives the same result as json.dumps."""
+        cube = get_cube()
+        cube.vertex_props = {"vs": list(cube.vs) + [[-0.0, 1 / 3, 1e-20]]}
+        octahedron = get_octahedron()
+        for part in (cube, octahedron):
+            part.face_props = {"colors": ([rgb.red, rgb.blue], [])}
+        shape = geom_3d.CompoundShape([cube, octahedron], name="compound")
+        for indent in (None, 2):
+            shape.json_indent = indent
+            json_str = shape.json_str
+            self.assertEqual(json.loads(json_str), json.loads(json.dumps(shape.repr_dict)))
+            if indent is None:
+                self.assertEqual(json_str, json.dumps(shape.repr_dict, sort_keys=True))
+            else:
+                # Lists of numbers are written on one line
+                self.assertIn('\n            [0, 0.3333333333, 0]\n          ]\n', json_str)
+            result = geom_3d.CompoundShape.from_json_str(json_str)
+            self.assertIsInstance(result, geom_3d.CompoundShape)
+            result.json_indent = indent
+            self.assertEqual(result.json_str, json_str)
+
+    def test_data_file(self):
+        """Test that a shape saved as data is read back as executing the Python file does."""
+        cube = get_cube()
+        cube.face_props = {"colors": ([rgb.red, rgb.blue, [0.5, 0.0, 1.0]], [0, 1, 2] * 2)}
+        sym = geom_3d.SymmetricShape(
+            [[0, 0, 1], [1, 0, 0], [0, 1, 0]],
+            [[0, 1, 2]],
+            colors=[rgb.red, rgb.blue, rgb.yellow],
+            isometries=isometry.A4(),
+            name="sym",
+        )
+        octahedron = get_octahedron()
+        octahedron.face_props = {"colors": ([rgb.yellow], [])}
+        compound = geom_3d.CompoundShape([cube, octahedron], name="compound")
+        for shape in (cube, sym, compound):
+            fd = io.StringIO()
+            shape.save_file(fd)
+            py_shape = {}
+            exec(fd.getvalue(), py_shape)  # pylint: disable=exec-used
+            fd = io.StringIO()
+            geom_3d.save_data_file(fd, shape)
+            fd.seek(0)
+            result = geom_3d.read_data_file(fd)
+            self.assertIsInstance(result, type(py_shape["shape"]))
+            self.assertEqual(repr(result), repr(py_shape["shape"]))
+
+    def test_data_file_colors(self):
+        """Test that the colour channels are kept when saving a symmetric shape as data."""
+        sym = geom_3d.SymmetricShape(
+            [[0, 0, 1], [1, 0, 0], [0, 1, 0]],
+            [[0, 1, 2]],
+            colors=[[0.996094, 0.839844, 0], [0.5, 0.0, 1.0], [1 / 3, 0, 1], rgb.red],
+            isometries=isometry.A4(),
+            name="sym",
+        )
+        filename = get_path("sym_colors.pyjson", OUT_DIR)
+        with open(filename, "w") as fd:
+            geom_3d.save_data_file(fd, sym)
+        with open(filename, "r") as fd:
+            result = geom_3d.read_data_file(fd)
+        self.assertEqual(repr(result), repr(sym))
+        # the colours are plain JSON lists
+        with open(filename, "r") as fd:
+            colors = json.load(fd)["kwargs"]["colors"]
+        self.assertEqual(colors, sym.shape_colors)
+        self.assertIsInstance(colors[1][1], float)
+        self.assertIsInstance(colors[0][2], int)
+
+    def test_merge_vs(self):
+        """Test that merging vertices gives the same result as comparing all vertices."""
+
+        def merge_all(vs):
+            """For each vertex return the lowest index of an equal vertex (or -1)"""
+            result = [-1 for _ in vs]
+            for i, v in enumerate(vs):
+                for j in range(i):
+                    if v == vs[j]:
+                        result[i] = j
+                        break
+            return result
+
+        precision = 6
+        margin = 10**-precision
+        random.seed(0)
+        org_vs = [
+            geomtypes.Vec3([random.randint(-2, 2) / 2 for _ in range(3)]) for _ in range(50)
+        ]
+        vs = []
+        for v in org_vs:
+            vs.append(v)
+            # around the margin, including vertices that are only equal to an equal vertex
+            vs.append(v + geomtypes.Vec3([random.uniform(-2, 2) * margin for _ in range(3)]))
+        vs.extend([geomtypes.Vec3([1.5 * margin, 0, 0]), geomtypes.Vec3([0.9 * margin, 0, 0])])
+        random.shuffle(vs)
+        n = len(vs)
+        vs.extend([geomtypes.Vec3([9, 0, 0]), geomtypes.Vec3([0, 9, 0])])
+        with geomtypes.FloatHandler(precision):
+            expect = merge_all(vs)
+            # one face for each vertex to get the replacing vertex
+            fs = [[i, n, n + 1] for i in range(n)]
+            replaced = glue.mergeVs(vs, fs, precision)
+        self.assertTrue(replaced)
+        self.assertEqual(len(fs), n)
+        self.assertEqual(
+            [f[0] for f in fs], [i if j == -1 else j for i, j in enumerate(expect[:n])]
+        )
+
+    def test_clean_shape(self):
+        """Test that cleaning a shape removes vertices and faces and keeps the face colours."""
+        shape = get_tetrahedron()
+        vs = list(shape.vs) + [
+            geomtypes.Vec3([1, 1, 1.0000001]),  # == vs[0]
+            geomtypes.Vec3([5, 5, 5]),  # unused
+            geomtypes.Vec3([-1, -1, 1.0000001]),  # == vs[1]
+        ]
+        fs = [[0, 1, 2], [4, 3, 1], [2, 3, 0], [0, 6, 4], [1, 3, 2]]
+        shape = geom_3d.SimpleShape(
+            vs=vs, fs=fs, colors=([RED, YELLOW, BLUE], [0, 1, 2, 0, 1])
+        )
+        clean = shape.clean_shape(6)
+        self.assertEqual(clean.vs, get_tetrahedron().vs)
+        self.assertEqual(clean.fs, [[0, 1, 2], [0, 3, 1], [2, 3, 0], [1, 3, 2]])
+        self.assertEqual(list(clean.shape_colors[1]), [0, 1, 2, 1])
+        # the original shape isn't changed
+        self.assertEqual(len(shape.vs), 7)
+        self.assertEqual(shape.fs, fs)
+
+        # keep vertices that are only used by edges
+        vs = ["v0", "v1", "v2", "v3", "v4"]
+        fs = [[4, 2, 4], [2, 4, 0]]
+        es = [3, 4]
+        usage, face_map = glue.clean_up_vs_fs(vs, fs, es, min_face_len=3)
+        self.assertEqual(vs, ["v0", "v2", "v3", "v4"])
+        self.assertEqual(fs, [[1, 3, 0]])
+        self.assertEqual(es, [2, 3])
+        self.assertEqual(usage, [1, 1, 1, 2])
+        self.assertEqual(face_map, [-1, 0])
+
 
 class TestSimpleShapeInherit(unittest.TestCase):
     """Unit tests for geom_3d.SimpleShape"""
@@ -29,6 +29,8 @@ import os
 import random
 import unittest
 
+import numpy
+
 from orbitit import geomtypes
 
 
@@ -401,6 +403,19 @@ class TestVec(unittest.TestCase):
             self.assertEqual(v, w)
             self.assertEqual(w, v)
 
+    def test_compact(self):
+        """Test that vectors don't have an attribute dict"""
+        for v in [
+            geomtypes.Vec([1, 2]),
+            geomtypes.Vec3([1, 2, 3]),
+            geomtypes.Vec4([1, 2, 3, 4]),
+            geomtypes.Quat([1, 2, 3, 4]),
+            geomtypes.Vec3([1, 2, 3]).homogeneous,
+        ]:
+            self.assertFalse(hasattr(v, "__dict__"), f"{v.__class__.__name__}")
+        self.assertTrue(geomtypes.Vec3([1, 2, 3]).homogeneous.is_homogeneous)
+        self.assertFalse(geomtypes.Vec3([1, 2, 3]).is_homogeneous)
+
     def test_rotate_at(self):
         """Test the rotate_at method"""
         rotate = geomtypes.Rot3(axis=geomtypes.UZ, angle=math.pi/2)
@@ -464,6 +479,48 @@ class TestVec(unittest.TestCase):
                 self.assertEqual(result, exp, f"test case {test_case} failed")
 
 
+class TestVertexArray(unittest.TestCase):
+    """Unit tests for geomtypes.VertexArray"""
+
+    def test_list_compatible(self):
+        """Test that a vertex array can be used as a list of Vec3"""
+        vs = [geomtypes.Vec3([1, 2, 3]), geomtypes.Vec3([0, -1, 0.5])]
+        arr = geomtypes.VertexArray(vs)
+        self.assertEqual(len(arr), 2)
+        self.assertEqual(arr, vs)
+        self.assertEqual(list(arr), vs)
+        self.assertTrue(isinstance(arr[1], geomtypes.Vec3))
+        self.assertEqual(arr[-1], vs[-1])
+        self.assertEqual(arr[:1], vs[:1])
+        self.assertEqual(geomtypes.VertexArray([]), [])
+        self.assertNotEqual(arr, vs[:1])
+
+        self.assertEqual(arr.array.shape, (2, 3))
+        self.assertEqual(arr.array.dtype, float)
+        self.assertTrue(arr.array.flags.c_contiguous)
+        self.assertFalse(arr.array.flags.writeable)
+
+        copy = arr.copy()
+        copy.append([4, 5, 6])
+        copy.extend(vs)
+        self.assertEqual(len(arr), 2)
+        self.assertEqual(copy, vs + [geomtypes.Vec3([4, 5, 6])] + vs)
+        self.assertEqual(copy.array.shape, (5, 3))
+
+    def test_apply_many(self):
+        """Test that transforming a vertex array gives the same as a list"""
+        vs = [geomtypes.Vec3([1, 2, 3]), geomtypes.Vec3([0, -1, 0.5]), geomtypes.Vec3([-3, 0, 1])]
+        arr = geomtypes.VertexArray(vs)
+        for t in [
+            geomtypes.Rot3(axis=geomtypes.Vec3([1, 2, 3]), angle=1),
+            geomtypes.Refl3(normal=geomtypes.Vec3([1, 0, 1])),
+            geomtypes.Rot3(axis=geomtypes.UZ, angle=0.3).matrix(),
+        ]:
+            result = t.apply_many(arr)
+            self.assertTrue(isinstance(result, geomtypes.VertexArray))
+            self.assertEqual(tuple(result), tuple(t.apply_many(vs)))
+
+
 class TestRot3(unittest.TestCase):
     """Unit tests for geomtypes.Rot3"""
 
@@ -1151,6 +1208,77 @@ class TestTransform(unittest.TestCase):
                 for v in test_vec:
                     self.assertEqual(trfm_new * v, trfm_org * v)
 
+    def test_canonical(self):
+        """Test comparing transforms with a quaternion pair that differs in sign."""
+        margin = geomtypes.FloatHandler.margin
+        test_matrix = [
+            geomtypes.Rot3(axis=geomtypes.Vec3([1, 2, 3]), angle=0.5),
+            geomtypes.HalfTurn3(axis=geomtypes.Vec3([0, 1, 1])),
+            geomtypes.Refl3(normal=geomtypes.Vec3([0, 1, 1])),
+            geomtypes.RotInv3(axis=geomtypes.Vec3([1, 2, 3]), angle=0.5),
+        ]
+        for trfm in test_matrix:
+            neg = geomtypes.Transform3([-trfm[0], -trfm[1]])
+            self.assertEqual(trfm.type(), neg.type())
+            self.assertEqual(trfm, neg)
+            self.assertEqual(hash(trfm), hash(neg))
+            # a value just around a rounding border
+            q0 = geomtypes.Quat([trfm[0][0] + margin / 3, *trfm[0][1:]])
+            self.assertEqual(trfm, geomtypes.Transform3([q0, trfm[1]]))
+            self.assertNotEqual(
+                trfm, geomtypes.Transform3([geomtypes.Quat([q0[0] + margin, *q0[1:]]), trfm[1]])
+            )
+            # the rounded key is not used with a higher precision
+            close = geomtypes.Transform3(
+                [geomtypes.Quat([trfm[0][0] + 1e-12, *trfm[0][1:]]), trfm[1]]
+            )
+            self.assertEqual(trfm, close)
+            with geomtypes.FloatHandler(14):
+                self.assertNotEqual(trfm, close)
+            for other in test_matrix:
+                if other is not trfm:
+                    self.assertNotEqual(trfm, other)
+        with self.assertRaises(geomtypes.UnsupportedTransform):
+            geomtypes.Transform3([geomtypes.Quat([1, 1, 0, 0]), geomtypes.Quat([2, 0, 0, 0])]).type()
+
+    def test_apply_many(self):
+        """Test transforming many vertices in one go."""
+        vs = [
+            geomtypes.Vec3([0, 0, 0]),
+            geomtypes.Vec3([1, 0, 0]),
+            geomtypes.Vec3([0.1, -2, 3]),
+            geomtypes.Vec3([-1.5, 1.2, 0.7]),
+        ]
+        rot_nc = geomtypes.Rot3NonCentered([1, 2, 3], [1, -1, 0], 0.7)
+        test_matrix = [
+            geomtypes.Rot3(axis=geomtypes.Vec3([1, 2, 3]), angle=0.5),
+            geomtypes.HX,
+            geomtypes.Refl3(normal=geomtypes.Vec3([0, 1, 1])),
+            geomtypes.RotInv3(axis=geomtypes.Vec3([1, 2, 3]), angle=0.5),
+            rot_nc,
+            rot_nc.matrix(),
+            geomtypes.Rot3(axis=geomtypes.Vec3([1, 2, 3]), angle=0.5).matrix(),
+        ]
+        for trfm in test_matrix:
+            result = trfm.apply_many(vs)
+            self.assertIsInstance(result, list)
+            for v, w in zip(vs, result):
+                self.assertIsInstance(w, geomtypes.Vec3)
+                # exactly the same
+                self.assertEqual(tuple(w), tuple(trfm * v))
+            result = trfm.apply_many(numpy.array(vs))
+            self.assertIsInstance(result, numpy.ndarray)
+            self.assertEqual(result.shape, (len(vs), 3))
+            self.assertEqual(result.tolist(), [list(trfm * v) for v in vs])
+            self.assertEqual(trfm.apply_many([]), [])
+        rot4 = geomtypes.Rot4(
+            axialPlane=(geomtypes.Vec4([1, 0, 1, 0]), geomtypes.Vec4([0, 1, 0, 1])), angle=0.3
+        )
+        vs = [geomtypes.Vec4([1, 0, 0, 0]), geomtypes.Vec4([0.1, -2, 3, 0.5])]
+        for v, w in zip(vs, rot4.apply_many(vs)):
+            self.assertIsInstance(w, geomtypes.Quat)
+            self.assertEqual(tuple(w), tuple(rot4 * v))
+
 
 class TestRotInv3(unittest.TestCase):
     """Unit tests for geomtypes.RotInv3"""
@@ -21,6 +21,7 @@
 # or write to the Free Software Foundation,
 #
 # ------------------------------------------------------------------
+import io
 import unittest
 
 from orbitit import indent
@@ -62,5 +63,38 @@ class TestStr(unittest.TestCase):
         self.assertEqual(text, EXPECTED, "Test case test_indent failed")
 
 
+class TestWriter(unittest.TestCase):
+    """Unit tests for ident.Writer"""
+
+    def test_indent(self):
+        """Test increase and decrease of some text"""
+        fd = io.StringIO()
+        text = indent.Writer(fd)
+        text.add_line("for one in all {")
+        text.incr()
+        text.add_line("do something")
+        text.add_line("do some more")
+        text.add_incr_line("new_block")
+        text.add_line("blabla")
+        text.add_incr_line("further", 2)
+        text.add_line("bis")
+        text.add_decr_line("grr", 2)
+        text.add_line("arg")
+        text.add_decr_line("back")
+        text.add_line("same")
+        text.decr()
+        text.add_line("} done")
+        self.assertEqual(fd.getvalue(), EXPECTED, "Test case test_indent failed")
+
+    def test_add_blocks(self):
+        """Test that adding blocks gives the same result as reindenting them with Str"""
+        blocks = ["one", "two(\n\n    three\n)", "four"]
+        fd = io.StringIO()
+        text = indent.Writer(fd, indent=8)
+        text.add_blocks(blocks)
+        expected = indent.Str("").glue_line(indent.Str(",\n".join(blocks)).reindent(8))
+        self.assertEqual(fd.getvalue(), expected)
+
+
 if __name__ == '__main__':
     unittest.main()
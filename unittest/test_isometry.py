@@ -614,6 +614,71 @@ class TestSubGroups(unittest.TestCase):
         )
         self.assertTrue(geomtypes.HX in cg)
         self.assertTrue(geomtypes.E in cg)
+        # products of 3 isometries are needed
+        with self.assertRaises(AssertionError):
+            g.close(max_iter=1)
+
+        # the class of the set is kept
+        g = isometry.A4()
+        g.discard(geomtypes.HX)
+        cg = g.close()
+        self.assertIsInstance(cg, isometry.A4)
+        self.assertEqual(cg, isometry.A4())
+
+    def test_generate_group(self):
+        """Test generating a group from generators."""
+        a5xi = isometry.A5xI()
+        gens = [
+            geomtypes.Rot3(axis=a5xi.generator["o5axis"], angle=geomtypes.turn(0.2)),
+            geomtypes.Rot3(axis=a5xi.generator["o3axis"], angle=geomtypes.THIRD_TURN),
+            geomtypes.I,
+        ]
+        group, words = isometry.generate_group(gens)
+        self.assertEqual(len(group), 120)
+        self.assertEqual(len(words), 120)
+        self.assertEqual(group, a5xi)
+        for isom, word in words:
+            product = geomtypes.E
+            for i in word:
+                product = product * gens[i]
+            self.assertEqual(product, isom)
+        with self.assertRaises(AssertionError):
+            isometry.generate_group(gens, 3)
+
+    def test_cayley_table(self):
+        """Test group operations on a compiled set."""
+        s4xi = isometry.S4xI()
+        self.assertIsNone(s4xi.cayley_table)
+        table = s4xi.compile()
+        self.assertIs(s4xi.cayley_table, table)
+        self.assertEqual(len(table), 48)
+        self.assertTrue(table.is_group())
+        self.assertTrue(s4xi.is_group())
+        for i, a in enumerate(table.elements):
+            self.assertEqual(table.elements[table.inv[i]], a.inverse())
+            for j, b in enumerate(table.elements):
+                self.assertEqual(table.elements[table.mult[i][j]], a * b)
+        # E, 6 half turns around 2-fold axes, 3 half turns around 4-fold axes, 8 third turns,
+        # 6 quarter turns and all these times the central inversion
+        self.assertEqual(
+            sorted(len(c) for c in table.conjugacy_classes),
+            sorted([1, 6, 3, 8, 6] * 2),
+        )
+        a4 = isometry.A4()
+        self.assertTrue(a4.is_subgroup(s4xi))
+        a4.add(geomtypes.Rot3(axis=geomtypes.UZ, angle=geomtypes.QUARTER_TURN))
+        self.assertFalse(a4.is_subgroup(s4xi))
+        a4xi = isometry.A4xI()
+        q = s4xi / a4xi
+        self.assertEqual(len(q), 2)
+        self.assertEqual(q[0] | q[1], s4xi)
+        d2 = isometry.Set([geomtypes.HX, geomtypes.HY])
+        self.assertEqual(len(s4xi / d2), 12)
+        self.assertEqual(s4xi * a4xi, s4xi)
+        # the table is dropped when the set changes
+        s4xi.discard(geomtypes.I)
+        self.assertIsNone(s4xi.cayley_table)
+        self.assertFalse(s4xi.is_group())
 
     def test_a4(self):
         """Test the isometries of the A4 symmetry group."""
@@ -684,6 +749,125 @@ class TestSubGroups(unittest.TestCase):
                 for j in range(i + 1, len(q)):
                     self.assertTrue(transform not in q[j])
 
+    def test_coset_decomposition(self):
+        """Test dividing a group in cosets."""
+        a5xi = isometry.A5xI()
+        d5 = a5xi.realise_subgroups(isometry.D5)[0]
+        for compile_group in (False, True):
+            if compile_group:
+                a5xi.compile()
+            cosets = a5xi.coset_decomposition(d5)
+            self.assertEqual(len(cosets), 12)
+            self.assertEqual(len(cosets.transversal), 12)
+            self.assertEqual(sorted(set(cosets.labels)), list(range(12)))
+            for isom, label in zip(cosets.elements, cosets.labels):
+                self.assertTrue(isom in cosets.cosets[label])
+                self.assertEqual(cosets.label(isom), label)
+            for label, isom in enumerate(cosets.transversal):
+                self.assertEqual(cosets.label(isom), label)
+        self.assertIsNone(cosets.label(geomtypes.Rot3(axis=[1, 2, 3], angle=1)))
+        with self.assertRaises(isometry.ImproperSubgroupError):
+            isometry.A4xI().coset_decomposition(d5)
+
+    def test_group_cache(self):
+        """Test that groups created from the same setup are reused."""
+        isometry.group_cache.clear()
+        setup = {"o4axis0": geomtypes.UZ, "o4axis1": geomtypes.UY}
+        s4xi = isometry.S4xI(setup=setup)
+        self.assertEqual(isometry.group_cache.hits, 0)
+        self.assertTrue(isometry.group_cache.misses > 0)
+        hits = isometry.group_cache.hits
+        margin = geomtypes.FloatHandler.margin
+        s4xi_cp = isometry.S4xI(
+            setup={
+                "o4axis0": geomtypes.Vec3([0, -margin / 10, 1]),
+                "o4axis1": [0, 1, 0],
+            },
+        )
+        self.assertEqual(isometry.group_cache.hits, hits + 1)
+        self.assertEqual(s4xi, s4xi_cp)
+        self.assertIsNot(s4xi, s4xi_cp)
+        # changing a group doesn't change the cached one
+        s4xi_cp.discard(geomtypes.I)
+        self.assertEqual(isometry.S4xI(setup=setup), s4xi)
+        self.assertEqual(isometry.group_cache.hits, hits + 2)
+        # groups created from isometries aren't cached
+        misses = isometry.group_cache.misses
+        isometry.S4xI(isometries=list(s4xi))
+        self.assertEqual(isometry.group_cache.info()["misses"], misses)
+        self.assertEqual(isometry.group_cache.info()["hits"], hits + 2)
+
+    def test_bitmask(self):
+        """Test set operations on subsets of the same parent group."""
+        a4xi = isometry.A4xI()
+        table = isometry.CayleyTable(a4xi)
+        c3s = a4xi.realise_subgroups(isometry.C3)
+        c2xi = a4xi.realise_subgroups(isometry.C2xI)[0]
+        for c3 in c3s:
+            self.assertIsNotNone(c3.bitmask(table))
+        self.assertIsNone(isometry.S4().bitmask(table))
+        self.assertEqual(table.mask_ids(c3s[0].bitmask(table)), sorted(table.indices(c3s[0])))
+        self.assertTrue(c3s[0].is_subgroup(a4xi))
+        self.assertFalse(c2xi.is_subgroup(c3s[0]))
+        self.assertTrue(c3s[0].issubset(table.subset(c3s[0].bitmask(table) | c2xi.bitmask(table))))
+        self.assertFalse(c3s[0].issubset(c2xi))
+        self.assertFalse(c2xi.issubset(c3s[0]))
+        self.assertFalse(c3s[1].issubset(table.subset(c3s[0].bitmask(table) | c2xi.bitmask(table))))
+        # C3 isn't a normal subgroup, so the left cosets g * C3 differ from the right ones
+        for coset in table.cosets(table.indices(c3s[0])):
+            isom = table.elements[coset[0]]
+            self.assertEqual(isometry.Set([table.elements[i] for i in coset]), isom * c3s[0])
+        union = c3s[0] | c2xi
+        self.assertEqual(len(union), 6)
+        self.assertFalse(union.is_group())
+        self.assertEqual(union.union(c3s[1]), c3s[0].union(c2xi, c3s[1]))
+        self.assertEqual(c3s[0] & c3s[1], isometry.E())
+        self.assertEqual(union & c3s[0], c3s[0])
+        self.assertEqual(c3s[0].intersection(union, a4xi), c3s[0])
+        self.assertTrue((c3s[0] & c3s[1]).is_group())
+        # a changed set forgets the bitmask
+        c3 = copy(c3s[0])
+        c3.add(geomtypes.I)
+        self.assertFalse(c3.is_group())
+        self.assertNotEqual(c3, c3s[0])
+        self.assertTrue(c3.issubset(a4xi))
+
+    def test_iter_subgroups(self):
+        """Test iterating over subgroup descriptors."""
+        a5xi = isometry.A5xI()
+        for sg in [isometry.A5xI, isometry.D5, isometry.C2xI, isometry.E]:
+            subgroups = list(a5xi.iter_subgroups(sg))
+            exp = a5xi.realise_subgroups(sg)
+            self.assertEqual(len(subgroups), len(exp))
+            for descr, group in zip(subgroups, exp):
+                self.assertIsInstance(descr, isometry.SubgroupDescriptor)
+                self.assertIsInstance(group, sg)
+                self.assertEqual(descr.sg, sg)
+                self.assertEqual(descr.group, group)
+                self.assertEqual(
+                    isometry.SubgroupDescriptor.from_json_dict(descr.repr_dict).group, group
+                )
+        # the descriptors are saved
+        d5s = list(a5xi.iter_subgroups(isometry.D5))
+        self.assertIs(d5s[0], next(a5xi.iter_subgroups(isometry.D5)))
+        # only create the group when needed
+        descr = isometry.SubgroupDescriptor(isometry.D5, d5s[0].setup)
+        self.assertIsNone(descr._group)  # pylint: disable=protected-access
+        self.assertEqual(descr.group.order, 10)
+        self.assertEqual(descr.group, d5s[0].group)
+        # copies don't share the descriptors and a changed set forgets them
+        a5xi_copy = copy(a5xi)
+        self.assertIsNot(next(a5xi_copy.iter_subgroups(isometry.D5)), d5s[0])
+        a5xi_copy.remove(geomtypes.I)
+        self.assertEqual(a5xi_copy._subgroup_descriptors, {})  # pylint: disable=protected-access
+        self.assertIs(next(a5xi.iter_subgroups(isometry.D5)), d5s[0])
+        # all subgroups are described, not realised
+        s4xi = isometry.S4xI()
+        for sg in s4xi.subgroups:
+            for descr in s4xi.iter_subgroups(sg):
+                self.assertIsInstance(descr, isometry.SubgroupDescriptor)
+                self.assertIsInstance(descr.group, sg)
+
     def test_some_std_sub_groups(self):
         """Test some standard subgroups."""
         a4 = isometry.A4()
@@ -775,6 +959,66 @@ class TestSubGroups(unittest.TestCase):
             self.assertEqual(isom, isom_cmp)
 
 
+class TestSet(unittest.TestCase):
+    """Unit test the isometry set"""
+
+    def test_membership(self):
+        """Test looking up isometries that are close to each other."""
+        a5xi = isometry.A5xI()
+        self.assertEqual(len(a5xi), 120)
+        margin = geomtypes.FloatHandler.margin
+        for t in a5xi:
+            q0 = geomtypes.Quat([c + margin / 10 for c in t[0]])
+            q1 = geomtypes.Quat([c - margin / 10 for c in t[1]])
+            self.assertTrue(geomtypes.Transform3([q0, q1]) in a5xi)
+            self.assertTrue(geomtypes.Transform3([-t[0], -t[1]]) in a5xi)
+            self.assertTrue(t.inverse() in a5xi)
+            a5xi.add(t * t)
+        self.assertEqual(len(a5xi), 120)
+        # Rotations around an axis with a coordinate close to an index cell border
+        cell_size = isometry._INDEX_CELL_FACTOR * margin  # pylint: disable=protected-access
+        for d in (-margin / 3, margin / 3):
+            r0 = geomtypes.Rot3(axis=[1, 0, 0], angle=2 * cell_size - d)
+            r1 = geomtypes.Rot3(axis=[1, 0, 0], angle=2 * cell_size + d)
+            s = isometry.Set([r0])
+            self.assertTrue(r1 in s)
+            s.add(r1)
+            self.assertEqual(len(s), 1)
+        self.assertFalse(geomtypes.Rot3(axis=[1, 0, 0], angle=2 * margin) in s)
+        # Rotations with a coordinate close to the limit that decides the sign of the index key
+        limit = isometry._INDEX_SIGN_LIMIT  # pylint: disable=protected-access
+        for w0, w1 in ((limit + 0.9 * margin, limit + 1.1 * margin), (limit, limit + margin / 2)):
+            q0 = geomtypes.Quat([-w0, math.sqrt(1 - w0 * w0), 0, 0])
+            q1 = geomtypes.Quat([w1, -math.sqrt(1 - w1 * w1), 0, 0])
+            s = isometry.Set([geomtypes.Transform3([q0, q0.conjugate()])])
+            self.assertTrue(geomtypes.Transform3([q1, q1.conjugate()]) in s)
+
+    def test_update_and_remove(self):
+        """Test that the set stays consistent after changing it."""
+        a4 = isometry.A4()
+        a4_cp = copy(a4)
+        a4_cp.discard(geomtypes.E)
+        self.assertEqual(len(a4_cp), 11)
+        self.assertFalse(geomtypes.E in a4_cp)
+        self.assertTrue(geomtypes.E in a4)
+        a4_cp.remove(geomtypes.HX)
+        self.assertFalse(geomtypes.HX in a4_cp)
+        with self.assertRaises(KeyError):
+            a4_cp.remove(geomtypes.HX)
+        e = a4_cp.pop()
+        self.assertFalse(e in a4_cp)
+        a4_cp |= a4
+        self.assertEqual(a4_cp, a4)
+        a4_cp -= isometry.Set([geomtypes.HX, geomtypes.HY])
+        self.assertEqual(len(a4_cp), 10)
+        a4_cp.clear()
+        self.assertFalse(geomtypes.E in a4_cp)
+        a4_cp.update(a4)
+        self.assertEqual(a4_cp, a4)
+        with geomtypes.FloatHandler(7):
+            self.assertEqual(a4_cp, a4)
+
+
 if __name__ == "__main__":
     unittest.main()
     print("success!")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""Unit test the file orbit.py"""
+#
+# Copyright (C) 2024 Marcel Tunnissen
+#
+# License: GNU Public License version 2
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not,
+# check at http://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+# or write to the Free Software Foundation,
+# ------------------------------------------------------------------
+
+import json
+import os
+import unittest
+
+from orbitit import geomtypes, isometry, orbit, rgb
+
+DIR_PATH = os.path.dirname(os.path.realpath(__file__))
+OUT_DIR = "output"
+
+
+class TestHospCache(unittest.TestCase):
+    """Unit test the cache of higher order stabilisers"""
+
+    def setUp(self):
+        self.org_cache = orbit.hosp_cache
+        orbit.hosp_cache = orbit.HospCache(
+            os.path.join(DIR_PATH, OUT_DIR, "check_orbit_cache.json")
+        )
+        orbit.hosp_cache.invalidate()
+
+    def tearDown(self):
+        orbit.hosp_cache.invalidate()
+        orbit.hosp_cache = self.org_cache
+
+    @staticmethod
+    def _get_hosp(final, stabiliser):
+        """Return the higher order stabiliser properties and all higher order stabilisers."""
+        o = orbit.Orbit((final, stabiliser))
+        props = o.higher_order_stab_props
+        stabs = [o.higher_order_stab(i) for i in range(len(props))]
+        return [(p["class"], p["order"]) for p in props], stabs
+
+    def test_cache(self):
+        """Test that cached higher order stabilisers are the same as calculated ones."""
+        final = isometry.S4xI()
+        stabiliser = final.realise_subgroups(isometry.D2C2)[0]
+        orbit.hosp_cache.enabled = False
+        exp_props, exp_stabs = self._get_hosp(final, stabiliser)
+        # the final symmetry is compiled and the stabiliser is a subset of its table
+        self.assertIsNotNone(final.cayley_table)
+        self.assertIsNotNone(stabiliser.bitmask(final.cayley_table))
+        self.assertTrue(final.cayley_table.is_group())
+        self.assertFalse(os.path.exists(orbit.hosp_cache.path))
+        orbit.hosp_cache.enabled = True
+        props, stabs = self._get_hosp(final, stabiliser)
+        self.assertEqual(props, exp_props)
+        self.assertEqual(stabs, exp_stabs)
+        # the cache is saved at once
+        self.assertFalse(os.path.exists(orbit.hosp_cache.path))
+        orbit.hosp_cache.save()
+        self.assertTrue(os.path.exists(orbit.hosp_cache.path))
+
+        # read from file
+        orbit.hosp_cache = orbit.HospCache(orbit.hosp_cache.path)
+        self.assertIsNotNone(orbit.hosp_cache.get(final, stabiliser))
+        props, stabs = self._get_hosp(final, stabiliser)
+        self.assertEqual(props, exp_props)
+        self.assertEqual(stabs, exp_stabs)
+
+        # another version is ignored
+        with open(orbit.hosp_cache.path) as fd:
+            data = json.load(fd)
+        data["version"] = orbit.HOSP_CACHE_VERSION + 1
+        with open(orbit.hosp_cache.path, "w") as fd:
+            json.dump(data, fd)
+        orbit.hosp_cache = orbit.HospCache(orbit.hosp_cache.path)
+        self.assertIsNone(orbit.hosp_cache.get(final, stabiliser))
+
+        orbit.hosp_cache.invalidate()
+        self.assertFalse(os.path.exists(orbit.hosp_cache.path))
+        self.assertIsNone(orbit.hosp_cache.get(final, stabiliser))
+
+    def test_save_merges(self):
+        """Test that saving the cache keeps the entries that were saved by another cache."""
+        final = isometry.A4()
+        stabilisers = final.realise_subgroups(isometry.C3)[:2]
+        other_cache = orbit.HospCache(orbit.hosp_cache.path)
+        orbit.hosp_cache.put(final, stabilisers[0], {"props": 0})
+        other_cache.put(final, stabilisers[1], {"props": 1})
+        other_cache.save()
+        orbit.hosp_cache.save()
+        cache = orbit.HospCache(orbit.hosp_cache.path)
+        self.assertEqual(cache.get(final, stabilisers[0]), {"props": 0})
+        self.assertEqual(cache.get(final, stabilisers[1]), {"props": 1})
+        # no temporary files are left behind
+        for filename in os.listdir(os.path.dirname(cache.path)):
+            self.assertFalse(filename.startswith(".check_orbit_cache"), filename)
+
+    def test_warm_cache(self):
+        """Test preparing the cache for a final symmetry."""
+        orbit.warm_hosp_cache([isometry.A4])
+        final = isometry.A4()
+        for stabiliser in final.realise_subgroups(isometry.C3):
+            self.assertIsNotNone(orbit.hosp_cache.get(final, stabiliser))
+
+
+class TestShape(unittest.TestCase):
+    """Unit test colouring orbit shapes"""
+
+    def test_col_alt_skips_other_isometries(self):
+        """Test that isometries outside the final symmetry don't get a colour."""
+        shape = orbit.Shape(
+            {"vs": [[0, 0, 1], [1, 0, 0], [0, 1, 0]], "fs": [[0, 1, 2]]},
+            isometry.A4(),
+            isometry.E(),
+            "triangles",
+            no_of_cols=3,
+            cols=[rgb.red, rgb.gold, rgb.blue],
+        )
+        no_of_isoms = len(shape.isoms)
+        shape.isoms = list(shape.isoms) + [geomtypes.I]
+        shape.set_col_alt(shape.col_choice_index)
+        self.assertEqual(len(shape.col_per_isom), no_of_isoms)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""Test module for orbitit.Scenes3D.py"""
+#
+# Copyright (C) 2026 Marcel Tunnissen
+#
+# License: GNU Public License version 2
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not,
+# check at http://www.gnu.org/licenses/old-licenses/gpl-2.0.html
+# or write to the Free Software Foundation,
+#
+# pylint: disable=protected-access
+import unittest
+
+import numpy as np
+
+from orbitit import Scenes3D
+
+
+class TestBatch(unittest.TestCase):
+    """Test creating one mesh for many vertex spheres or edge cylinders"""
+
+    def test_grid_triangles(self):
+        """Test the triangles covering a grid of vertices."""
+        triangles = Scenes3D._grid_triangles(2, 3)
+        # two triangles per cell
+        self.assertEqual(triangles.shape, (12, 3))
+        self.assertEqual(triangles.min(), 0)
+        self.assertEqual(triangles.max(), 3 * 4 - 1)
+        self.assertEqual(triangles[:2].tolist(), [[0, 1, 5], [0, 5, 4]])
+        # all triangles differ
+        self.assertEqual(len({tuple(t) for t in triangles.tolist()}), 12)
+
+    def test_batch(self):
+        """Test merging the instances of one mesh."""
+        vs = np.arange(2 * 4 * 3, dtype=float).reshape(2, 4, 3)
+        ns = np.ones((2, 4, 3))
+        triangles = np.array([[0, 1, 2], [0, 2, 3]])
+        batch_vs, batch_ns, indices = Scenes3D._batch(vs, ns, triangles)
+        self.assertEqual(batch_vs.shape, (8, 3))
+        self.assertEqual(batch_ns.shape, (8, 3))
+        self.assertEqual(batch_vs.dtype, np.float32)
+        self.assertEqual(batch_ns.dtype, np.float32)
+        self.assertEqual(indices.dtype, np.uint32)
+        self.assertEqual(indices.tolist(), [0, 1, 2, 0, 2, 3, 4, 5, 6, 4, 6, 7])
+        self.assertEqual(batch_vs.tolist(), vs.reshape(-1, 3).tolist())
+
+    def test_sphere_batch(self):
+        """Test creating one mesh with spheres around vertices."""
+        sphere = Scenes3D.VSphere(radius=0.5, slices=6, stacks=4)
+        centres = np.array([[0, 0, 0], [1, 2, 3]], dtype=float)
+        vs, ns, indices = sphere.get_batch(centres)
+        no_of_vs = (4 + 1) * (6 + 1)
+        self.assertEqual(vs.shape, (2 * no_of_vs, 3))
+        self.assertEqual(ns.shape, (2 * no_of_vs, 3))
+        self.assertEqual(len(indices), 2 * 4 * 6 * 2 * 3)
+        self.assertEqual(indices.max(), 2 * no_of_vs - 1)
+        # the indices of the second sphere refer to its own vertices
+        self.assertEqual(indices[len(indices) // 2 :].min(), no_of_vs)
+        for i, centre in enumerate(centres):
+            sphere_vs = vs[i * no_of_vs : (i + 1) * no_of_vs]
+            np.testing.assert_allclose(np.linalg.norm(sphere_vs - centre, axis=1), 0.5, rtol=1e-6)
+        np.testing.assert_allclose(np.linalg.norm(ns, axis=1), 1, rtol=1e-6)
+
+    def test_cylinder_batch(self):
+        """Test creating one mesh with cylinders for edges."""
+        cyl = Scenes3D.P2PCylinder(radius=0.1, slices=6, stacks=1)
+        v0s = np.array([[0, 0, 0], [1, 1, 1], [1, 0, 0]], dtype=float)
+        v1s = np.array([[0, 0, 2], [1, 1, 1], [1, 3, 4]], dtype=float)
+        vs, ns, indices = cyl.get_batch(v0s, v1s)
+        # the second edge has no length and is skipped
+        no_of_vs = (1 + 1) * (6 + 1)
+        self.assertEqual(vs.shape, (2 * no_of_vs, 3))
+        self.assertEqual(ns.shape, (2 * no_of_vs, 3))
+        self.assertEqual(len(indices), 2 * 1 * 6 * 2 * 3)
+        self.assertEqual(indices.max(), 2 * no_of_vs - 1)
+        np.testing.assert_allclose(np.linalg.norm(ns, axis=1), 1, rtol=1e-6)
+        for i, (v0, length) in enumerate([(v0s[0], 2), (v0s[2], 5)]):
+            cyl_vs = vs[i * no_of_vs : (i + 1) * no_of_vs]
+            axis = (v1s[2 * i] - v0) / length
+            along = (cyl_vs - v0) @ axis
+            np.testing.assert_allclose(sorted(set(np.round(along, 5))), [0, length], atol=1e-5)
+            across = (cyl_vs - v0) - along[:, np.newaxis] * axis
+            np.testing.assert_allclose(np.linalg.norm(across, axis=1), 0.1, rtol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
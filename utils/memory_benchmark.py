@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Measure the memory that is used by isometries and by transforming vertices.
+
+The following is measured:
+    - the isometries of a group of 120 elements, including the values that are saved when
+      comparing, hashing and converting them to matrices.
+    - transforming a list of vertices by one rotation.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from orbitit import geomtypes, isometry
+
+
+def measure(fn):
+    """Call fn and return the result, the memory that is still used, the peak memory and the time
+
+    The memory is expressed in bytes and the time in seconds.
+    """
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start_mem = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = fn()
+    duration = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current - start_mem, peak - start_mem, duration
+
+
+def group_isometries(group):
+    """Copy the isometries of a group and calculate the values that are saved for them."""
+    isoms = [geomtypes.Transform3([geomtypes.Quat(e[0]), geomtypes.Quat(e[1])]) for e in group]
+    for e in isoms:
+        hash(e)
+        e.matrix()
+        # pylint: disable=expression-not-assigned
+        e in group
+    return isoms
+
+
+def transform_vertices(no_of_vs):
+    """Return a function that rotates no_of_vs random vertices."""
+    random.seed(0)
+    vs = [
+        geomtypes.Vec3([random.uniform(-1, 1), random.uniform(-1, 1), random.uniform(-1, 1)])
+        for _ in range(no_of_vs)
+    ]
+    rot = geomtypes.Rot3(axis=geomtypes.Vec3([1, 2, 3]), angle=1)
+    return lambda: [rot * v for v in vs]
+
+
+def print_result(name, n, memory, peak, duration):
+    """Print a result of the measurement."""
+    print(
+        f"{name}: {memory / 1024:.1f} kB ({memory / n:.0f} B each), peak {peak / 1024:.1f} kB, "
+        f"{duration:.3f} s"
+    )
+
+
+if __name__ == "__main__":
+    PARSER = argparse.ArgumentParser(description=__doc__)
+    PARSER.add_argument(
+        "--vertices",
+        "-v",
+        type=int,
+        default=100000,
+        help="The number of vertices to transform",
+    )
+    ARGS = PARSER.parse_args()
+
+    GROUP = isometry.A5xI()
+    ISOMS, MEMORY, PEAK, DURATION = measure(lambda: group_isometries(GROUP))
+    print_result(f"{len(GROUP)} isometries", len(ISOMS), MEMORY, PEAK, DURATION)
+    TRANSFORM = transform_vertices(ARGS.vertices)
+    VS, MEMORY, PEAK, DURATION = measure(TRANSFORM)
+    print_result(f"{ARGS.vertices} transformed vertices", len(VS), MEMORY, PEAK, DURATION)
+
+# vim expandtab sw=4